@@ -0,0 +1,144 @@
+# benchmarks/bench_gitignore_match.py
+
+"""
+Benchmark for the gitignore checks done by the selection walk.
+
+Creates a temporary tree with a .gitignore at its root, and checks every path
+of the tree against it:
+    - the legacy way, resolving each Path and calling is_dir() on it
+    - the way the walk does it now, with a relative posix path and an is_dir flag
+
+and reports the checks per second of each, after making sure both give the
+same verdicts.
+
+Run from the repo root:
+    python benchmarks/bench_gitignore_match.py [--dirs 200] [--files 20] [--rounds 5]
+"""
+
+# Default libs
+import argparse, tempfile, time
+from pathlib import Path
+from typing import Callable
+
+# Dependencies
+import pathspec
+
+# Deps from this project
+from gitree.objects.gitignore import GitIgnore
+from gitree.objects.settings import Settings
+from gitree.utilities.gitignore_utility import GitIgnoreMatcher
+
+
+GITIGNORE = """
+# Byte-compiled / optimized
+__pycache__/
+*.py[cod]
+*.so
+build/
+dist/
+*.egg-info/
+.venv/
+node_modules/
+*.log
+!keep.log
+/coverage
+docs/_build/
+**/tmp/**
+"""
+
+NAMES = ["main.py", "util.pyc", "app.log", "keep.log", "README.md", "lib.so",
+    "data.json", "index.ts"]
+DIR_NAMES = ["src", "build", "tmp", "pkg", "__pycache__", "docs"]
+
+
+def make_tree(root: Path, n_dirs: int, n_files: int) -> list[tuple[Path, str, bool]]:
+    """ Create the tree, and return (path, rel posix path, is_dir) of each item """
+
+    (root / ".gitignore").write_text(GITIGNORE)
+    items = []
+    for d in range(n_dirs):
+        rel_dir = f"{DIR_NAMES[d % len(DIR_NAMES)]}_{d // len(DIR_NAMES)}"
+        if d % 3 == 0:
+            rel_dir = f"{DIR_NAMES[d % len(DIR_NAMES)]}/{rel_dir}"
+        dir_path = root / rel_dir
+        dir_path.mkdir(parents=True, exist_ok=True)
+        items.append((dir_path, rel_dir, True))
+
+        for f in range(n_files):
+            name = f"{f}_{NAMES[f % len(NAMES)]}"
+            (dir_path / name).write_text("")
+            items.append((dir_path / name, f"{rel_dir}/{name}", False))
+    return items
+
+
+def legacy_checker(gitignore_path: Path) -> Callable[[Path], bool]:
+    """ Replica of GitIgnore.excluded before it took relative paths """
+
+    root = gitignore_path.resolve(strict=False).parent
+    patterns = []
+    for line in gitignore_path.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        neg = line.startswith("!")
+        pat = (line[1:] if neg else line).lstrip("/")
+        patterns.append(("!" + pat) if neg else pat)
+    spec = pathspec.PathSpec.from_lines("gitwildmatch", patterns)
+
+    def excluded(item_path: Path) -> bool:
+        p = item_path.resolve(strict=False)
+        try:
+            rel = p.relative_to(root).as_posix()
+        except ValueError:
+            return False
+        if spec.match_file(rel):
+            return True
+        if p.is_dir() and spec.match_file(rel + "/"):
+            return True
+        return False
+
+    return excluded
+
+
+def measure(label: str, check: Callable[[], list[bool]], n_checks: int,
+    rounds: int) -> list[bool]:
+    verdicts = check()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        check()
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<10} {n_checks * rounds / elapsed:12,.0f} checks/s")
+    return verdicts
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dirs", type=int, default=200)
+    ap.add_argument("--files", type=int, default=20)
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        items = make_tree(root, args.dirs, args.files)
+        print(f"Tree: {len(items)} items")
+
+        legacy = legacy_checker(root / ".gitignore")
+        config = Settings()
+        matcher = GitIgnoreMatcher(tmp)
+        matcher.add_gitignore(GitIgnore(None, config, root / ".gitignore"))
+
+        old = measure("legacy", lambda: [legacy(path) for path, _, _ in items],
+            len(items), args.rounds)
+        new = measure("relative", lambda: [matcher.excluded(rel, is_dir)
+            for _, rel, is_dir in items], len(items), args.rounds)
+
+        if old != new:
+            raise SystemExit("The verdicts differ between the legacy and relative checks")
+        print(f"Verdicts match, {sum(new)} of {len(new)} items ignored")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+# benchmarks/bench_gitignore_templates.py
+
+"""
+Benchmark for the gitignore checks on a realistic set of patterns.
+
+Loads a .gitignore made of (abridged) copies of GitHub's gitignore templates for
+common languages, editors and OSes, and checks a synthetic set of repo paths
+against it:
+    - with pathspec, one PathSpec.match_file call per path
+    - with every pattern merged into a single regex
+    - with the names and suffixes looked up in hash tables, and only the rest
+      of the patterns merged into a regex (the way the walk does it now)
+
+and reports the checks per second of each, after making sure all three give
+the same verdicts.
+
+Run from the repo root:
+    python benchmarks/bench_gitignore_templates.py [--paths 50000] [--rounds 3]
+"""
+
+# Default libs
+import argparse, random, tempfile, time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable
+
+# Dependencies
+import pathspec
+
+# Deps from this project
+from gitree.objects.gitignore import GitIgnore
+from gitree.objects.settings import Settings
+from gitree.objects.ignore_rules import IgnoreRules
+
+
+TEMPLATES = {
+    "Python": """
+__pycache__/
+*.py[cod]
+*$py.class
+*.so
+.Python
+build/
+develop-eggs/
+dist/
+downloads/
+eggs/
+.eggs/
+lib/
+lib64/
+parts/
+sdist/
+var/
+wheels/
+share/python-wheels/
+*.egg-info/
+.installed.cfg
+*.egg
+MANIFEST
+*.manifest
+*.spec
+pip-log.txt
+pip-delete-this-directory.txt
+htmlcov/
+.tox/
+.nox/
+.coverage
+.coverage.*
+.cache
+nosetests.xml
+coverage.xml
+*.cover
+*.py,cover
+.hypothesis/
+.pytest_cache/
+cover/
+*.mo
+*.pot
+*.log
+local_settings.py
+db.sqlite3
+db.sqlite3-journal
+instance/
+.webassets-cache
+.scrapy
+docs/_build/
+.pybuilder/
+target/
+.ipynb_checkpoints
+profile_default/
+ipython_config.py
+.pdm.toml
+__pypackages__/
+celerybeat-schedule
+celerybeat.pid
+*.sage.py
+.env
+.venv
+env/
+venv/
+ENV/
+env.bak/
+venv.bak/
+.spyderproject
+.spyproject
+.ropeproject
+/site
+.mypy_cache/
+.dmypy.json
+dmypy.json
+.pyre/
+.pytype/
+cython_debug/
+""",
+    "Node": """
+logs
+*.log
+npm-debug.log*
+yarn-debug.log*
+yarn-error.log*
+lerna-debug.log*
+.pnpm-debug.log*
+report.[0-9]*.[0-9]*.[0-9]*.[0-9]*.json
+pids
+*.pid
+*.seed
+*.pid.lock
+lib-cov
+coverage
+*.lcov
+.nyc_output
+.grunt
+bower_components
+.lock-wscript
+build/Release
+node_modules/
+jspm_packages/
+web_modules/
+*.tsbuildinfo
+.npm
+.eslintcache
+.stylelintcache
+.rpt2_cache/
+.rts2_cache_cjs/
+.rts2_cache_es/
+.rts2_cache_umd/
+.node_repl_history
+*.tgz
+.yarn-integrity
+.env.development.local
+.env.test.local
+.env.production.local
+.env.local
+.parcel-cache
+.next
+out
+.nuxt
+dist
+.cache/
+.vuepress/dist
+.temp
+.docusaurus
+.serverless/
+.fusebox/
+.dynamodb/
+.tern-port
+.vscode-test
+.yarn/cache
+.yarn/unplugged
+.yarn/build-state.yml
+.yarn/install-state.gz
+.pnp.*
+""",
+    "Java": """
+*.class
+*.log
+*.ctxt
+.mtj.tmp/
+*.jar
+*.war
+*.nar
+*.ear
+*.zip
+*.tar.gz
+*.rar
+hs_err_pid*
+replay_pid*
+""",
+    "Go": """
+*.exe
+*.exe~
+*.dll
+*.so
+*.dylib
+*.test
+*.out
+go.work
+go.work.sum
+""",
+    "C++": """
+*.d
+*.slo
+*.lo
+*.o
+*.obj
+*.gch
+*.pch
+*.so
+*.dylib
+*.dll
+*.mod
+*.smod
+*.lai
+*.la
+*.a
+*.lib
+*.exe
+*.out
+*.app
+""",
+    "Rust": """
+debug/
+target/
+Cargo.lock
+**/*.rs.bk
+*.pdb
+""",
+    "macOS": """
+.DS_Store
+.AppleDouble
+.LSOverride
+Icon[\\r]
+._*
+.DocumentRevisions-V100
+.fseventsd
+.Spotlight-V100
+.TemporaryItems
+.Trashes
+.VolumeIcon.icns
+.com.apple.timemachine.donotpresent
+.AppleDB
+.AppleDesktop
+Network Trash Folder
+Temporary Items
+.apdisk
+""",
+    "Windows": """
+Thumbs.db
+Thumbs.db:encryptable
+ehthumbs.db
+ehthumbs_vista.db
+*.stackdump
+[Dd]esktop.ini
+$RECYCLE.BIN/
+*.cab
+*.msi
+*.msix
+*.msm
+*.msp
+*.lnk
+""",
+    "VisualStudioCode": """
+.vscode/*
+!.vscode/settings.json
+!.vscode/tasks.json
+!.vscode/launch.json
+!.vscode/extensions.json
+!.vscode/*.code-snippets
+.history/
+*.vsix
+""",
+    "JetBrains": """
+.idea/**/workspace.xml
+.idea/**/tasks.xml
+.idea/**/usage.statistics.xml
+.idea/**/dictionaries
+.idea/**/shelf
+.idea/**/aws.xml
+.idea/**/contentModel.xml
+.idea/**/dataSources/
+.idea/**/dataSources.ids
+.idea/**/dataSources.local.xml
+.idea/**/sqlDataSources.xml
+.idea/**/dynamic.xml
+.idea/**/uiDesigner.xml
+.idea/**/dbnavigator.xml
+.idea/**/gradle.xml
+.idea/**/libraries
+cmake-build-*/
+.idea/**/mongoSettings.xml
+*.iws
+out/
+.idea_modules/
+atlassian-ide-plugin.xml
+.idea/replstate.xml
+.idea/sonarlint/
+com_crashlytics_export_strings.xml
+crashlytics.properties
+crashlytics-build.properties
+fabric.properties
+.idea/httpRequests
+.idea/caches/build_file_checksums.ser
+""",
+    "Terraform": """
+**/.terraform/*
+*.tfstate
+*.tfstate.*
+crash.log
+crash.*.log
+*.tfvars
+*.tfvars.json
+override.tf
+override.tf.json
+*_override.tf
+*_override.tf.json
+.terraform.tfstate.lock.info
+.terraformrc
+terraform.rc
+""",
+}
+
+DIRS = ["src", "lib", "app", "pkg", "internal", "cmd", "docs", "tests", "build",
+    "dist", "node_modules", "__pycache__", ".idea", ".vscode", "target", "web",
+    "components", "utils", "api", "models", "out", ".terraform", "coverage"]
+FILES = ["main.py", "util.pyc", "index.js", "app.ts", "server.go", "lib.rs",
+    "Main.java", "Main.class", "core.o", "core.c", "README.md", "debug.log",
+    "package.json", "settings.json", "workspace.xml", ".DS_Store", "Thumbs.db",
+    "data.tar.gz", "main.tf", "prod.tfstate", "module.so", ".env", "style.css",
+    "report.1.2.3.4.json", "notes.txt", "Cargo.toml", "Makefile", "app.exe"]
+
+
+def make_paths(n_paths: int, seed: int = 0) -> list[tuple[str, bool]]:
+    """ Random (rel posix path, is_dir) pairs, grouped by dir like in a walk """
+
+    rng = random.Random(seed)
+    paths: list[tuple[str, bool]] = []
+    while len(paths) < n_paths:
+        parent = "/".join(rng.choice(DIRS) for _ in range(rng.randint(0, 4)))
+        prefix = parent + "/" if parent else ""
+        for name in rng.sample(DIRS, 3):
+            paths.append((prefix + name, True))
+        for name in rng.sample(FILES, 10):
+            paths.append((prefix + name, False))
+    return paths[:n_paths]
+
+
+def measure(label: str, check: Callable[[str, bool], bool],
+    paths: list[tuple[str, bool]], rounds: int) -> list[bool]:
+    verdicts = [check(path, is_dir) for path, is_dir in paths]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path, is_dir in paths:
+            check(path, is_dir)
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<12} {len(paths) * rounds / elapsed:12,.0f} checks/s")
+    return verdicts
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--paths", type=int, default=50_000)
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        gitignore_path = Path(tmp, ".gitignore")
+        gitignore_path.write_text("\n".join(TEMPLATES.values()))
+
+        config = Settings()
+        gitignore = GitIgnore(None, config, gitignore_path)
+        patterns = gitignore.patterns
+
+    kinds = [kind for _, kind, _, _ in patterns]
+    print(f"{len(TEMPLATES)} templates, {len(patterns)} patterns: "
+        f"{kinds.count(GitIgnore.LITERAL)} names, {kinds.count(GitIgnore.SUFFIX)} "
+        f"suffixes, {kinds.count(GitIgnore.REGEX)} regexes")
+
+    paths = make_paths(args.paths)
+    print(f"Paths: {len(paths)}")
+
+    # Same lines as GitIgnore reads, for pathspec and the regex-only rules
+    lines = []
+    for line in "\n".join(TEMPLATES.values()).splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        neg = line.startswith("!")
+        pat = (line[1:] if neg else line).lstrip("/")
+        lines.append(("!" + pat) if neg else pat)
+    spec = pathspec.PathSpec.from_lines("gitwildmatch", lines)
+
+    regex_only = SimpleNamespace(enabled=True, patterns=[(pattern.include,
+        GitIgnore.REGEX, pattern.regex.pattern, False) for pattern in spec.patterns
+        if pattern.include is not None])
+
+    reference = measure("pathspec", lambda path, is_dir: spec.match_file(path) or
+        (is_dir and spec.match_file(path + "/")), paths, args.rounds)
+    single = measure("single regex", IgnoreRules((("", regex_only),)).excluded,
+        paths, args.rounds)
+    tables = measure("tables", IgnoreRules((("", gitignore),)).excluded,
+        paths, args.rounds)
+
+    if not reference == single == tables:
+        raise SystemExit("The verdicts differ between the matchers")
+    print(f"Verdicts match, {sum(tables)} of {len(tables)} paths ignored")
+
+
+if __name__ == "__main__":
+    main()
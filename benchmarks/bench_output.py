@@ -0,0 +1,61 @@
+# benchmarks/bench_output.py
+
+"""
+Benchmark for writing the lines of the output to stdout.
+
+Writes the same tree-like lines to stdout:
+    - with one print() per line, as OutputBuffer.flush used to
+    - through OutputSink, in encoded chunks
+
+and reports the lines per second of each on stderr. Redirect stdout to where
+the output should go, as /dev/null or a file (or a pipe, as "| cat > /dev/null").
+
+Run from the repo root:
+    python benchmarks/bench_output.py [--lines 1000000] > /dev/null
+"""
+
+# Default libs
+import argparse, sys, time
+from typing import Callable
+
+# Deps from this project
+from gitree.objects.output_sink import OutputSink
+
+
+def measure(label: str, write: Callable[[list[str]], None], lines: list[str]) -> None:
+    start = time.perf_counter()
+    write(lines)
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<10} {len(lines) / elapsed:12,.0f} lines/s  ({elapsed:6.2f} s)",
+        file=sys.stderr)
+
+
+def write_print(lines: list[str]) -> None:
+    for line in lines:
+        print(line)
+    sys.stdout.flush()
+
+
+def write_sink(lines: list[str]) -> None:
+    sink = OutputSink()
+    for line in lines:
+        sink.write_line(line)
+    sink.flush()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--lines", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    lines = [f"│  │  ├─ \033[36mdir_{i // 100:05d}\033[0m" if i % 100 == 0
+        else f"│  │  │  ├─ file_{i:07d}.txt" for i in range(args.lines)]
+
+    measure("print", write_print, lines)
+    measure("sink", write_sink, lines)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# benchmarks/bench_render.py
+
+"""
+Benchmark for the throughput of the "tree" renderer.
+
+Builds a synthetic resolved tree (in memory, nothing is written to disk) and
+draws it into the output buffer with:
+    - a replica of the legacy renderer, which sorted the children of every dir
+      again and split the full path of every line for its name and hidden flag
+    - DrawingService, which takes the names, types and hidden flags as the
+      walk finds them, and looks up the prefixes of the lines
+
+and reports the lines per second of each, checking both drew the same lines.
+
+Run from the repo root:
+    python benchmarks/bench_render.py [--dirs 50] [--subdirs 100] [--files 99] [--emoji]
+"""
+
+# Default libs
+import argparse, os, time
+from typing import Any, Callable, Iterator
+
+# Deps from this project
+from gitree.constants.constant import (FILE_EMOJI, NORMAL_DIR_EMOJI, EMPTY_DIR_EMOJI,
+    BRANCH, LAST, VERT, SPACE)
+from gitree.objects.app_context import AppContext
+from gitree.objects.settings import Settings
+from gitree.objects.tree_node import TreeNode
+from gitree.services.drawing_service import DrawingService
+from gitree.utilities.color_utility import Color
+
+
+ROOT = os.path.abspath("project")
+
+
+def build_tree(n_dirs: int, n_subdirs: int, n_files: int) -> TreeNode:
+    """ 
+    Tree of dirs of subdirs of files, in selection order (files first, then by 
+    lowercase name). One in ten dirs is hidden.
+    """
+
+    root = TreeNode(ROOT, is_dir=True)
+    names = sorted((f".dir_{d:03d}" if d % 10 == 0 else f"dir_{d:03d}" 
+        for d in range(n_dirs)), key=str.lower)
+    for name in names:
+        node = TreeNode(name, root, is_dir=True)
+        for s in range(n_subdirs):
+            sub = TreeNode(f"sub_{s:03d}", node, is_dir=True)
+            for f in range(n_files):
+                TreeNode(f"file_{f:03d}.txt", sub)
+    return root
+
+
+def legacy_draw_tree(ctx: AppContext, config: Settings, tree_data: TreeNode) -> None:
+    """ Replica of DrawingService._draw_tree before the single-pass renderer """
+
+    def _name(p: str) -> str:
+        s = p.rstrip("/\\")
+        return s.split("/")[-1].split("\\")[-1] if s else s
+
+    def _is_hidden(p: str) -> bool:
+        s = p.replace("\\", "/").strip("/")
+        parts = [x for x in s.split("/") if x]
+        return any(part.startswith(".") for part in parts)
+
+    def _sort_key(node: TreeNode) -> tuple[bool, str]:
+        return (node.is_dir == config.files_first, node.name.lower())
+
+    def _rec(node: TreeNode, path: str, depth: int) -> Iterator[tuple[Any, ...]]:
+        kids = sorted(node.children, key=_sort_key)
+        for i, child in enumerate(kids):
+            is_last = i == len(kids) - 1
+            child_path = os.path.join(path, child.name)
+            if child.is_dir:
+                yield (depth, child_path, True, is_last, not child.children)
+                yield from _rec(child, child_path, depth + 1)
+            else:
+                yield (depth, child_path, False, is_last, True)
+
+    def _items() -> Iterator[tuple[Any, ...]]:
+        yield (0, tree_data.path, True, True, not tree_data.children)
+        yield from _rec(tree_data, tree_data.path, 1)
+
+    def _emoji_for(is_dir: bool, is_empty: bool) -> str:
+        if not config.emoji:
+            return ""
+        if is_dir:
+            return EMPTY_DIR_EMOJI if is_empty else NORMAL_DIR_EMOJI
+        return FILE_EMOJI
+
+    prefix_parts: list[str] = []
+    for depth, path, is_dir, is_last, is_empty in _items():
+        label = _name(path)
+        em = _emoji_for(is_dir, is_empty)
+
+        if depth == 0:
+            root_label = Color.cyan(label) if not config.no_color else label
+            ctx.output_buffer.write(f"{em} {root_label}" if em else root_label)
+            continue
+
+        del prefix_parts[depth - 1:]
+        prefix = "".join(prefix_parts)
+        connector = LAST if is_last else BRANCH
+
+        if config.no_color:
+            color = Color.default
+        elif _is_hidden(path):
+            color = Color.grey
+        elif is_dir:
+            color = Color.cyan
+        else:
+            color = Color.default
+
+        if em:
+            ctx.output_buffer.write(f"{prefix}{connector}{em} {color(label)}")
+        else:
+            ctx.output_buffer.write(f"{prefix}{connector}{color(label)}")
+
+        if is_dir:
+            prefix_parts.append(SPACE if is_last else VERT)
+
+
+def measure(label: str, draw: Callable[[AppContext, Settings, TreeNode], None],
+    config: Settings, tree: TreeNode) -> list[str]:
+    ctx = AppContext()
+
+    start = time.perf_counter()
+    draw(ctx, config, tree)
+    elapsed = time.perf_counter() - start
+
+    lines = ctx.output_buffer.get_value()
+    print(f"{label:<10} {len(lines) / elapsed:12,.0f} lines/s  ({elapsed:6.2f} s)")
+    return lines
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dirs", type=int, default=50)
+    ap.add_argument("--subdirs", type=int, default=100)
+    ap.add_argument("--files", type=int, default=99)
+    ap.add_argument("--emoji", action="store_true")
+    args = ap.parse_args()
+
+    tree = build_tree(args.dirs, args.subdirs, args.files)
+    config = Settings(emoji=args.emoji)
+    entries = 1 + args.dirs * (1 + args.subdirs * (1 + args.files))
+    print(f"Tree: {entries} entries")
+
+    legacy = measure("legacy", legacy_draw_tree, config, tree)
+    current = measure("current", DrawingService._draw_tree, config, tree)
+    if legacy != current:
+        raise SystemExit("The renderers drew different lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_settings_access.py
+
+"""
+Benchmark for the config reads done by the selection walk for every entry.
+
+Reads the settings the walk checks per entry (no_files, max_items, no_max_items,
+max_entries, hidden_items, exclude_depth and gitignore_depth):
+    - from the layered Config, each read going through its __getattr__
+    - from the frozen Settings the services take now
+
+and reports the entries per second of each.
+
+Run from the repo root:
+    python benchmarks/bench_settings_access.py [--entries 1000000]
+"""
+
+# Default libs
+import argparse, time
+from typing import Any
+
+# Deps from this project
+from gitree.objects.app_context import AppContext
+from gitree.objects.config import Config
+
+
+def measure(label: str, config: Any, n_entries: int) -> None:
+    start = time.perf_counter()
+    for _ in range(n_entries):
+        (config.no_files, config.max_items, config.no_max_items, config.max_entries,
+            config.hidden_items, config.exclude_depth, config.gitignore_depth)
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<10} {n_entries / elapsed:14,.0f} entries/s "
+        f"({elapsed / n_entries / 7 * 1e9:5.1f} ns per read)")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--entries", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    # As parsed from "gitree --max-items 50 --hidden-items"
+    config = Config(AppContext(), argparse.Namespace(paths=["."], format="tree",
+        max_items=50, hidden_items=True))
+
+    measure("Config", config, args.entries)
+    measure("Settings", config.freeze(), args.entries)
+
+
+if __name__ == "__main__":
+    main()
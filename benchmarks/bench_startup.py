@@ -0,0 +1,79 @@
+# benchmarks/bench_startup.py
+
+"""
+Benchmark for the startup time of the CLI.
+
+Imports gitree.main in fresh interpreters with -X importtime, and reports:
+    - the median cumulative import time of gitree.main
+    - the modules that took the longest to import (self time) in the median run
+    - the heavy modules that got imported, which only the flags using them
+      (as --interactive, --copy and --zip) should import
+
+Exits with status 1 if the median import time is over the budget, or if any of
+the heavy modules is imported, so it can guard against startup regressions.
+
+Run from the repo root:
+    python benchmarks/bench_startup.py [--runs 7] [--budget 120] [--top 10]
+"""
+
+# Default libs
+import argparse, statistics, subprocess, sys
+from pathlib import Path
+
+# Deps from this project
+from gitree.constants.constant import HEAVY_MODULES
+
+
+# Budget for the import of gitree.main in ms, with room for slower machines
+BUDGET_MS = 120
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def import_times() -> dict[str, tuple[int, int]]:
+    """ Import gitree.main in a fresh interpreter, {module: (self us, cumulative us)} """
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import gitree.main"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        times[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+    return times
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=7)
+    ap.add_argument("--budget", type=float, default=BUDGET_MS, help="Budget in ms")
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+
+    runs = sorted((import_times() for _ in range(args.runs)),
+        key=lambda times: times["gitree.main"][1])
+    median_run = runs[len(runs) // 2]
+    median_ms = statistics.median(times["gitree.main"][1] for times in runs) / 1000
+
+    print(f"gitree.main import: {median_ms:.1f} ms (median of {args.runs} runs), "
+        f"budget {args.budget:g} ms")
+    print(f"Slowest modules (self time):")
+    for name, (self_us, _) in sorted(median_run.items(),
+        key=lambda item: item[1][0], reverse=True)[:args.top]:
+        print(f"    {self_us / 1000:7.2f} ms  {name}")
+
+    heavy = sorted({name for times in runs for name in times
+        if name.split(".")[0] in HEAVY_MODULES})
+    if heavy:
+        print(f"Heavy modules imported: {', '.join(heavy)}")
+
+    if median_ms > args.budget or heavy:
+        raise SystemExit("Startup over budget")
+    print("Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_tree_memory.py
+
+"""
+Benchmark for the memory used by the resolved tree.
+
+Builds the same synthetic tree (in memory, nothing is written to disk) as:
+    - the legacy {"self": Path, "children": [...]} dicts holding a Path per file
+    - TreeNode objects holding only the names
+
+and reports the memory allocated for each with tracemalloc, along with the
+time taken to rebuild every file path from the tree.
+
+Run from the repo root:
+    python benchmarks/bench_tree_memory.py [--dirs 1000] [--files 100]
+"""
+
+# Default libs
+import argparse, os, time, tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+# Deps from this project
+from gitree.objects.tree_node import TreeNode
+
+
+ROOT = os.path.abspath("project")
+
+
+def build_dict_tree(n_dirs: int, n_files: int) -> dict[str, Any]:
+    """ Replica of the tree the selection built before TreeNode """
+
+    root: dict[str, Any] = {"self": Path(ROOT), "children": []}
+    for d in range(n_dirs):
+        dir_path = os.path.join(ROOT, f"dir_{d:05d}")
+        node: dict[str, Any] = {"self": Path(dir_path), "children": []}
+        for f in range(n_files):
+            node["children"].append(Path(os.path.join(dir_path, f"file_{f:05d}.txt")))
+        root["children"].append(node)
+    return root
+
+
+def build_node_tree(n_dirs: int, n_files: int) -> TreeNode:
+    """ Same tree as build_dict_tree, the way the selection builds it now """
+
+    root = TreeNode(ROOT, is_dir=True)
+    for d in range(n_dirs):
+        node = TreeNode(f"dir_{d:05d}", root, is_dir=True)
+        for f in range(n_files):
+            TreeNode(f"file_{f:05d}.txt", node)
+    return root
+
+
+def dict_tree_files(node: dict[str, Any]) -> list[Path]:
+    """ Replica of the legacy ExportService._iter_files """
+
+    out: list[Path] = []
+
+    def rec(node: dict[str, Any]) -> None:
+        for child in node.get("children", []):
+            if isinstance(child, dict):
+                rec(child)
+            else:
+                out.append(child)
+
+    rec(node)
+    return out
+
+
+def measure(label: str, build: Callable[[], Any], files: Callable[[Any], list], 
+    entries: int) -> None:
+    tracemalloc.start()
+    tree = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    n_files = len(files(tree))
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<10} {size / 2**20:8.1f} MiB  {size / entries:7.1f} B/entry  "
+        f"{n_files} file paths in {elapsed * 1000:7.1f} ms")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dirs", type=int, default=1000)
+    ap.add_argument("--files", type=int, default=100)
+    args = ap.parse_args()
+
+    entries = args.dirs * (args.files + 1) + 1
+    print(f"Tree: {entries} entries ({args.dirs} dirs x {args.files} files)")
+
+    measure("dict", lambda: build_dict_tree(args.dirs, args.files), 
+        dict_tree_files, entries)
+    measure("TreeNode", lambda: build_node_tree(args.dirs, args.files), 
+        lambda tree: list(tree.iter_files()), entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# benchmarks/bench_walk_syscalls.py
+
+"""
+Benchmark for the selection walk engine.
+
+Builds a synthetic tree in a temporary directory and counts the stat-family
+syscalls (os.stat, os.lstat) and directory listings (os.scandir, os.listdir)
+issued per entry by:
+    - the legacy Path.iterdir() + is_file()/is_dir() listing pattern
+    - ItemsSelectionService.resolve_items (the os.scandir walk engine)
+
+The selection timing also includes the include/exclude filters, so compare
+the syscall counts rather than the wall-clock columns.
+
+Run from the repo root:
+    python benchmarks/bench_walk_syscalls.py [--dirs 200] [--files 50]
+"""
+
+# Default libs
+import argparse, os, sys, tempfile, time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+# Deps from this project
+from gitree.objects.app_context import AppContext
+from gitree.services.parsing_service import ParsingService
+from gitree.services.items_selection_service import ItemsSelectionService
+
+
+COUNTED_CALLS = ("stat", "lstat", "scandir", "listdir")
+
+
+@contextmanager
+def count_syscalls():
+    """ Patch the os functions used by pathlib/scandir and count their calls """
+
+    counts: Counter = Counter()
+    originals = {name: getattr(os, name) for name in COUNTED_CALLS}
+
+    def _wrap(name, fn):
+        def _counted(*args, **kwargs):
+            counts[name] += 1
+            return fn(*args, **kwargs)
+        return _counted
+
+    for name, fn in originals.items():
+        setattr(os, name, _wrap(name, fn))
+    try:
+        yield counts
+    finally:
+        for name, fn in originals.items():
+            setattr(os, name, fn)
+
+
+def build_tree(root: Path, n_dirs: int, n_files: int) -> int:
+    """ Create n_dirs dirs with n_files files each, returns the entry count """
+
+    for d in range(n_dirs):
+        dir_path = root / f"dir_{d:04d}"
+        dir_path.mkdir()
+        for f in range(n_files):
+            (dir_path / f"file_{f:04d}.txt").write_bytes(b"")
+
+    return n_dirs * (n_files + 1)
+
+
+def legacy_walk(curr_dir: Path, no_files: bool = False) -> int:
+    """ Replica of the listing pattern the selection used before the scandir engine """
+
+    added = 0
+    children = sorted(curr_dir.iterdir(), key=lambda p: (p.is_dir(), p.name.lower()))
+    for item_path in children:
+        if item_path.is_file() and no_files:
+            continue
+        added += 1
+        if not item_path.is_file():
+            added += legacy_walk(item_path, no_files)
+    return added
+
+
+def scandir_walk(root: Path) -> None:
+    """ Run the real selection service with the limits and gitignore disabled """
+
+    sys.argv = ["gitree", "--no-max-items", "--no-max-entries", "--no-gitignore",
+        "--max-depth", "100", "--no-config", "--no-cache"]
+    ctx = AppContext()
+    config = ParsingService.parse_args(ctx)
+    ItemsSelectionService.resolve_items(ctx, config, time.time())
+
+
+def report(label: str, counts: Counter, entries: int, elapsed: float) -> None:
+    total = sum(counts.values())
+    detail = ", ".join(f"{name}={counts[name]}" for name in COUNTED_CALLS)
+    print(f"{label:<10} {total / entries:6.2f} syscalls/entry "
+        f"({detail})  {elapsed * 1000:8.1f} ms")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--dirs", type=int, default=200)
+    ap.add_argument("--files", type=int, default=50)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        entries = build_tree(root, args.dirs, args.files)
+        cwd = os.getcwd()
+        os.chdir(root)
+
+        try:
+            print(f"Tree: {entries} entries ({args.dirs} dirs x {args.files} files)")
+
+            with count_syscalls() as counts:
+                start = time.perf_counter()
+                legacy_walk(root)
+                report("legacy", counts, entries, time.perf_counter() - start)
+
+            with count_syscalls() as counts:
+                start = time.perf_counter()
+                scandir_walk(root)
+                report("selection", counts, entries, time.perf_counter() - start)
+
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
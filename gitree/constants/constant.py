@@ -9,3 +9,8 @@ SPACE  = "   "
 EMPTY_DIR_EMOJI = "📁"
 NORMAL_DIR_EMOJI = "📂"
 FILE_EMOJI = "📄"
+
+# modules only imported by the flags that need them (or on a gitignore cache
+# miss), never at startup. see benchmarks/bench_startup.py
+HEAVY_MODULES = ("prompt_toolkit", "pyperclip", "zipfile", "pathspec", "subprocess",
+    "asyncio", "hashlib")
@@ -5,27 +5,24 @@ Code file for housing the main function.
 """
 
 # Default libs
-import sys, time
+import os, sys, time
 if sys.platform.startswith('win'):      # fix windows unicode error on CI
     sys.stdout.reconfigure(encoding='utf-8')
 
 # Deps from this project
+# NOTE: the services only some flags use (and their deps, as prompt_toolkit, 
+# pyperclip and zipfile) are imported when the flag is used, to keep the 
+# startup of a plain run short
 from .services.parsing_service import ParsingService
 from .services.general_options_service import GeneralOptionsService
 from .services.items_selection_service import ItemsSelectionService
 from .services.drawing_service import DrawingService
-from .services.zipping_service import ZippingService
-from .services.export_service import ExportService
-from .services.copy_service import CopyService
-
-# from .services.zipping_service import ZippingService
 from .objects.app_context import AppContext
-from .objects.config import Config
+from .objects.settings import Settings
 from .utilities.logging_utility import Logger
-from .services.interactive_selection_service import InteractiveSelectionService
 
 
-def flush_buffers(ctx: AppContext, config: Config):
+def flush_buffers(ctx: AppContext, config: Settings):
     """ 
     Handle flushing the buffers. 
     """
@@ -36,11 +33,47 @@ def flush_buffers(ctx: AppContext, config: Config):
 
     # print the log if verbose mode
     if config.verbose:
-        if not config.no_printing and not ctx.output_buffer.empty(): 
-            print()
-        print("LOG:")
+        if not config.no_printing and (
+            ctx.output_buffer.streaming or not ctx.output_buffer.empty()): 
+            ctx.output_sink.write_line("")
+        ctx.output_sink.write_line("LOG:")
         ctx.logger.flush()
 
+    # Write out what is still pending (as the end of a streamed tree)
+    ctx.output_sink.flush()
+
+    # print the counters and timers of the run on stderr, to keep stdout clean
+    if config.stats:
+        ctx.metrics.add("output.bytes_written", ctx.output_sink.bytes_written)
+        print_stats(ctx, config)
+
+
+def print_stats(ctx: AppContext, config: Settings) -> None:
+    """
+    Print the metrics of the run on stderr, as a table or as a line of JSON
+    (see --stats).
+    """
+
+    if config.stats == "json":
+        import json
+        print(json.dumps(ctx.metrics.to_dict()), file=sys.stderr)
+        return
+
+    print("STATS:", file=sys.stderr)
+    for line in ctx.metrics.format_table():
+        print(line, file=sys.stderr)
+
+
+def can_stream(config: Settings) -> bool:
+    """
+    Check whether the tree can be drawn while the items are being selected.
+    Only for plain printing, every other output needs the whole tree.
+    """
+
+    return (not config.no_printing 
+        and not (config.zip or config.export or config.copy or config.interactive)
+        and ItemsSelectionService.can_stream(config))
+
 
 def main() -> None:
     """
@@ -48,6 +81,23 @@ def main() -> None:
 
     Handles the main workflow of the app.
     """
+
+    try:
+        run()
+
+    # The reader went away (e.g. piped into head), stop quietly. The output sink
+    # raises this on its first write after that, so no more work is done
+    except BrokenPipeError:
+        # Python flushes stdout at exit, point it to devnull to avoid another error
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+
+
+def run() -> None:
+    """
+    Runs the main workflow of the app.
+    """
     
     # Record time for performance noting
     start_time = time.time()
@@ -66,14 +116,42 @@ def main() -> None:
     GeneralOptionsService.handle_args(ctx, config)
 
 
-    # This service returns all the items to include resolved in a dict
-    # Hover over ItemsSelectionService to check the format which it returns
-    resolved_root = ItemsSelectionService.resolve_items(ctx, config, start_time)
+    # Draw the items while they are being selected if possible, lines show up 
+    # right away and the whole tree is never held in memory
+    if can_stream(config):
+        ctx.output_buffer.streaming = True
+        with ctx.metrics.timer("selection_and_drawing"):
+            DrawingService.stream(ctx, config, 
+                ItemsSelectionService.iter_items(ctx, config, start_time))
+        ctx.logger.log(Logger.INFO, 
+            "Total time for this run: %s ms", round((time.time()-start_time)*1000, 2))
+        flush_buffers(ctx, config)
+        return
+
+
+    # A SQLite export indexes the items themselves, along with the entries the
+    # gitignore rules dropped. Nothing is drawn for it
+    sqlite_export = False
+    if config.export:
+        from .services.export_service import ExportService
+        sqlite_export = ExportService.is_sqlite(config.export) and not config.copy
+    ignored = [] if sqlite_export else None
+
+
+    # This service returns all the items to include resolved in a tree of TreeNodes
+    # (None if nothing matched the given paths)
+    with ctx.metrics.timer("selection"):
+        resolved_root = ItemsSelectionService.resolve_items(ctx, config, start_time, 
+            ignored=ignored)
+    if resolved_root is None:
+        flush_buffers(ctx, config)
+        return
 
 
     # Select files interactively if requested
     # NOTE: this one is currently broken
     if config.interactive:
+        from .services.interactive_selection_service import InteractiveSelectionService
         checkpoint_time = time.time()       # Pause the timer when the user is selecting
         resolved_root = InteractiveSelectionService.run(ctx, config, resolved_root)
         start_time += (time.time() - checkpoint_time)   # Resume the timer
@@ -82,23 +160,35 @@ def main() -> None:
     # Everything is ready
     # Now do the final operations
     if config.zip:
-        ZippingService.run(ctx, config, resolved_root)
+        from .services.zipping_service import ZippingService
+        with ctx.metrics.timer("zip"):
+            ZippingService.run(ctx, config, resolved_root)
+
+    elif sqlite_export:
+        with ctx.metrics.timer("export"):
+            ExportService.run(ctx, config, resolved_root, ignored=ignored)
 
     else:
-        DrawingService.run(ctx, config, resolved_root)
+        # Printed as it is drawn, unless it is copied or exported afterwards
+        ctx.output_buffer.streaming = not config.no_printing
+        with ctx.metrics.timer("drawing"):
+            DrawingService.run(ctx, config, resolved_root)
         ctx.logger.log(Logger.INFO, 
-            f"Left DrawingService at: {round((time.time()-start_time)*1000, 2)} ms")
+            "Left DrawingService at: %s ms", round((time.time()-start_time)*1000, 2))
         
         if config.copy:
-            CopyService.run(ctx, config, resolved_root)
+            from .services.copy_service import CopyService
+            with ctx.metrics.timer("copy"):
+                CopyService.run(ctx, config, resolved_root)
 
         elif config.export:
-            ExportService.run(ctx, config, resolved_root)
+            with ctx.metrics.timer("export"):
+                ExportService.run(ctx, config, resolved_root)
 
 
     # Log performance (time)
     ctx.logger.log(Logger.INFO, 
-        f"Total time for this run: {round((time.time()-start_time)*1000, 2)} ms")
+        "Total time for this run: %s ms", round((time.time()-start_time)*1000, 2))
 
 
     # Flush the buffers to the console before exiting
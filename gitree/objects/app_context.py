@@ -8,11 +8,15 @@ for the app context.
 """
 
 # Deps in the same project
+from .metrics import Metrics
+from .output_sink import OutputSink
 from ..utilities.logging_utility import Logger, OutputBuffer
 
 
 class AppContext:
     def __init__(self) -> None:
         """ Constructor for app ctx """
-        self.logger = Logger()
-        self.output_buffer = OutputBuffer()
+        self.output_sink = OutputSink()
+        self.logger = Logger(sink=self.output_sink)
+        self.output_buffer = OutputBuffer(sink=self.output_sink)
+        self.metrics = Metrics()
@@ -5,12 +5,13 @@ Code file to house Config class.
 """
 
 # Default libs
-import argparse, json, os, sys, subprocess, platform
+import argparse, os
 from pathlib import Path
 from typing import Any
 
 # Deps from this project
 from .app_context import AppContext
+from .settings import Settings
 from ..utilities.logging_utility import Logger
 
 
@@ -20,6 +21,7 @@ class Config:
         Config declared here from lowest to highest priority.
         Initializer to build four types of config.
         """
+        self.ctx = ctx
         self.defaults: dict[str, Any] = self._build_default_config()
         self.global_cfg: dict[str, Any] = {}
         self.user_cfg: dict[str, Any] = self._build_user_config()
@@ -32,6 +34,42 @@ class Config:
             self.global_cfg = {}
 
 
+    def freeze(self) -> Settings:
+        """
+        Resolve every key once, with the precedence of _get, into the settings
+        the services take.
+
+        A value of the user or global config that is invalid is skipped with a
+        warning, and the key falls back to the next layer.
+
+        Returns:
+            Settings: The resolved, validated settings
+
+        Raises:
+            ValueError: If a CLI value is invalid
+        """
+
+        values: dict[str, Any] = {}
+        for name in Settings.__dataclass_fields__:
+            for layer_name, layer in (("cli", self.cli), ("user", self.user_cfg), 
+                ("global", self.global_cfg), ("defaults", self.defaults)):
+                if name not in layer:
+                    continue
+
+                if layer_name in ("user", "global"):
+                    try:
+                        Settings.check(name, layer[name])
+                    except ValueError as e:
+                        self.ctx.logger.log(Logger.WARNING, 
+                            f"Ignoring the {layer_name} config value. {e}")
+                        continue
+
+                values[name] = layer[name]
+                break
+
+        return Settings(**values)
+
+
     def _build_user_config(self) -> dict[str, Any]:
         """ 
         Returns a dict of the user config, if available.
@@ -42,6 +80,7 @@ class Config:
         # Make sure the configuration file has been setup
         if not os.path.exists(config_path): return {}
 
+        import json
         with open(config_path, "r") as file:
             user_cfg = json.load(file)
 
@@ -93,6 +132,7 @@ class Config:
             "config_user": False,
             "no_config": False,
             "verbose": False,
+            "stats": "",
 
             # Output & export options
             "zip": "",
@@ -103,6 +143,9 @@ class Config:
             "max_items": 20,
             "max_entries": 40,
             "max_depth": 5,
+            "jobs": 1,
+            "git_index": False,
+            "untracked": False,
             "gitignore_depth": 5,
             "hidden_items": False,
             "exclude": [],
@@ -113,6 +156,7 @@ class Config:
             "emoji": False,
             "interactive": False,
             "files_first": False,
+            "print0": False,
             "no_color": False,
             "no_contents": False,
             "no_contents_for": [],
@@ -124,6 +168,7 @@ class Config:
             "no_files": False,
             "no_max_items": False,
             "no_max_entries": False,
+            "no_cache": False,
 
             # Inner tool control (not to be given to the user)
             "no_printing": False  
@@ -143,6 +188,7 @@ class Config:
         """
         Creates a default config.json file with all defaults.
         """
+        import json
         config_path = Config._get_user_config_path()
 
 
@@ -180,6 +226,7 @@ class Config:
         """
         Opens config.json in the default text editor.
         """
+        import platform, subprocess
         config_path = Config._get_user_config_path()
 
         # Create config if it doesn't exist
@@ -0,0 +1,208 @@
+# gitree/objects/git_index.py
+
+"""
+Code file for housing GitIndex class
+"""
+
+# Default libs
+import struct
+from pathlib import Path
+
+
+class GitIndexError(Exception):
+    """
+    Raised when an index file cannot be read by GitIndex.
+    """
+
+
+class GitIndex:
+    """
+    Minimal reader for git's index file (the staging area, versions 2 to 4).
+
+    - Create an object passing the index path to it, and the tracked paths are ready.
+    - Only the path and mode of each entry are kept, everything else is skipped.
+    - Conflicted paths are listed once, skip-worktree (sparse checkout) paths are dropped.
+    - Split indexes and sparse indexes are not supported and raise a GitIndexError.
+    """
+
+    # Entry flags
+    _EXTENDED_FLAG = 0x4000
+    _SKIP_WORKTREE_FLAG = 0x4000        # in the extended flags
+
+    # Modes of the entries that are directories in the working tree
+    GITLINK_MODE = 0o160000
+
+
+    def __init__(self, index_path: Path, hash_size: int = 20) -> None:
+        """
+        Read the index file and collect its tracked paths.
+
+        Args:
+            index_path (Path): Path to the index file (usually .git/index)
+            hash_size (int): Size of the object ids, 20 for sha1 and 32 for sha256 repos
+        """
+
+        self.version: int = 0
+        self.extensions: set[bytes] = set()
+
+        # (posix path relative to the work tree, mode) of each tracked entry
+        self.entries: list[tuple[str, int]] = []
+
+        try:
+            data = Path(index_path).read_bytes()
+        except OSError as e:
+            raise GitIndexError(f"Could not read {index_path}: {e}")
+
+        try:
+            self._parse(data, hash_size)
+        except (struct.error, ValueError, IndexError) as e:
+            raise GitIndexError(f"Corrupt index file {index_path}: {e}")
+
+
+    @staticmethod
+    def find_repo(start: Path) -> tuple[Path, Path] | None:
+        """
+        Find the git repo that contains the start path by looking for .git in the
+        start path and its parents. Handles .git files of worktrees/submodules.
+
+        Args:
+            start (Path): Path to start looking from
+
+        Returns:
+            tuple[Path, Path] | None: (work tree root, git dir), or None if not in a repo
+        """
+
+        for work_tree in (start, *start.parents):
+            dot_git = work_tree / ".git"
+
+            if dot_git.is_dir():
+                return work_tree, dot_git
+
+            if dot_git.is_file():
+                try:
+                    line = dot_git.read_text(encoding="utf-8").strip()
+                except OSError:
+                    return None
+
+                if line.startswith("gitdir:"):
+                    return work_tree, (work_tree / line[len("gitdir:"):].strip()).resolve()
+                return None
+
+        return None
+
+
+    @staticmethod
+    def hash_size_for(git_dir: Path) -> int:
+        """
+        Get the object id size of the repo, reading objectformat from its config.
+        """
+
+        try:
+            text = (git_dir / "config").read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return 20
+
+        for line in text.splitlines():
+            key, _, value = line.partition("=")
+            if key.strip().lower() == "objectformat" and value.strip().lower() == "sha256":
+                return 32
+        return 20
+
+
+    def _parse(self, data: bytes, hash_size: int) -> None:
+        """
+        Parse the header, the entries and the extension signatures of the index.
+        """
+
+        if len(data) < 12 + hash_size or data[:4] != b"DIRC":
+            raise GitIndexError("Not a git index file")
+
+        version, count = struct.unpack_from(">II", data, 4)
+        if version not in (2, 3, 4):
+            raise GitIndexError(f"Unsupported index version {version}")
+        self.version = version
+
+
+        # Bind lookups to locals, this loop runs once per tracked file
+        unpack_from = struct.unpack_from
+        find = data.find
+        entries = self.entries
+        mode_at = 24                        # ctime, mtime, dev, ino come first
+        flags_at = 40 + hash_size           # then mode, uid, gid, size and the oid
+        skip_worktree = self._SKIP_WORKTREE_FLAG
+        extended_flag = self._EXTENDED_FLAG
+
+        offset = 12
+        prev_name = b""
+        last_name = None
+
+        for _ in range(count):
+            mode = unpack_from(">I", data, offset + mode_at)[0]
+            flags = unpack_from(">H", data, offset + flags_at)[0]
+            pos = offset + flags_at + 2
+
+            extended = 0
+            if flags & extended_flag:
+                extended = unpack_from(">H", data, pos)[0]
+                pos += 2
+
+            if version == 4:
+                # The path is stored as (bytes to drop from the previous path, suffix)
+                strip, pos = GitIndex._read_varint(data, pos)
+                end = find(b"\0", pos)
+                if end < 0:
+                    raise GitIndexError("Truncated entry")
+                name = prev_name[:len(prev_name) - strip] + data[pos:end]
+                offset = end + 1
+
+            else:
+                end = find(b"\0", pos)
+                if end < 0:
+                    raise GitIndexError("Truncated entry")
+                name = data[pos:end]
+                # Entries are padded with 1 to 8 NULs to a multiple of 8 bytes
+                offset += (end - offset + 8) & ~7
+
+            prev_name = name
+
+            # Conflicted paths have one entry per stage, in a row
+            if name == last_name or extended & skip_worktree:
+                continue
+            last_name = name
+
+            entries.append((name.decode("utf-8", "surrogateescape"), mode))
+
+
+        # The extensions follow the entries, the file ends with a checksum
+        end = len(data) - hash_size
+        while offset + 8 <= end:
+            signature = data[offset:offset + 4]
+            size = unpack_from(">I", data, offset + 4)[0]
+            self.extensions.add(signature)
+            offset += 8 + size
+
+        if b"link" in self.extensions:
+            raise GitIndexError("Split index files are not supported")
+        if b"sdir" in self.extensions:
+            raise GitIndexError("Sparse index files are not supported")
+
+
+    @staticmethod
+    def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+        """
+        Read an offset-encoded varint (as used by index v4) starting at pos.
+
+        Returns:
+            tuple[int, int]: The value and the position after it
+        """
+
+        c = data[pos]
+        pos += 1
+        value = c & 0x7F
+
+        while c & 0x80:
+            c = data[pos]
+            pos += 1
+            value = ((value + 1) << 7) | (c & 0x7F)
+
+        return value, pos
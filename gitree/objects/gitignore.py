@@ -5,34 +5,35 @@ Code file for housing GitIgnore class
 """
 
 # Default libs
+import os
 from pathlib import Path
-from typing import Iterable
-
-# Dependencies
-import pathspec
 
 # Deps from this project
 from ..objects.app_context import AppContext
-from ..objects.config import Config
+from ..objects.settings import Settings
+from ..objects.ignore_cache import IgnoreCache
 
 
 class GitIgnore:
     """
     Minimal gitignore loader/matcher.
 
-    - Create an object passing roots to it, and it's ready to be used.
-    - excluded(path) tells if path is ignored by any root's combined patterns.
+    - Create an object passing the .gitignore path to it, and it's ready to be used.
+    - patterns gives the regexes of its patterns, relative to its dir. They are
+      matched together with those of the other .gitignore files (see IgnoreRules).
     """
 
-    def __init__(self, ctx: AppContext, config: Config, gitignore_path: Path) -> None:
+    def __init__(self, ctx: AppContext, config: Settings, gitignore_path: Path,
+        cache: IgnoreCache | None = None) -> None:
         """
         Initialize the gitignore matcher for a single directory by loading patterns
         from the provided .gitignore file.
 
         Args:
             ctx (AppContext): The application context
-            config (Config): The application configuration
+            config (Settings): The application configuration
             gitignore_path (Path): Path to the .gitignore file to load patterns from
+            cache (IgnoreCache | None): Cache to get the parsed patterns from
         """
 
         # Bind app context and config with the object
@@ -43,187 +44,151 @@ class GitIgnore:
         self.enabled = not config.no_gitignore
         self.gitignore_depth = config.gitignore_depth
 
-        # Setup specs for gitignore
-        self._specs: list[tuple[Path, pathspec.PathSpec]]
-        self._load_spec_from_gitignore(gitignore_path)
+        # Dir the patterns are relative to, and the signature of the file they are
+        # read from (the traversal cache keys its gitignore verdicts by it)
+        self.root: str = os.path.dirname(os.path.abspath(gitignore_path))
+        self.signature: list = self._get_signature(gitignore_path)
 
+        # Setup the patterns, read on first use since the verdicts might all 
+        # come from the traversal cache
+        self._gitignore_path = gitignore_path
+        self._patterns: list[tuple[bool, str, str, bool]] | None = None
+        self._cache = cache
 
-    def excluded(self, item_path: Path) -> bool:
-        """
-        Determine whether the given path is excluded by the loaded gitignore patterns.
 
-        Args:
-            item_path (Path): The path to check for exclusion
+    # Kinds of patterns, see patterns
+    LITERAL = "literal"
+    SUFFIX = "suffix"
+    REGEX = "regex"
 
-        Returns:
-            bool: True if the path is ignored/excluded, otherwise False
-        """
-        if not self.enabled:
-            return False
 
-        p = item_path.resolve(strict=False)
+    @property
+    def patterns(self) -> list[tuple[bool, str, str, bool]]:
+        """
+        The patterns of the .gitignore file as (include, kind, value, dir_only),
+        in file order. include is False for the negated ("!") patterns.
 
-        for root, spec in self._specs:
-            try:
-                rel = p.relative_to(root).as_posix()
-            except ValueError:
-                continue
+        - LITERAL: value is a name (as "node_modules"), matching any path segment
+        - SUFFIX: value is a suffix (as ".log" for "*.log"), matching any path 
+          segment ending with it
+        - REGEX: value is the regex of the pattern, for everything else
 
-            if spec.match_file(rel):
-                return True
-            if p.is_dir() and spec.match_file(rel + "/"):
-                return True
+        dir_only (for "name/" and "*.suffix/") tells that only the segments 
+        followed by a slash can match.
+        """
 
-        return False
+        if self._patterns is None:
+            self._load_spec_from_gitignore(self._gitignore_path)
+        return self._patterns
 
 
-    def _load_from_roots(self, roots: Iterable[Path]) -> None:
+    @staticmethod
+    def _get_signature(gitignore_path: Path) -> list:
         """
-        Load and combine gitignore patterns from all .gitignore files under the given roots.
-
-        Args:
-            roots (Iterable[Path]): Root directories to scan for .gitignore files
+        Get [path, mtime_ns, size] of the .gitignore file, to notice edits to it.
         """
-        # Clears the specs if already present
-        self._specs = []
 
-        for root in self._norm_roots(roots):
-            pats = self._collect_patterns(root)
-            self._specs.append((root, pathspec.PathSpec.from_lines("gitwildmatch", pats)))
+        path = os.fspath(gitignore_path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return [path, 0, -1]
+        return [path, st.st_mtime_ns, st.st_size]
 
 
     def _load_spec_from_gitignore(self, gitignore_path: Path) -> None:
         """
-        Load gitignore patterns from a single .gitignore file and create a PathSpec
-        rooted at its parent directory.
+        Load gitignore patterns from a single .gitignore file and classify them
+        (see patterns), or get them from the cache if the file (or one with the
+        same contents) was parsed before.
 
         Args:
             gitignore_path (Path): Path to the .gitignore file to load
         """
-        self._specs = []
 
-        gi = Path(gitignore_path).resolve(strict=False)
-        root = gi.parent
+        cache = self._cache
+        if cache is not None:
+            self._patterns = cache.by_signature(self.signature)
+            if self._patterns is not None:
+                return
 
-        patterns: list[str] = []
         try:
-            lines = gi.read_text(encoding="utf-8", errors="ignore").splitlines()
+            content = Path(gitignore_path).read_bytes()
         except Exception:
-            lines = []
-
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-
-            neg = line.startswith("!")
-            pat = line[1:] if neg else line
-            pat = pat.lstrip("/")
-            patterns.append(("!" + pat) if neg else pat)
-
-        self._specs.append((root, pathspec.PathSpec.from_lines("gitwildmatch", patterns)))
+            content = b""
 
+        if cache is not None:
+            key = IgnoreCache.content_key(content)
+            self._patterns = cache.by_content(self.signature, key)
+            if self._patterns is not None:
+                return
 
-    def _norm_roots(self, roots: Iterable[Path]) -> list[Path]:
-        """
-        Normalize root paths into unique directory Paths.
-
-        Args:
-            roots (Iterable[Path]): Root paths to normalize
-
-        Returns:
-            list[Path]: A de-duplicated list of resolved directory roots
-        """
-        out: list[Path] = []
-        for r in roots:
-            rr = Path(r).resolve(strict=False)
-            rr = rr if rr.is_dir() else rr.parent
-            if rr not in out:
-                out.append(rr)
-        return out
-    
-
-    def _within_depth(self, root: Path, dirpath: Path) -> bool:
-        """
-        Check whether a directory is within the configured gitignore traversal depth
-        relative to the given root.
+        self._patterns = GitIgnore._parse(content.decode("utf-8", errors="ignore"))
+        if cache is not None:
+            cache.store(self.signature, key, self._patterns)
 
-        Args:
-            root (Path): The root directory used as the depth baseline
-            dirpath (Path): The directory path to test
 
-        Returns:
-            bool: True if dirpath is within depth, otherwise False
+    @staticmethod
+    def _parse(text: str) -> list[tuple[bool, str, str, bool]]:
         """
-        if self.gitignore_depth is None:
-            return True
-        try:
-            return len(dirpath.relative_to(root).parts) <= self.gitignore_depth
-        except Exception:
-            return False
-        
-
-    def _collect_patterns(self, root: Path) -> list[str]:
+        Parse the lines of a .gitignore file and classify its patterns. Only the 
+        patterns that are neither plain names nor plain suffixes are kept as regexes.
         """
-        Collect gitignore patterns from all .gitignore files under the root, prefixing
-        patterns by their relative directory to emulate nested .gitignore behavior.
-
-        Args:
-            root (Path): Root directory to scan
 
-        Returns:
-            list[str]: Combined list of patterns collected under the root
-        """
         patterns: list[str] = []
-
-        for d in self._walk_dirs(root):
-            gi = d / ".gitignore"
-            if not gi.is_file():
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
                 continue
 
-            rel_dir = d.relative_to(root).as_posix()
-            prefix = "" if rel_dir == "." else rel_dir + "/"
+            # NOTE: a leading slash is kept, it anchors the pattern to the dir
+            # of the .gitignore file (as for "/*", only its direct children)
+            patterns.append(line)
 
-            try:
-                lines = gi.read_text(encoding="utf-8", errors="ignore").splitlines()
-            except Exception:
-                continue
+        # Only imported on a cache miss, since it is slow to import
+        import pathspec
 
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
+        # NOTE: from_lines keeps one pattern per (non-empty) line, in order.
+        # Patterns with include None never match anything
+        spec = pathspec.PathSpec.from_lines("gitwildmatch", patterns)
+        classified = []
+        for line, pattern in zip(patterns, spec.patterns):
+            if pattern.include is None:
+                continue
 
-                neg = line.startswith("!")
-                pat = line[1:] if neg else line
-                pat = prefix + pat.lstrip("/")
-                patterns.append(("!" + pat) if neg else pat)
+            kind, value, dir_only = GitIgnore._classify(line.removeprefix("!"))
+            if kind == GitIgnore.REGEX:
+                value = pattern.regex.pattern
+            classified.append((pattern.include, kind, value, dir_only))
+        return classified
 
-        return patterns
-    
 
-    def _walk_dirs(self, root: Path) -> Iterable[Path]:
+    @staticmethod
+    def _classify(pattern: str) -> tuple[str, str, bool]:
         """
-        Walk directories under the root using a stack-based traversal, respecting the
-        configured depth and skipping symlinks.
-
-        Args:
-            root (Path): Root directory to traverse
+        Tell whether a pattern is a plain name or a plain "*.suffix", the ones that
+        can be matched without a regex. The two match the same as their regexes 
+        (any path segment, or any segment followed by a slash with a trailing slash).
 
         Returns:
-            Iterable[Path]: Directories discovered during traversal, including root
+            tuple[str, str, bool]: (kind, name or suffix, dir_only), the value is
+                empty for the REGEX kind
         """
-        stack = [root]
-        while stack:
-            d = stack.pop()
-            yield d
 
-            if not self._within_depth(root, d):
-                continue
+        dir_only = pattern.endswith("/")
+        body = pattern[:-1] if dir_only else pattern
 
-            try:
-                for c in d.iterdir():
-                    if c.is_dir() and not c.is_symlink():
-                        stack.append(c)
-            except PermissionError:
-                continue
+        # "**/name" matches the same as "name"
+        while body.startswith("**/"):
+            body = body[3:]
+
+        if not body or "/" in body or "\\" in body or body in (".", ".."):
+            return GitIgnore.REGEX, "", False
+        
+        if not any(c in body for c in "*?["):
+            return GitIgnore.LITERAL, body, dir_only
+        
+        if body.startswith("*.") and not any(c in body[1:] for c in "*?["):
+            return GitIgnore.SUFFIX, body[1:], dir_only
+        
+        return GitIgnore.REGEX, "", False
@@ -0,0 +1,180 @@
+# gitree/objects/glob_pattern.py
+
+"""
+Code file for housing GlobPattern class.
+"""
+
+# Default libs
+import fnmatch, os, re
+
+
+# Placeholder for "**" segments, that match any number of dirs (even zero)
+_RECURSIVE = object()
+
+
+class GlobPattern:
+    """
+    Glob pattern compiled to be matched against the paths reached by the
+    selection walk, instead of being expanded on the filesystem beforehand.
+
+    - Matches the same paths as glob.glob(pattern, recursive=True, include_hidden=True).
+      Same as for glob, the paths are compared after os.path.normcase, so the
+      patterns are case-insensitive on Windows.
+    - The literal dirs at the start of the pattern form its (resolved) base, the
+      rest is matched one path segment at a time.
+    - matches(path, is_dir) tells if the path itself matches.
+    - may_contain(dir_path) tells if paths under dir_path can match.
+    """
+
+    __slots__ = ("pattern", "base", "dir_only", "_base_key", "_base_prefix", "_segments",
+        "_literal")
+
+
+    def __init__(self, pattern: str, base_dir: str) -> None:
+        """
+        Compile the pattern.
+
+        Args:
+            pattern (str): The glob pattern, absolute or relative to base_dir
+            base_dir (str): Absolute dir the relative patterns are relative to
+        """
+
+        self.pattern = pattern
+
+        # Same as for glob, a trailing separator only matches dirs
+        seps = "/" + (os.altsep or "") + os.sep
+        self.dir_only = pattern.endswith(tuple(seps))
+        parts = re.split(f"[{re.escape(seps)}]", pattern)
+
+        literal_count = 0
+        while literal_count < len(parts) and not GlobPattern.is_glob(parts[literal_count]):
+            literal_count += 1
+
+        # Same as for glob, the base only matches if it was written out (as in "src/**")
+        self._literal = "/".join(parts[:literal_count])
+        literal = self._literal or os.curdir
+        self.base = os.path.realpath(os.path.join(base_dir, literal))
+        self._base_key = os.path.normcase(self.base)
+        self._base_prefix = os.path.join(self._base_key, "")
+
+        self._segments = []
+        for part in parts[literal_count:]:
+            if not part:
+                continue
+            part = os.path.normcase(part)
+            if part == "**":
+                # Consecutive "**" segments match the same as a single one
+                if not self._segments or self._segments[-1] is not _RECURSIVE:
+                    self._segments.append(_RECURSIVE)
+            elif GlobPattern.is_glob(part):
+                self._segments.append(re.compile(fnmatch.translate(part)).match)
+            else:
+                self._segments.append(part)
+
+
+    @staticmethod
+    def is_glob(path_str: str) -> bool:
+        """
+        Check whether the string has any glob magic characters.
+        """
+        return any(c in path_str for c in "*?[")
+
+
+    def matches(self, path: str, is_dir: bool) -> bool:
+        """
+        Check whether the path matches the pattern.
+
+        Args:
+            path (str): Absolute path to check
+            is_dir (bool): Whether the path is a dir
+
+        Returns:
+            bool: True if the path matches
+        """
+
+        path = os.path.normcase(path)
+        if (self.dir_only and not is_dir) or (not self._literal and path == self._base_key):
+            return False
+
+        states = self._states(path)
+        return states is not None and len(self._segments) in states
+
+
+    def may_contain(self, dir_path: str) -> bool:
+        """
+        Check whether paths under the dir can match the pattern.
+
+        Args:
+            dir_path (str): Absolute path of the dir
+
+        Returns:
+            bool: True if the dir leads to the base of the pattern, or if the rest
+                of the pattern can still match below it
+        """
+
+        dir_path = os.path.normcase(dir_path)
+        if self._base_prefix.startswith(os.path.join(dir_path, "")):
+            return True
+
+        states = self._states(dir_path)
+        return states is not None and any(i < len(self._segments) for i in states)
+
+
+    def _states(self, path: str) -> set[int] | None:
+        """
+        Run the segments of the path (relative to the base) through the pattern.
+        The path is given in os.path.normcase form.
+
+        Returns:
+            set[int] | None: Indexes of the pattern segments that can match next
+                (len(segments) once fully matched), None if the path is not under
+                the base
+        """
+
+        if path == self._base_key:
+            names = []
+        elif path.startswith(self._base_prefix):
+            names = path[len(self._base_prefix):].split(os.sep)
+        else:
+            return None
+
+        states = self._closure({0})
+        for name in names:
+            states = self._advance(states, name)
+            if not states:
+                break
+        return states
+
+
+    def _advance(self, states: set[int], name: str) -> set[int]:
+        """
+        Get the states reached by matching one more path segment.
+        """
+
+        segments = self._segments
+        reached = set()
+
+        for i in states:
+            if i == len(segments):
+                continue
+
+            segment = segments[i]
+            if segment is _RECURSIVE:
+                reached.add(i)
+            elif segment == name if isinstance(segment, str) else segment(name):
+                reached.add(i + 1)
+
+        return self._closure(reached)
+
+
+    def _closure(self, states: set[int]) -> set[int]:
+        """
+        Add the states reached by letting the "**" segments match zero dirs.
+        """
+
+        segments = self._segments
+        for i in list(states):
+            while i < len(segments) and segments[i] is _RECURSIVE:
+                i += 1
+                states.add(i)
+        return states
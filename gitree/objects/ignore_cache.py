@@ -0,0 +1,264 @@
+# gitree/objects/ignore_cache.py
+
+"""
+Code file for housing IgnoreCache class.
+"""
+
+# Default libs
+import importlib.util, json, os, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+# Deps from this project
+from .app_context import AppContext
+from ..utilities.logging_utility import Logger
+
+
+class IgnoreCache:
+    """
+    Persistent cache of the classified patterns (see GitIgnore.patterns) of the
+    .gitignore and exclude files, kept between runs in .gitree/ignore_cache.json.
+
+    - The patterns are keyed by a hash of the file contents, so identical files
+      (common in monorepos) share one record, and an edited file gets a new one.
+    - Files are also indexed by path, and while a file's (st_mtime_ns, st_size)
+      is unchanged (see GitIgnore.signature), it is not even read again.
+    - The whole cache is dropped when its VERSION or the installed pathspec
+      (which translates the patterns) changes, see _pathspec_stamp.
+    - At most MAX_SPECS contents and MAX_FILES paths are kept, the least recently
+      used are evicted.
+
+    NOTE: the regexes are still compiled once per run (see IgnoreRules), only
+    the reading, translation and classification of the patterns are skipped.
+    """
+
+    VERSION = 3
+    MAX_SPECS = 5_000
+    MAX_FILES = 20_000
+
+    # Files modified this recently are not indexed by path, since another edit
+    # within the same mtime tick would go unnoticed
+    _RACY_NS = 2_000_000_000
+
+
+    def __init__(self, ctx: AppContext, cache_path: Path | None = None) -> None:
+        """
+        Load the cache file. A missing, corrupt or outdated file gives an empty cache.
+
+        Args:
+            ctx (AppContext): The application context
+            cache_path (Path | None): Path of the cache file, defaults to the one
+                next to the traversal cache
+        """
+
+        self.ctx = ctx
+        self.cache_path = cache_path or IgnoreCache._get_cache_path()
+
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+        # {content key: patterns}, and {file path: [mtime_ns, size, content key]}
+        self._specs: OrderedDict[str, list[list[Any]]] = OrderedDict()
+        self._files: OrderedDict[str, list[Any]] = OrderedDict()
+        self._load()
+
+
+    @staticmethod
+    def content_key(content: bytes) -> str:
+        """
+        Get the key of a file's contents.
+        """
+        import hashlib
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+    def by_signature(self, signature: list) -> list[list[Any]] | None:
+        """
+        Get the patterns of a file whose path and metadata are unchanged.
+
+        Args:
+            signature (list): [path, mtime_ns, size] of the file
+
+        Returns:
+            list[list[Any]] | None: The patterns, or None if they have to be read
+        """
+
+        path, mtime_ns, size = signature
+        record = self._files.get(path)
+        if record is None or record[0] != mtime_ns or record[1] != size:
+            return None
+
+        patterns = self._specs.get(record[2])
+        if patterns is None:
+            return None
+
+        self.hits += 1
+        self._files.move_to_end(path)
+        self._specs.move_to_end(record[2])
+        return patterns
+
+
+    def by_content(self, signature: list, key: str) -> list[list[Any]] | None:
+        """
+        Get the patterns of a file's contents, and index the file by its path.
+
+        Args:
+            signature (list): [path, mtime_ns, size] of the file
+            key (str): Key of the file's contents, see content_key
+
+        Returns:
+            list[list[Any]] | None: The patterns, or None if they have to be parsed
+        """
+
+        patterns = self._specs.get(key)
+        if patterns is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._specs.move_to_end(key)
+        self._index(signature, key)
+        return patterns
+
+
+    def store(self, signature: list, key: str, patterns: list) -> None:
+        """
+        Record the parsed patterns of a file's contents.
+
+        Args:
+            signature (list): [path, mtime_ns, size] of the file
+            key (str): Key of the file's contents, see content_key
+            patterns (list): The classified patterns, see GitIgnore.patterns
+        """
+
+        self._specs[key] = patterns
+        self._specs.move_to_end(key)
+        while len(self._specs) > IgnoreCache.MAX_SPECS:
+            self._specs.popitem(last=False)
+
+        self._index(signature, key)
+        self._dirty = True
+
+
+    def save(self) -> None:
+        """
+        Write the cache file back if it changed, and log the hit/miss counts.
+        """
+
+        self.ctx.logger.log(Logger.DEBUG,
+            "Ignore cache: %s hits, %s misses", self.hits, self.misses)
+        self.ctx.metrics.add("ignore_cache.hits", self.hits)
+        self.ctx.metrics.add("ignore_cache.misses", self.misses)
+
+        if not self._dirty:
+            return
+
+        # Write to a temp file first, so an interrupted run never leaves a
+        # truncated cache behind. json.dumps uses the C encoder, json.dump does not
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            data = json.dumps({"version": IgnoreCache.VERSION, 
+                "pathspec": IgnoreCache._pathspec_stamp(), 
+                "specs": self._specs, "files": self._files},
+                ensure_ascii=False, separators=(",", ":"))
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.cache_path)
+
+        except (OSError, TypeError, ValueError) as e:
+            self.ctx.logger.log(Logger.WARNING, f"Could not save the ignore cache: {e}")
+
+
+    def _index(self, signature: list, key: str) -> None:
+        """
+        Index the file by its path, unless it was modified too recently.
+        """
+
+        path, mtime_ns, size = signature
+        if size < 0 or time.time_ns() - mtime_ns < IgnoreCache._RACY_NS:
+            return
+
+        record = [mtime_ns, size, key]
+        if self._files.get(path) != record:
+            self._files[path] = record
+            self._dirty = True
+        self._files.move_to_end(path)
+
+        while len(self._files) > IgnoreCache.MAX_FILES:
+            self._files.popitem(last=False)
+
+
+    def _load(self) -> None:
+        """
+        Read the records from the cache file, ignoring it (or the records of it)
+        if it cannot be used.
+        """
+
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.ctx.logger.log(Logger.DEBUG, f"Ignoring the ignore cache: {e}")
+            return
+
+        if (not isinstance(data, dict) or data.get("version") != IgnoreCache.VERSION
+            or data.get("pathspec") != IgnoreCache._pathspec_stamp()):
+            self.ctx.logger.log(Logger.DEBUG, "Ignoring the outdated ignore cache")
+            return
+
+        # A record of the wrong shape would fail every run until .gitree is
+        # deleted, so any of them means the file cannot be trusted at all
+        specs, files = data.get("specs"), data.get("files")
+        if not (isinstance(specs, dict) and isinstance(files, dict) and
+            all(IgnoreCache._valid_patterns(patterns) for patterns in specs.values()) and
+            all(IgnoreCache._valid_file(record) for record in files.values())):
+            self.ctx.logger.log(Logger.DEBUG, "Ignoring the malformed ignore cache")
+            return
+
+        self._specs.update(specs)
+        self._files.update(files)
+
+
+    @staticmethod
+    def _valid_file(record: Any) -> bool:
+        """ Check the shape of a cached file record, [mtime_ns, size, content key] """
+        return (isinstance(record, list) and len(record) == 3 and type(record[0]) is int
+            and type(record[1]) is int and isinstance(record[2], str))
+
+
+    @staticmethod
+    def _valid_patterns(patterns: Any) -> bool:
+        """ Check the shape of cached patterns, see GitIgnore.patterns """
+        return isinstance(patterns, list) and all(isinstance(pattern, list) and 
+            len(pattern) == 4 and isinstance(pattern[0], bool) and isinstance(pattern[1], str)
+            and isinstance(pattern[2], str) and isinstance(pattern[3], bool) 
+            for pattern in patterns)
+
+
+    @staticmethod
+    def _pathspec_stamp() -> str:
+        """
+        Identify the installed pathspec by the path and mtime of its package, 
+        which change with any upgrade. Unlike pathspec.__version__, this does 
+        not import it, which warm runs never need to.
+        """
+
+        spec = importlib.util.find_spec("pathspec")
+        if spec is None or spec.origin is None:
+            return ""
+        try:
+            return f"{spec.origin}:{os.stat(spec.origin).st_mtime_ns}"
+        except OSError:
+            return spec.origin
+
+
+    @staticmethod
+    def _get_cache_path() -> Path:
+        """ Return the default ignore cache path for gitree """
+        path = Path(".gitree/ignore_cache.json")
+        path.parent.mkdir(exist_ok=True, parents=True)
+        return path
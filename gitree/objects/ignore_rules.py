@@ -0,0 +1,235 @@
+# gitree/objects/ignore_rules.py
+
+"""
+Code file for housing IgnoreRules class.
+"""
+
+# Default libs
+import re
+from typing import Callable
+
+# Deps from this project
+from .gitignore import GitIgnore
+
+
+# (index of the pattern, its include), for the segments no pattern matches
+_NO_MATCH = (-1, False)
+
+
+class IgnoreRules:
+    """
+    The patterns of a stack of .gitignore files, merged so a path is matched 
+    once, however many .gitignore files apply to it.
+
+    - layers are (posix prefix relative to the root, GitIgnore) pairs, from the
+      root down. Each pattern only matches under the prefix of its file. The root
+      is the walk root, or the work tree of the repo it is in.
+    - Same as git, the last matching pattern decides, and the patterns of deeper
+      files come after those of their parents. Every pattern gets its index in
+      that order, and the highest matching index wins.
+    - Names and suffixes (see GitIgnore.patterns) are looked up in hash tables,
+      for the last segment of the path.
+    - The other patterns of each file are merged into one regex, listed from
+      last to first, so the first alternative that matches is the one with the
+      highest index. The regex is relative to the file's dir, and compiled once
+      per process for each distinct list of patterns, so identical .gitignore
+      files (common in monorepos) and the layers shared with the parent rules
+      are not compiled again. The deepest file with a match has the highest
+      index of them.
+    - Same as git, the patterns only match the path itself, the walk does not
+      go under excluded dirs (see GitIgnoreMatcher.exclude_dir for the ones it
+      still enters). So the verdicts of the parent dirs are never needed, and 
+      the given paths are not hidden by their own parents.
+    - Compiled on first use, since the verdicts might all come from the cache.
+    """
+
+    __slots__ = ("layers", "base_depth", "_names", "_dir_names", "_suffixes", "_dir_suffixes",
+        "_residues")
+
+    # Named groups repeat between patterns, which a single regex does not allow
+    _NAMED_GROUP = re.compile(r"\(\?P<[^>]+>")
+
+    # The slash after the last segment of a pathspec regex, past which it also
+    # matches everything under the matched dir (pathspec's own match uses that)
+    _DIR_MARK = re.compile(r"\(\?P<ps_d>/\)")
+
+    # {regex source: its compiled match}, shared by all the rules of the process
+    _compiled: dict[str, Callable] = {}
+
+
+    def __init__(self, layers: tuple = (), base_depth: int = 0) -> None:
+        """
+        Args:
+            layers (tuple): (posix prefix, GitIgnore) pairs, from the root down
+            base_depth (int): Depth of the walk root under the root
+        """
+
+        self.layers = layers
+        self.base_depth = base_depth
+
+        # {name or suffix: [(depth of the file's dir, index, include), ...]} in
+        # index order, for the patterns matching any segment, or only dir segments
+        self._names: dict[str, list[tuple[int, int, bool]]] | None = None
+        self._dir_names: dict[str, list[tuple[int, int, bool]]] = {}
+        self._suffixes: dict[str, list[tuple[int, int, bool]]] = {}
+        self._dir_suffixes: dict[str, list[tuple[int, int, bool]]] = {}
+
+        # (prefix length, regex match, {group name: (index, include)}) of each
+        # layer with other patterns, deepest first
+        self._residues: list[tuple[int, Callable, dict[str, tuple[int, bool]]]] = []
+
+
+    def extend(self, prefix: str, gitignore: GitIgnore) -> "IgnoreRules":
+        """
+        Get the rules with the patterns of one more (deeper) .gitignore file.
+        """
+
+        return IgnoreRules(self.layers + ((prefix, gitignore),), self.base_depth)
+
+
+    def excluded(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Determine whether the path is excluded by the patterns.
+
+        Args:
+            rel_path (str): Posix path relative to the root
+            is_dir (bool): Whether the path is a dir
+
+        Returns:
+            bool: True if the path is ignored/excluded, otherwise False
+        """
+
+        if self._names is None:
+            self._compile()
+
+        name = rel_path.rpartition("/")[2]
+        best = self._match_segment(name, rel_path.count("/"), is_dir)
+
+        # Dir patterns (as "build/") only match with a trailing slash, and the
+        # other patterns match the same with or without it
+        if self._residues:
+            path = rel_path + "/" if is_dir else rel_path
+            for prefix_len, match, includes in self._residues:
+                found = match(path, prefix_len)
+                if found is not None:
+                    hit = includes[found.lastgroup]
+                    if hit[0] > best[0]:
+                        best = hit
+                    break
+
+        return best[1]
+
+
+    def _match_segment(self, segment: str, depth: int, as_dir: bool) -> tuple[int, bool]:
+        """
+        Get the highest (index, include) of the names and suffixes matching one
+        segment of a path. as_dir tells if the segment is followed by a slash.
+        """
+
+        best = _NO_MATCH
+        for table in (self._names, self._dir_names) if as_dir else (self._names,):
+            entries = table.get(segment)
+            if entries:
+                hit = IgnoreRules._applying(entries, depth)
+                if hit[0] > best[0]:
+                    best = hit
+
+        if (self._suffixes or self._dir_suffixes) and "." in segment:
+            tables = (self._suffixes, self._dir_suffixes) if as_dir else (self._suffixes,)
+            i = segment.find(".")
+            while i != -1:
+                suffix = segment[i:]
+                for table in tables:
+                    entries = table.get(suffix)
+                    if entries:
+                        hit = IgnoreRules._applying(entries, depth)
+                        if hit[0] > best[0]:
+                            best = hit
+                i = segment.find(".", i + 1)
+
+        return best
+
+
+    @staticmethod
+    def _applying(entries: list[tuple[int, int, bool]], depth: int) -> tuple[int, bool]:
+        """
+        Get the (index, include) of the last pattern whose file is above the segment.
+        """
+
+        for file_depth, index, include in reversed(entries):
+            if file_depth <= depth:
+                return index, include
+        return _NO_MATCH
+
+
+    def _compile(self) -> None:
+        """
+        Sort the patterns of all the layers into the tables, and merge the rest
+        of each layer into one alternation, last pattern first.
+        """
+
+        self._names = {}
+        tables = {
+            (GitIgnore.LITERAL, False): self._names,
+            (GitIgnore.LITERAL, True): self._dir_names,
+            (GitIgnore.SUFFIX, False): self._suffixes,
+            (GitIgnore.SUFFIX, True): self._dir_suffixes,
+        }
+
+        index = 0
+        for prefix, gitignore in self.layers:
+            if not gitignore.enabled:
+                continue
+
+            file_depth = max(prefix.count("/"), self.base_depth)
+            alternatives: list[tuple[int, bool, str]] = []
+            for include, kind, value, dir_only in gitignore.patterns:
+                index += 1
+                if kind != GitIgnore.REGEX:
+                    tables[kind, dir_only].setdefault(value, []).append(
+                        (file_depth, index, include))
+                else:
+                    alternatives.append((index, include, value))
+
+            if alternatives:
+                self._residues.insert(0, (len(prefix),
+                    *IgnoreRules._compile_layer(alternatives)))
+
+
+    @staticmethod
+    def _compile_layer(alternatives: list[tuple[int, bool, str]]) -> tuple[Callable, dict]:
+        """
+        Merge the other patterns of a layer into one regex, matched from the
+        position right after the layer's prefix.
+
+        Args:
+            alternatives (list): (index, include, pathspec regex) of the patterns
+
+        Returns:
+            tuple: The match of the regex, and {group name: (index, include)}
+        """
+
+        # Each alternative is wrapped in a named group, the outermost group that
+        # matched (lastgroup) tells which pattern it was. The names count from 
+        # the layer's first pattern, so the same patterns give the same source
+        parts: list[str] = []
+        includes: dict[str, tuple[int, bool]] = {}
+        first = alternatives[0][0]
+        for index, include, regex in reversed(alternatives):
+            # Same as git, a pattern only matches the path itself, not what is
+            # under the dirs it matches. The walk never enters excluded dirs, so
+            # the ones a path is in were already found not to be excluded
+            regex = IgnoreRules._DIR_MARK.sub("(?:/$)", regex)
+            regex = IgnoreRules._NAMED_GROUP.sub("(?:", regex)
+
+            # Anchored patterns continue right after the prefix, the others
+            # (as for "**") are searched for anywhere under it
+            regex = regex[1:] if regex.startswith("^") else ".*?" + regex
+            includes[f"p{index - first}"] = (index, include)
+            parts.append(f"(?P<p{index - first}>{regex})")
+
+        source = "|".join(parts)
+        match = IgnoreRules._compiled.get(source)
+        if match is None:
+            match = IgnoreRules._compiled[source] = re.compile(source).match
+        return match, includes
@@ -0,0 +1,104 @@
+# gitree/objects/metrics.py
+
+"""
+Code file for housing Metrics class.
+"""
+
+# Default libs
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class Metrics:
+    """
+    Registry of the counters and timers of a run, printed with --stats.
+
+    - Counters are named "<area>.<what>" (as "selection.dirs_listed"), and only
+      show up once something added to them.
+    - The services add to them once per dir, file or phase, never per entry:
+      the per-entry counts are kept in plain ints by the objects doing the work
+      (as GitIgnoreMatcher.checks) and added once they are done.
+    - Timers add up the wall time of the phases timed under the same name. The
+      "total" timer runs from the creation of the registry, the start of the run.
+    """
+
+    def __init__(self) -> None:
+        """ Start with no counters and no timers """
+
+        self.counters: dict[str, int] = {}
+        self.timers: dict[str, float] = {}
+        self._start = time.perf_counter()
+
+
+    def add(self, name: str, amount: int = 1) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name (str): Name of the counter
+            amount (int): Amount to add to it
+        """
+
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """
+        Add to a timer.
+
+        Args:
+            name (str): Name of the timer
+            seconds (float): Time to add to it, in seconds
+        """
+
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Time the code run under the with block, and add it to a timer.
+
+        Args:
+            name (str): Name of the timer
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        """
+        Get the counters and timers (in ms) as a dict, sorted by name.
+
+        Returns:
+            dict: {"counters": {name: count}, "timers_ms": {name: ms}}
+        """
+
+        timers = {**self.timers, "total": time.perf_counter() - self._start}
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "timers_ms": {name: round(seconds * 1000, 3)
+                for name, seconds in sorted(timers.items())},
+        }
+
+
+    def format_table(self) -> list[str]:
+        """
+        Get the counters and timers as the lines of a table.
+
+        Returns:
+            list[str]: The lines of the table
+        """
+
+        data = self.to_dict()
+        rows = [(name, f"{count:,}") for name, count in data["counters"].items()]
+        rows += [(f"time.{name}", f"{ms:,.2f} ms") for name, ms in data["timers_ms"].items()]
+
+        name_width = max(len(name) for name, _ in rows)
+        value_width = max(len(value) for _, value in rows)
+        return [f"{name:<{name_width}}  {value:>{value_width}}" for name, value in rows]
@@ -0,0 +1,182 @@
+# gitree/objects/output_sink.py
+
+"""
+Code file for housing OutputSink class.
+"""
+
+# Default libs
+import os, sys, time
+from typing import IO, Iterable
+
+
+class OutputSink:
+    """
+    Buffered writer for the lines of the output, to stdout or to a file.
+
+    - Lines are collected and written CHUNK_SIZE characters at a time. Each
+      chunk is joined and encoded to UTF-8 in one go, instead of one print()
+      (a write, and an encode) per line.
+    - Writing to the real stdout on POSIX bypasses Python's io stack: the chunks
+      go straight to the file descriptor with os.write. Binary files (and stdout
+      on Windows) get the chunks through their buffer. Streams without a buffer
+      (as a replaced sys.stdout) get the chunks as str.
+    - In the binary modes, newlines are written as os.linesep, the same as a
+      text stream would.
+    - On a terminal, lines are not held back for longer than FLUSH_INTERVAL, so
+      a streamed tree still shows up as it is being walked.
+    - When the reader goes away (EPIPE, as when piped into head), the write
+      raises BrokenPipeError right away and the pending lines are dropped. main
+      then exits quietly.
+    """
+
+    CHUNK_SIZE = 1 << 16
+    FLUSH_INTERVAL = 0.05
+
+
+    def __init__(self, file: IO | None = None) -> None:
+        """
+        Create a sink writing to a file, or to stdout by default.
+
+        Args:
+            file (IO | None): An open file, binary or text. None for stdout
+        """
+
+        self.bytes_written = 0
+        self._pending: list[str] = []
+        self._size = 0
+        self._fd: int | None = None
+        self._binary: IO | None = None
+        self._text: IO | None = None
+        self._linesep = os.linesep
+
+        stream = sys.stdout if file is None else file
+        if (file is None and os.name == "posix" and
+            sys.stdout is not None and sys.stdout is sys.__stdout__):
+            try:
+                self._fd = sys.stdout.fileno()
+            except (AttributeError, OSError, ValueError):
+                pass
+
+        if self._fd is None:
+            if hasattr(stream, "mode") and "b" in stream.mode:
+                self._binary = stream
+            elif hasattr(stream, "buffer"):
+                stream.flush()
+                self._binary = stream.buffer
+            else:
+                self._text = stream
+                self._linesep = "\n"
+
+        try:
+            is_tty = stream.isatty()
+        except (AttributeError, OSError, ValueError):
+            is_tty = False
+        self._interval = OutputSink.FLUSH_INTERVAL if is_tty else None
+        self._last_write = time.monotonic()
+
+
+    def write_line(self, line: str) -> None:
+        """
+        Write a line, a newline is added after it.
+
+        Args:
+            line (str): The line to write
+        """
+
+        self._pending.append(line)
+        self._size += len(line) + 1
+        if self._size >= OutputSink.CHUNK_SIZE or (self._interval is not None
+            and time.monotonic() - self._last_write >= self._interval):
+            self._write_pending()
+
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        """
+        Write lines, a newline is added after each of them.
+
+        Args:
+            lines (Iterable[str]): The lines to write
+        """
+
+        pending = self._pending
+        for line in lines:
+            pending.append(line)
+            self._size += len(line) + 1
+            if self._size >= OutputSink.CHUNK_SIZE:
+                self._write_pending()
+                pending = self._pending
+
+
+    def write(self, text: str) -> None:
+        """
+        Write text as is, after the pending lines.
+
+        Args:
+            text (str): The text to write
+        """
+
+        self._write_pending()
+        self._write(text)
+
+
+    def flush(self) -> None:
+        """
+        Write the pending lines, and flush the underlying stream.
+        """
+
+        self._write_pending()
+        if self._binary is not None:
+            self._binary.flush()
+        elif self._text is not None:
+            self._text.flush()
+
+
+    def _write_pending(self) -> None:
+        """ Write the pending lines as one chunk """
+
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = []
+        self._size = 0
+        pending.append("")
+        self._write("\n".join(pending))
+
+
+    def _write(self, text: str) -> None:
+        """ Encode text and write it to the stream """
+
+        self._last_write = time.monotonic()
+        if self._text is not None:
+            self._text.write(text)
+            self.bytes_written += len(text)
+            return
+
+        if self._linesep != "\n":
+            text = text.replace("\n", self._linesep)
+
+        # Names that are not valid UTF-8 are written back as the bytes they were
+        # listed as, anything else that cannot be encoded is replaced
+        try:
+            data = text.encode("utf-8", "surrogateescape")
+        except UnicodeEncodeError:
+            data = text.encode("utf-8", "replace")
+        self.bytes_written += len(data)
+
+        if self._binary is not None:
+            self._binary.write(data)
+            return
+
+        # Whatever was printed before has to come out first
+        sys.stdout.flush()
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(self._fd, view)
+            except BlockingIOError:
+                # stdout was left non-blocking by the parent, wait until it drains
+                import select
+                select.select([], [self._fd], [])
+                continue
+            view = view[written:]
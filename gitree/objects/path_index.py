@@ -0,0 +1,120 @@
+# gitree/objects/path_index.py
+
+"""
+Code file for housing PathIndex class.
+"""
+
+# Default libs
+import os
+from pathlib import Path
+from typing import Iterable
+
+
+class PathIndex:
+    """
+    Ancestor-set index over a list of resolved paths.
+
+    - Build it once from the resolved paths, then query it for any path.
+    - covers(path) tells if the path is one of the indexed paths or under one.
+    - contains(path) tells if one of the indexed paths is the path or under it.
+    - child_names(dir) gives the names leading from dir towards indexed paths.
+
+    All queries cost O(depth) of the queried path instead of O(indexed paths).
+    """
+
+    def __init__(self, paths: Iterable[Path]) -> None:
+        """
+        Index the given resolved paths and all of their ancestors.
+
+        Args:
+            paths (Iterable[Path]): Resolved (absolute) paths to index
+        """
+
+        self._paths: set[str] = set()
+        self._ancestors: set[str] = set()
+        self._children: dict[str, set[str]] = {}
+
+        for path in paths:
+            self._add(os.fspath(path))
+
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+    def covers(self, path: str) -> bool:
+        """
+        Check whether the path is an indexed path or lies under one.
+
+        Args:
+            path (str): Absolute path to check
+
+        Returns:
+            bool: True if the path or one of its parents is indexed
+        """
+
+        while True:
+            if path in self._paths:
+                return True
+
+            parent = os.path.dirname(path)
+            if parent == path:
+                return False
+            path = parent
+
+
+    def contains(self, path: str) -> bool:
+        """
+        Check whether an indexed path is the given path or lies under it.
+
+        Args:
+            path (str): Absolute path to check
+
+        Returns:
+            bool: True if the path is indexed or an ancestor of an indexed path
+        """
+
+        return path in self._paths or path in self._ancestors
+
+
+    def is_ancestor(self, path: str) -> bool:
+        """
+        Check whether the path is a strict ancestor of an indexed path, which
+        also means that it is a directory.
+        """
+
+        return path in self._ancestors
+
+
+    def child_names(self, dir_path: str) -> set[str]:
+        """
+        Get the names of the children of dir_path that are either indexed or
+        lead to an indexed path.
+
+        Args:
+            dir_path (str): Absolute path of the directory
+
+        Returns:
+            set[str]: The child names (empty if nothing indexed is under dir_path)
+        """
+
+        return self._children.get(dir_path, set())
+
+
+    def _add(self, path: str) -> None:
+        """
+        Add a path to the index, registering the chain of its ancestors.
+        """
+
+        self._paths.add(path)
+
+        child = path
+        parent = os.path.dirname(child)
+        while parent != child:
+            self._children.setdefault(parent, set()).add(os.path.basename(child))
+
+            if parent in self._ancestors:
+                break       # The rest of the chain is already registered
+
+            self._ancestors.add(parent)
+            child, parent = parent, os.path.dirname(parent)
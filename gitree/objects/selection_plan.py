@@ -0,0 +1,55 @@
+# gitree/objects/selection_plan.py
+
+"""
+Code file for housing SelectionPlan class.
+"""
+
+# Default libs
+from dataclasses import dataclass
+from pathlib import Path
+
+# Deps from this project
+from .glob_pattern import GlobPattern
+from .path_index import PathIndex
+
+
+@dataclass(frozen=True, slots=True)
+class SelectionPlan:
+    """
+    Immutable set of the paths resolved from the CLI args, computed once before
+    the selection walk starts so the walk never has to resolve them again.
+
+    Attributes:
+        walk_root (Path): The common parent of all includes, the walk starts here
+        given_paths (PathIndex): Non-glob positional paths given by the user
+        includes (PathIndex): Non-glob positional and --include paths (and walk_root)
+        excludes (PathIndex): Non-glob --exclude paths
+        include_patterns (tuple[GlobPattern, ...]): Glob positional and --include paths
+        exclude_patterns (tuple[GlobPattern, ...]): Glob --exclude paths
+        file_types (frozenset[str]): Lowercase suffixes (as ".py") of the 
+            --include-file-types, empty if every file type is included
+    """
+
+    walk_root: Path
+    given_paths: PathIndex
+    includes: PathIndex
+    excludes: PathIndex
+    include_patterns: tuple[GlobPattern, ...] = ()
+    exclude_patterns: tuple[GlobPattern, ...] = ()
+    file_types: frozenset[str] = frozenset()
+
+
+    def has_file_type(self, name: str) -> bool:
+        """
+        Check whether a file name ends with one of the file types, using only 
+        the name. Every suffix of the name is tried, so "tar.gz" works as well.
+        A leading dot does not start a suffix, the same as for os.path.splitext.
+        """
+
+        file_types = self.file_types
+        i = name.find(".", 1)
+        while i != -1:
+            if name[i:].lower() in file_types:
+                return True
+            i = name.find(".", i + 1)
+        return False
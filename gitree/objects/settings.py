@@ -0,0 +1,164 @@
+# gitree/objects/settings.py
+
+"""
+Code file for housing Settings class.
+"""
+
+# Default libs
+import argparse
+from dataclasses import dataclass, fields
+from typing import Any, Callable
+
+# Deps from this project
+from ..utilities.functions_utility import max_items_int, max_entries_int, jobs_int
+
+
+def _bool(value: Any) -> bool:
+    if not isinstance(value, bool):
+        raise TypeError("expected true or false")
+    return value
+
+
+def _int(value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TypeError("expected an integer")
+    return value
+
+
+def _float(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError("expected a number")
+    return float(value)
+
+
+def _str(value: Any) -> str:
+    if not isinstance(value, str):
+        raise TypeError("expected a string")
+    return value
+
+
+def _strs(value: Any) -> tuple[str, ...]:
+    if not isinstance(value, (list, tuple)) or not all(isinstance(v, str) for v in value):
+        raise TypeError("expected a list of strings")
+    return tuple(value)
+
+
+def _format(value: Any) -> str:
+    if value not in ("tree", "json", "md", "ndjson"):
+        raise ValueError("expected one of tree, json, md, ndjson")
+    return value
+
+
+def _stats(value: Any) -> str:
+    if value not in ("", "table", "json"):
+        raise ValueError("expected one of table, json")
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    Immutable, validated configuration of a run, resolved once from the layers
+    of Config (see Config.freeze) so the services read plain slots instead of
+    going through the layers on every access.
+
+    The fields are the keys of the default config (see Config), plus the paths
+    given on the CLI. Lists are kept as tuples.
+    """
+
+    paths: tuple[str, ...] = (".",)
+
+    # General options
+    version: bool = False
+    config_user: bool = False
+    no_config: bool = False
+    verbose: bool = False
+    stats: str = ""
+
+    # Output & export options
+    zip: str = ""
+    export: str = ""
+
+    # Listing options
+    format: str = "tree"
+    max_items: int = 20
+    max_entries: int = 40
+    max_depth: int = 5
+    jobs: int = 1
+    git_index: bool = False
+    untracked: bool = False
+    gitignore_depth: int = 5
+    hidden_items: bool = False
+    exclude: tuple[str, ...] = ()
+    exclude_depth: int = 5
+    include: tuple[str, ...] = ()
+    include_file_types: tuple[str, ...] = ()
+    copy: bool = False
+    emoji: bool = False
+    interactive: bool = False
+    files_first: bool = False
+    print0: bool = False
+    no_color: bool = False
+    no_contents: bool = False
+    no_contents_for: tuple[str, ...] = ()
+    override_files: bool = True
+    max_file_size: float = 1.0
+
+    # Listing override options
+    no_gitignore: bool = False
+    no_files: bool = False
+    no_max_items: bool = False
+    no_max_entries: bool = False
+    no_cache: bool = False
+
+    # Inner tool control (not to be given to the user)
+    no_printing: bool = False
+
+
+    def __post_init__(self) -> None:
+        """
+        Validate (and normalize) every field.
+
+        Raises:
+            ValueError: If a field has a value of the wrong type or out of range
+        """
+
+        for field in fields(self):
+            object.__setattr__(self, field.name,
+                Settings.check(field.name, getattr(self, field.name)))
+
+
+    @staticmethod
+    def check(name: str, value: Any) -> Any:
+        """
+        Validate the value of a field.
+
+        Args:
+            name (str): Name of the field
+            value (Any): Value to validate, as given on the CLI or in a config file
+
+        Returns:
+            Any: The value normalized to the field's type (as lists to tuples)
+
+        Raises:
+            ValueError: If the value has the wrong type or is out of range
+        """
+
+        try:
+            return _CHECKS[name](value)
+        except (TypeError, ValueError, argparse.ArgumentTypeError) as e:
+            raise ValueError(f"Invalid value for '{name}': {value!r} ({e})") from None
+
+
+# The validation of each field, ranges as the CLI checks them
+_CHECKS: dict[str, Callable[[Any], Any]] = {
+    field.name: {bool: _bool, int: _int, float: _float, str: _str,
+        tuple[str, ...]: _strs}[field.type] for field in fields(Settings)
+}
+_CHECKS.update(
+    format=_format,
+    stats=_stats,
+    max_items=lambda v: max_items_int(_int(v)),
+    max_entries=lambda v: max_entries_int(_int(v)),
+    jobs=lambda v: jobs_int(_int(v)),
+)
@@ -0,0 +1,215 @@
+# gitree/objects/traversal_cache.py
+
+"""
+Code file for housing TraversalCache class.
+"""
+
+# Default libs
+import json, os, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+# Deps from this project
+from .app_context import AppContext
+from ..utilities.logging_utility import Logger
+
+
+class TraversalCache:
+    """
+    Persistent cache of directory listings and gitignore verdicts, kept between
+    runs in .gitree/traversal_cache.json.
+
+    - Each record is keyed by the dir path, and is only valid while the dir's
+      (st_dev, st_ino, st_mtime_ns) is unchanged. Adding, removing or renaming
+      an entry changes the mtime of its dir, so the record is then replaced.
+    - The gitignore verdicts of a record are only valid for the same stack of
+      .gitignore files (see GitIgnoreMatcher.signature).
+    - At most MAX_DIRS records are kept, the least recently used are evicted.
+    """
+
+    VERSION = 6
+    MAX_DIRS = 20_000
+
+    # Dirs modified this recently are not cached, since another change within
+    # the same mtime tick would go unnoticed
+    _RACY_NS = 2_000_000_000
+
+
+    def __init__(self, ctx: AppContext, cache_path: Path | None = None) -> None:
+        """
+        Load the cache file. A missing, corrupt or outdated file gives an empty cache.
+
+        Args:
+            ctx (AppContext): The application context
+            cache_path (Path | None): Path of the cache file, defaults to the one
+                next to the user config
+        """
+
+        self.ctx = ctx
+        self.cache_path = cache_path or TraversalCache._get_cache_path()
+
+        self.hits = 0
+        self.misses = 0
+
+        # {dir path: [dev, ino, mtime_ns, [[name, is_dir], ...], ignore sig, verdicts]}
+        self._records: OrderedDict[str, list[Any]] = OrderedDict()
+        self._load()
+
+
+    def listing(self, dir_path: str, st: os.stat_result) -> list[list[Any]] | None:
+        """
+        Get the cached listing of a dir, if its metadata has not changed since.
+
+        Args:
+            dir_path (str): Path of the dir
+            st (os.stat_result): Current stat of the dir
+
+        Returns:
+            list[list[Any]] | None: [name, is_dir] pairs in listing order, or None
+        """
+
+        if not self.is_fresh(dir_path, st):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._records.move_to_end(dir_path)
+        return self._records[dir_path][3]
+
+
+    def is_fresh(self, dir_path: str, st: os.stat_result) -> bool:
+        """
+        Check whether the dir has a record matching its metadata, without counting
+        it as a hit or a miss.
+        """
+
+        record = self._records.get(dir_path)
+        return (record is not None and record[0] == st.st_dev and record[1] == st.st_ino
+            and record[2] == st.st_mtime_ns)
+
+
+    def store_listing(self, dir_path: str, st: os.stat_result,
+        listing: list[list[Any]]) -> None:
+        """
+        Record the listing of a dir, dropping its previous verdicts.
+
+        Args:
+            dir_path (str): Path of the dir
+            st (os.stat_result): Stat of the dir taken before it was listed
+            listing (list[list[Any]]): [name, is_dir] pairs in listing order
+        """
+
+        if time.time_ns() - st.st_mtime_ns < TraversalCache._RACY_NS:
+            self._records.pop(dir_path, None)
+            return
+
+        self._records[dir_path] = [st.st_dev, st.st_ino, st.st_mtime_ns, listing, None, {}]
+        self._records.move_to_end(dir_path)
+
+        while len(self._records) > TraversalCache.MAX_DIRS:
+            self._records.popitem(last=False)
+
+
+    def verdicts(self, dir_path: str, ignore_sig: list[Any]) -> dict[str, bool] | None:
+        """
+        Get the gitignore verdicts of the children of a dir, as a dict to read
+        from and add the missing verdicts to.
+
+        Args:
+            dir_path (str): Path of the dir, already looked up by listing()
+            ignore_sig (list[Any]): Signature of the .gitignore files applying to it
+
+        Returns:
+            dict[str, bool] | None: {name: is ignored}, None if the dir is not cached
+        """
+
+        record = self._records.get(dir_path)
+        if record is None:
+            return None
+
+        if record[4] != ignore_sig:
+            record[4] = ignore_sig
+            record[5] = {}
+        return record[5]
+
+
+    def save(self) -> None:
+        """
+        Write the cache file back if it was used, and log the hit/miss counts.
+        """
+
+        self.ctx.logger.log(Logger.DEBUG,
+            "Traversal cache: %s hits, %s misses", self.hits, self.misses)
+        self.ctx.metrics.add("traversal_cache.hits", self.hits)
+        self.ctx.metrics.add("traversal_cache.misses", self.misses)
+
+        if not self.hits and not self.misses:
+            return
+
+        # Write to a temp file first, so an interrupted run never leaves a
+        # truncated cache behind. json.dumps uses the C encoder, json.dump does not
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            data = json.dumps({"version": TraversalCache.VERSION, "dirs": self._records},
+                ensure_ascii=False, separators=(",", ":"))
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.cache_path)
+
+        except (OSError, TypeError, ValueError) as e:
+            self.ctx.logger.log(Logger.WARNING, f"Could not save the traversal cache: {e}")
+
+
+    def _load(self) -> None:
+        """
+        Read the records from the cache file, ignoring it if it cannot be used.
+        """
+
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.ctx.logger.log(Logger.DEBUG, f"Ignoring the traversal cache: {e}")
+            return
+
+        if not isinstance(data, dict) or data.get("version") != TraversalCache.VERSION:
+            self.ctx.logger.log(Logger.DEBUG, "Ignoring the outdated traversal cache")
+            return
+
+        # A record of the wrong shape would only fail in the middle of the walk, 
+        # so any of them means the file cannot be trusted at all
+        dirs = data.get("dirs")
+        if not isinstance(dirs, dict) or not all(isinstance(dir_path, str) and
+            TraversalCache._valid_record(record) for dir_path, record in dirs.items()):
+            self.ctx.logger.log(Logger.DEBUG, "Ignoring the malformed traversal cache")
+            return
+
+        self._records.update(dirs)
+
+
+    @staticmethod
+    def _valid_record(record: Any) -> bool:
+        """ Check the shape of a cached record, see _records """
+
+        if not (isinstance(record, list) and len(record) == 6 and 
+            all(type(value) is int for value in record[:3])):
+            return False
+
+        listing, ignore_sig, verdicts = record[3:]
+        return (isinstance(listing, list) and all(isinstance(pair, list) and 
+                len(pair) == 2 and isinstance(pair[0], str) and isinstance(pair[1], bool)
+                for pair in listing)
+            and (ignore_sig is None or isinstance(ignore_sig, list))
+            and isinstance(verdicts, dict) and all(isinstance(ignored, bool) 
+                for ignored in verdicts.values()))
+
+
+    @staticmethod
+    def _get_cache_path() -> Path:
+        """ Return the default traversal cache path for gitree """
+        path = Path(".gitree/traversal_cache.json")
+        path.parent.mkdir(exist_ok=True, parents=True)
+        return path
@@ -0,0 +1,113 @@
+# gitree/objects/tree_node.py
+
+"""
+Code file for housing TreeNode class.
+"""
+
+# Default libs
+import os
+from typing import Iterator
+
+
+class TreeNode:
+    """
+    Compact node of the resolved tree, for both files and dirs.
+
+    - Only the name is stored, full paths are rebuilt from the parent chain on
+      demand (see path), or threaded down while walking (see walk, iter_files).
+    - The root stores its full path as its name.
+    - children is a list for dirs (in selection order), and None for files.
+    """
+
+    __slots__ = ("name", "parent", "children")
+
+
+    def __init__(self, name: str, parent: "TreeNode | None" = None,
+        is_dir: bool = False) -> None:
+        """
+        Create a node, and add it to the children of its parent.
+
+        Args:
+            name (str): Name of the item, or the full path for the root
+            parent (TreeNode | None): The parent dir node, None for the root
+            is_dir (bool): Whether the item is a dir
+        """
+
+        self.name = name
+        self.parent = parent
+        self.children: list[TreeNode] | None = [] if is_dir else None
+
+        if parent is not None:
+            parent.children.append(self)
+
+
+    @property
+    def is_dir(self) -> bool:
+        return self.children is not None
+
+
+    @property
+    def path(self) -> str:
+        """
+        Rebuild the full path of the node from its parent chain. O(depth).
+        """
+
+        names = []
+        node = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return os.path.join(*reversed(names))
+
+
+    def walk(self, path: str | None = None,
+        depth: int = 0) -> Iterator[tuple["TreeNode", str, int]]:
+        """
+        Walk the subtree in pre-order and selection order.
+
+        Args:
+            path (str | None): Path of this node if already known
+            depth (int): Depth of this node
+
+        Yields:
+            tuple[TreeNode, str, int]: (node, path, depth) of each node, self first
+        """
+
+        if path is None:
+            path = self.path
+
+        # Explicit stack of reversed children, cheaper than nested generators
+        stack = [(self, path, depth)]
+        while stack:
+            node, path, depth = stack.pop()
+            yield node, path, depth
+
+            if node.children:
+                prefix = path if path.endswith(os.sep) else path + os.sep
+                stack.extend((child, prefix + child.name, depth + 1) 
+                    for child in reversed(node.children))
+
+
+    def iter_files(self) -> Iterator[str]:
+        """
+        Yield the paths of all the files in the subtree, in selection order.
+        """
+
+        if self.children is None:
+            yield self.path
+            return
+
+        # Stack of (children iterator, path prefix) of the dirs being walked, an
+        # iterator is resumed once the subdir it stopped at has been walked
+        path = self.path
+        stack = [(iter(self.children), path if path.endswith(os.sep) else path + os.sep)]
+        while stack:
+            children, prefix = stack[-1]
+            for child in children:
+                if child.children is None:
+                    yield prefix + child.name
+                else:
+                    stack.append((iter(child.children), prefix + child.name + os.sep))
+                    break
+            else:
+                stack.pop()
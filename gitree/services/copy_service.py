@@ -11,7 +11,8 @@ import pyperclip
 
 # Deps from this project
 from ..objects.app_context import AppContext
-from ..objects.config import Config
+from ..objects.settings import Settings
+from ..objects.tree_node import TreeNode
 from ..services.export_service import ExportService
 from ..utilities.logging_utility import Logger
 
@@ -22,30 +23,23 @@ class CopyService:
     """
     
     @staticmethod
-    def run(ctx: AppContext, config: Config, tree_data: dict) -> None:
+    def run(ctx: AppContext, config: Settings, tree_data: TreeNode) -> None:
         """
         Copy the exported project structure + file contents to clipboard,
         using the same format as --export.
 
         Args:
             ctx (AppContext): The application context
-            config (Config): The application configuration
-            tree_data (dict): The resolved tree dict
+            config (Settings): The application configuration
+            tree_data (TreeNode): The root of the resolved tree
         """
 
-        fmt = (getattr(config, "format", "") or "").strip().lower()
-
-        if fmt == "tree":
-            lines = ExportService._export_txt(ctx, config, tree_data)
-
-        elif fmt == "md":
-            lines = ExportService._export_md(ctx, config, tree_data)
-
-        elif fmt == "json":
-            lines = ExportService._export_json(ctx, config, tree_data)
+        lines = ExportService._export_lines(ctx, config, tree_data) or []
 
         try:
-            pyperclip.copy("\n".join(lines))
+            text = "\n".join(lines)
+            pyperclip.copy(text)
+            ctx.metrics.add("copy.chars_copied", len(text))
         except Exception as e:
             ctx.logger.log(Logger.ERROR, f"Failed to copy to clipboard: {e}")
 
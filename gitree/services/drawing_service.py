@@ -7,15 +7,18 @@ Static methods; draws into the output_buffer in AppContext
 """
 
 # Default libs
-from typing import Any
-import json
+from typing import Iterable, Iterator
+import itertools, os
 
 # Deps from this project
 from ..constants.constant import (FILE_EMOJI, NORMAL_DIR_EMOJI, EMPTY_DIR_EMOJI,
     BRANCH, LAST, VERT, SPACE)
 from ..objects.app_context import AppContext
-from ..objects.config import Config
+from ..objects.output_sink import OutputSink
+from ..objects.settings import Settings
+from ..objects.tree_node import TreeNode
 from ..utilities.color_utility import Color
+from ..utilities.walk_utility import path_name, path_is_hidden
 
 
 class DrawingService:
@@ -25,17 +28,21 @@ class DrawingService:
     """
 
     @staticmethod
-    def run(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> None:
+    def run(ctx: AppContext, config: Settings, tree_data: TreeNode) -> None:
         """
         Wrapper function to call the drawing based on config.format
 
         Args:
             ctx (AppContext): The application context
-            config (Config): The application configuration
-            tree_data (dict[str, Any]): The resolved tree dict to draw
+            config (Settings): The application configuration
+            tree_data (TreeNode): The root of the resolved tree to draw
         """
 
-        if config.format == "tree":
+        if config.print0:
+            DrawingService._draw_print0_items(ctx, 
+                DrawingService._iter_tree_items(tree_data, config.files_first))
+
+        elif config.format == "tree":
             DrawingService._draw_tree(ctx, config, tree_data)
 
         elif config.format == "md":
@@ -44,91 +51,181 @@ class DrawingService:
         elif config.format == "json":
             DrawingService._draw_json(ctx, config, tree_data)
 
+        elif config.format == "ndjson":
+            DrawingService._draw_ndjson_items(ctx, 
+                DrawingService._iter_tree_items(tree_data, config.files_first))
+
 
     @staticmethod
-    def _draw_tree(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> None:
+    def stream(ctx: AppContext, config: Settings, 
+        items: Iterable[tuple[int, str, str, bool, bool, bool, bool]]) -> None:
         """
-        Draw the resolved tree structure in the "tree" format.
+        Draw the items streamed by ItemsSelectionService.iter_items, line by line 
+        as they come.
 
         Args:
             ctx (AppContext): The application context
-            config (Config): The application configuration
-            tree_data (dict[str, Any]): The resolved tree dict to draw
+            config (Settings): The application configuration
+            items (Iterable[tuple]): The items, see ItemsSelectionService.iter_items
         """
 
-        def _p(x: Any) -> str:
-            return x.as_posix() if hasattr(x, "as_posix") else str(x)
+        if config.print0:
+            DrawingService._draw_print0_items(ctx, items)
 
-        def _name(p: str) -> str:
-            s = p.rstrip("/\\")
-            return s.split("/")[-1].split("\\")[-1] if s else s
+        elif config.format == "md":
+            ctx.output_buffer.write("```text")
+            DrawingService._draw_items(ctx, config, items)
+            ctx.output_buffer.write("```")
 
-        def _is_dir(node: Any) -> bool:
-            return isinstance(node, dict)
+        elif config.format == "json":
+            DrawingService._draw_json_items(ctx, items)
 
-        def _emoji_for(node: Any) -> str:
-            if not config.emoji:
-                return ""
-            if _is_dir(node):
-                ch = node.get("children", [])
-                return EMPTY_DIR_EMOJI if len(ch) == 0 else NORMAL_DIR_EMOJI
-            return FILE_EMOJI
+        elif config.format == "ndjson":
+            DrawingService._draw_ndjson_items(ctx, items)
 
-        def _children_sorted(children: list[Any]) -> list[Any]:
-            if config.files_first:
-                return sorted(children, key=lambda c: (0 if not _is_dir(c) else 1, _name(_p(c.get("self") if _is_dir(c) else c)).lower()))
-            return sorted(children, key=lambda c: (0 if _is_dir(c) else 1, _name(_p(c.get("self") if _is_dir(c) else c)).lower()))
+        else:
+            DrawingService._draw_items(ctx, config, items)
 
-        def _write_line(prefix: str, connector: str, node: Any) -> None:
-            p = _p(node.get("self") if _is_dir(node) else node)
-            label = _name(p)
-            em = _emoji_for(node)
 
-            if config.no_color:
-                color = Color.default
-            elif DrawingService._is_hidden(p):
-                color = Color.grey
-            elif _is_dir(node):
-                color = Color.cyan
-            else:
-                color = Color.default
+    @staticmethod
+    def _draw_tree(ctx: AppContext, config: Settings, tree_data: TreeNode) -> None:
+        """
+        Draw the resolved tree structure in the "tree" format.
 
-            if em:
-                ctx.output_buffer.write(f"{prefix}{connector}{em} {color(label)}")
-            else:
-                ctx.output_buffer.write(f"{prefix}{connector}{color(label)}")
+        Args:
+            ctx (AppContext): The application context
+            config (Settings): The application configuration
+            tree_data (TreeNode): The root of the resolved tree to draw
+        """
 
-        root_path = _p(tree_data.get("self"))
-        root_label = _name(root_path)
-        root_emoji = _emoji_for(tree_data)
+        DrawingService._draw_items(ctx, config, 
+            DrawingService._iter_tree_items(tree_data, config.files_first))
 
-        if root_emoji:
-            ctx.output_buffer.write(f"{root_emoji} "
-                f"{Color.cyan(root_label) if not config.no_color else root_label}")
-        else:
-            ctx.output_buffer.write(f"{Color.cyan(root_label) if not config.no_color else root_label}")
 
-        def _rec(node: dict[str, Any], prefix: str) -> None:
-            kids = _children_sorted(node.get("children", []))
+    @staticmethod
+    def _iter_tree_items(tree_data: TreeNode, 
+        files_first: bool) -> Iterator[tuple[int, str, str, bool, bool, bool, bool]]:
+        """
+        Walk the resolved tree in drawing order and yield its items in the same 
+        format as ItemsSelectionService.iter_items.
+
+        NOTE: the children are kept in selection order, the files and then the dirs,
+        each already sorted by lowercase name by the listing. So drawing them dirs
+        first (unless --files-first) only needs the two groups to be swapped.
+
+        Args:
+            tree_data (TreeNode): The root of the resolved tree to walk
+            files_first (bool): Whether the files of a dir come before its dirs,
+                True gives the selection order
+
+        Yields:
+            tuple: (depth, path, name, is_dir, is_last, is_empty, is_hidden) for each item
+        """
+
+        def _rec(node: TreeNode, prefix: str, depth: int, 
+            hidden: bool) -> Iterator[tuple[int, str, str, bool, bool, bool, bool]]:
+            dirs = [child for child in node.children if child.children is not None]
+            files = [child for child in node.children if child.children is None]
+            kids = files + dirs if files_first else dirs + files
+
+            last = len(kids) - 1
             for i, child in enumerate(kids):
-                connector = LAST if i == len(kids) - 1 else BRANCH
-                _write_line(prefix, connector, child)
-                if _is_dir(child):
-                    next_prefix = prefix + (SPACE if connector == LAST else VERT)
-                    _rec(child, next_prefix)
+                name = child.name
+                child_path = prefix + name
+                is_hidden = hidden or name.startswith(".")
+                if child.children is not None:
+                    yield (depth, child_path, name, True, i == last, not child.children, 
+                        is_hidden)
+                    if child.children:
+                        yield from _rec(child, child_path + os.sep, depth + 1, is_hidden)
+                else:
+                    yield (depth, child_path, name, False, i == last, True, is_hidden)
+
+        root_path = tree_data.path
+        root_hidden = path_is_hidden(root_path)
+        yield (0, root_path, path_name(root_path), True, True, not tree_data.children, 
+            root_hidden)
+        if tree_data.children:
+            yield from _rec(tree_data, 
+                root_path if root_path.endswith(os.sep) else root_path + os.sep, 1, root_hidden)
+
+
+    @staticmethod
+    def _draw_items(ctx: AppContext, config: Settings, 
+        items: Iterable[tuple[int, str, str, bool, bool, bool, bool]]) -> None:
+        """
+        Draw pre-order (depth, path, name, is_dir, is_last, is_empty, is_hidden) 
+        items in the "tree" format, writing each line as soon as its item comes.
+
+        Everything but the name is looked up: the prefix of the open dirs for the 
+        depth, and the connector, emoji and color codes for the kind of item. So 
+        each line is a single join.
+
+        Args:
+            ctx (AppContext): The application context
+            config (Settings): The application configuration
+            items (Iterable[tuple]): The items to draw, the root first
+        """
 
-        _rec(tree_data, "")
+        def _emoji_for(is_dir: bool, is_empty: bool) -> str:
+            if not config.emoji:
+                return ""
+            if is_dir:
+                return EMPTY_DIR_EMOJI if is_empty else NORMAL_DIR_EMOJI
+            return FILE_EMOJI
+
+        def _color_for(is_dir: bool, is_hidden: bool) -> tuple[str, str]:
+            if config.no_color:
+                return "", ""
+            if is_hidden:
+                return Color.GREY, Color.RESET
+            if is_dir:
+                return Color.CYAN, Color.RESET
+            return "", ""
+
+        # (head, tail) around the name, for each (is_dir, is_last, is_empty, is_hidden)
+        parts: dict[tuple[bool, bool, bool, bool], tuple[str, str]] = {}
+        for is_dir, is_last, is_empty, is_hidden in itertools.product((False, True), repeat=4):
+            em = _emoji_for(is_dir, is_empty)
+            color, reset = _color_for(is_dir, is_hidden)
+            parts[is_dir, is_last, is_empty, is_hidden] = (
+                f"{LAST if is_last else BRANCH}{em + ' ' if em else ''}{color}", reset)
+
+        # Full prefix of the items at each depth, built from the one of their 
+        # parent when a dir is entered
+        prefixes: list[str] = [""]
+        write = ctx.output_buffer.line_writer()
+        n_items = 0
+
+        for depth, _, name, is_dir, is_last, is_empty, is_hidden in items:
+            n_items += 1
+
+            if depth == 0:
+                em = _emoji_for(is_dir, is_empty)
+                root_label = Color.cyan(name) if not config.no_color else name
+                write(f"{em} {root_label}" if em else root_label)
+                continue
+
+            prefix = prefixes[depth - 1]
+            head, tail = parts[is_dir, is_last, is_empty, is_hidden]
+            write(f"{prefix}{head}{name}{tail}")
+
+            if is_dir:
+                del prefixes[depth:]
+                prefixes.append(prefix + (SPACE if is_last else VERT))
+
+        ctx.metrics.add("drawing.items", n_items)
 
 
     @staticmethod
-    def _draw_md(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> None:
+    def _draw_md(ctx: AppContext, config: Settings, tree_data: TreeNode) -> None:
         """
         Draw the resolved tree structure in the "md" format.
 
         Args:
             ctx (AppContext): The application context
-            config (Config): The application configuration
-            tree_data (dict[str, Any]): The resolved tree dict to draw
+            config (Settings): The application configuration
+            tree_data (TreeNode): The root of the resolved tree to draw
         """
         ctx.output_buffer.write("```text")
         DrawingService._draw_tree(ctx, config, tree_data)
@@ -136,30 +233,157 @@ class DrawingService:
 
 
     @staticmethod
-    def _draw_json(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> None:
+    def _draw_json(ctx: AppContext, config: Settings, tree_data: TreeNode) -> None:
         """
         Draw the resolved tree structure in the "json" format.
 
         Args:
             ctx (AppContext): The application context
-            config (Config): The application configuration
-            tree_data (dict[str, Any]): The resolved tree dict to draw
+            config (Settings): The application configuration
+            tree_data (TreeNode): The root of the resolved tree to draw
         """
 
-        def _norm(node: Any) -> Any:
-            if isinstance(node, dict):
-                s = node.get("self")
-                return {
-                    "self": s.as_posix() if hasattr(s, "as_posix") else str(s),
-                    "children": [_norm(c) for c in node.get("children", [])],
-                }
-            return node.as_posix() if hasattr(node, "as_posix") else str(node)
+        # The children are drawn in selection order, the files first
+        DrawingService._draw_json_items(ctx, 
+            DrawingService._iter_tree_items(tree_data, files_first=True))
 
-        ctx.output_buffer.write(json.dumps(_norm(tree_data), indent=2))
+
+    @staticmethod
+    def _draw_json_items(ctx: AppContext, 
+        items: Iterable[tuple[int, str, str, bool, bool, bool, bool]]) -> None:
+        """
+        Draw pre-order items (see ItemsSelectionService.iter_items) in the "json" 
+        format, as {"self": path, "children": [...]} for the dirs and the path 
+        for the files. The lines are written as the items come, the same as 
+        json.dumps(..., indent=2) would give, and only the dirs still open are 
+        held meanwhile.
+
+        NOTE: unless the output is streamed, the lines are written as one message,
+        which the exports keep as one string.
+
+        Args:
+            ctx (AppContext): The application context
+            items (Iterable[tuple]): The items to draw in selection order, the root first
+        """
+        from json.encoder import encode_basestring_ascii as quote
+
+        lines: list[str] = []
+        write = ctx.output_buffer.line_writer() if ctx.output_buffer.streaming else lines.append
+
+        # (indent, is_last) of the dirs whose children are being written
+        open_dirs: list[tuple[str, bool]] = []
+        n_items = 0
+
+        def _close_dir() -> None:
+            indent, is_last = open_dirs.pop()
+            write(f"{indent}  ]")
+            write(f"{indent}}}" if is_last else f"{indent}}},")
+
+        for depth, path, _, is_dir, is_last, is_empty, _ in items:
+            n_items += 1
+            while len(open_dirs) > depth:
+                _close_dir()
+
+            indent = "    " * depth
+            comma = "" if is_last else ","
+            quoted = quote(path.replace(os.sep, "/"))
+
+            if not is_dir:
+                write(f"{indent}{quoted}{comma}")
+                continue
+
+            write(f"{indent}{{")
+            write(f'{indent}  "self": {quoted},')
+            if is_empty:
+                write(f'{indent}  "children": []')
+                write(f"{indent}}}{comma}")
+            else:
+                write(f'{indent}  "children": [')
+                open_dirs.append((indent, is_last))
+
+        while open_dirs:
+            _close_dir()
+
+        if lines:
+            ctx.output_buffer.write("\n".join(lines))
+        ctx.metrics.add("drawing.items", n_items)
 
 
     @staticmethod
-    def _is_hidden(p: str) -> bool:
-        s = p.replace("\\", "/").strip("/")
-        parts = [x for x in s.split("/") if x]
-        return any(part.startswith(".") for part in parts)
+    def _draw_ndjson_items(ctx: AppContext, 
+        items: Iterable[tuple[int, str, str, bool, bool, bool, bool]]) -> None:
+        """
+        Draw pre-order items (see ItemsSelectionService.iter_items) in the "ndjson"
+        format, one JSON object per line and per item, written as the items come:
+        {"path": ..., "type": "dir" or "file", "depth": ..., "size": ..., "is_hidden": ...}
+
+        The paths use "/" as in the "json" format. The size is in bytes, and null
+        for the dirs and the files that cannot be stat'ed.
+
+        Args:
+            ctx (AppContext): The application context
+            items (Iterable[tuple]): The items to draw, the root first
+        """
+        from json.encoder import encode_basestring_ascii as quote
+
+        write = ctx.output_buffer.line_writer()
+        n_items = n_stats = 0
+
+        for depth, path, _, is_dir, _, _, is_hidden in items:
+            n_items += 1
+            quoted = quote(path.replace(os.sep, "/"))
+            hidden = "true" if is_hidden else "false"
+
+            if is_dir:
+                write(f'{{"path": {quoted}, "type": "dir", "depth": {depth}, '
+                    f'"size": null, "is_hidden": {hidden}}}')
+                continue
+
+            n_stats += 1
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                size = "null"
+            write(f'{{"path": {quoted}, "type": "file", "depth": {depth}, '
+                f'"size": {size}, "is_hidden": {hidden}}}')
+
+        ctx.metrics.add("drawing.items", n_items)
+        ctx.metrics.add("drawing.stat_calls", n_stats)
+
+
+    @staticmethod
+    def _draw_print0_items(ctx: AppContext, 
+        items: Iterable[tuple[int, str, str, bool, bool, bool, bool]]) -> None:
+        """
+        Draw the paths of pre-order items (see ItemsSelectionService.iter_items), 
+        each followed by a NUL character instead of a newline (as find -print0 
+        does), so any name can be read back with xargs -0 and the like.
+
+        NOTE: the paths are written in chunks, as raw text. Unless the output is
+        streamed, the chunks are kept as messages of the output buffer, which the
+        exports join back as they are.
+
+        Args:
+            ctx (AppContext): The application context
+            items (Iterable[tuple]): The items to draw, the root first
+        """
+
+        write = ctx.output_sink.write if ctx.output_buffer.streaming else ctx.output_buffer.write
+        chunk: list[str] = []
+        size = 0
+        n_items = 0
+
+        for _, path, *_ in items:
+            n_items += 1
+            chunk.append(path)
+            size += len(path) + 1
+            if size >= OutputSink.CHUNK_SIZE:
+                chunk.append("")
+                write("\0".join(chunk))
+                chunk = []
+                size = 0
+
+        if chunk:
+            chunk.append("")
+            write("\0".join(chunk))
+        ctx.metrics.add("drawing.items", n_items)
@@ -5,45 +5,123 @@ Code file for housing ExportService Class
 """
 
 # Default libs
+import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 # Deps from this project
 from ..objects.app_context import AppContext
-from ..objects.config import Config
+from ..objects.output_sink import OutputSink
+from ..objects.settings import Settings
+from ..objects.tree_node import TreeNode
+from ..utilities.logging_utility import Logger
+from ..utilities.walk_utility import path_name
 
 
 class ExportService:
+
+    # Exports to these suffixes are written as a SQLite index of the items
+    SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+    # Rows inserted per executemany call of the SQLite export
+    SQLITE_BATCH = 10_000
+
+    _SQLITE_SCHEMA = (
+        "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)",
+        "CREATE TABLE entries (id INTEGER PRIMARY KEY, parent_id INTEGER, "
+            "path TEXT NOT NULL, name TEXT NOT NULL, type TEXT NOT NULL, size INTEGER, "
+            "mtime REAL, depth INTEGER NOT NULL, ignored INTEGER NOT NULL)",
+    )
+
+    # Built once the rows are loaded, which is much faster than keeping them 
+    # up to date on every insert
+    _SQLITE_INDEXES = (
+        "CREATE INDEX entries_path ON entries (path)",
+        "CREATE INDEX entries_parent ON entries (parent_id)",
+        "CREATE INDEX entries_name ON entries (name)",
+        "CREATE INDEX entries_type_size ON entries (type, size)",
+    )
+
+
     @staticmethod
-    def run(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> None:
+    def run(ctx: AppContext, config: Settings, tree_data: TreeNode, 
+        ignored: list[tuple[TreeNode, str, bool]] | None = None) -> None:
         """
         Export the already-drawn project structure in ctx.output_buffer, followed by file contents,
-        and save it to a file based on config.format.
+        and save it to a file based on config.format. Exports to a SQLite suffix (see is_sqlite)
+        are written as an index of the items instead, see _export_sqlite.
+
+        Args:
+            ctx (AppContext): The application context
+            config (Settings): The application configuration
+            tree_data (TreeNode): The root of the resolved tree
+            ignored (list | None): Entries dropped by the gitignore rules, for the 
+                SQLite export (see ItemsSelectionService.resolve_items)
         """
 
-        fmt = (getattr(config, "format", "") or "").strip().lower()
         output_path = Path(config.export)
+        if ExportService.is_sqlite(config.export):
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            ExportService._export_sqlite(ctx, config, tree_data, output_path, ignored or [])
+            return
+
+        lines = ExportService._export_lines(ctx, config, tree_data)
+        if not lines:
+            return
+
+        # No newline after the last line, as the export has always been written
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "wb") as f:
+            sink = OutputSink(f)
+            sink.write_lines(lines[:-1])
+            sink.write(lines[-1])
+            sink.flush()
+        ctx.metrics.add("export.bytes_written", sink.bytes_written)
+
+        ctx.output_buffer.clear()
+
+
+    @staticmethod
+    def is_sqlite(export_path: str) -> bool:
+        """
+        Check whether an export is written as a SQLite index, by its suffix.
+        """
+        return Path(export_path).suffix.lower() in ExportService.SQLITE_SUFFIXES
+
+
+    @staticmethod
+    def _export_lines(ctx: AppContext, config: Settings, 
+        tree_data: TreeNode) -> list[str] | None:
+        """
+        Build the lines of the export (or copy) in the format of the config.
 
-        if fmt == "tree":
-            lines = ExportService._export_txt(ctx, config, tree_data)
+        Returns:
+            list[str] | None: The lines, None for an unknown format
+        """
+
+        fmt = (getattr(config, "format", "") or "").strip().lower()
+
+        # Only the paths, as drawn
+        if config.print0:
+            return ["".join(ctx.output_buffer.get_value())]
+
+        elif fmt == "tree":
+            return ExportService._export_txt(ctx, config, tree_data)
 
         elif fmt == "md":
-            lines = ExportService._export_md(ctx, config, tree_data)
+            return ExportService._export_md(ctx, config, tree_data)
 
         elif fmt == "json":
-            lines = ExportService._export_json(ctx, config, tree_data)
+            return ExportService._export_json(ctx, config, tree_data)
 
-        else:
-            return
+        elif fmt == "ndjson":
+            return ExportService._export_ndjson(ctx, config, tree_data)
 
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text("\n".join(lines), encoding="utf-8")
-
-        ctx.output_buffer.clear()
+        return None
 
 
     @staticmethod
-    def _export_txt(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> list[str]:
+    def _export_txt(ctx: AppContext, config: Settings, tree_data: TreeNode) -> list[str]:
         structure = ctx.output_buffer.get_value()
         out: list[str] = []
 
@@ -55,13 +133,13 @@ class ExportService:
             out.append("")
             out.append(f"FILE: {fp}")
             out.append("-" * (6 + len(str(fp))))
-            out.append(ExportService._read_text(fp, config.max_file_size).rstrip("\n"))
+            out.append(ExportService._read_text(ctx, fp, config.max_file_size).rstrip("\n"))
 
         return out
 
 
     @staticmethod
-    def _export_md(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> list[str]:
+    def _export_md(ctx: AppContext, config: Settings, tree_data: TreeNode) -> list[str]:
         structure = ctx.output_buffer.get_value()
         out: list[str] = []
 
@@ -74,7 +152,7 @@ class ExportService:
             out.append(f"### File: {fp}")
             out.append("")
             out.append("```text")
-            out.append(ExportService._read_text(fp, config.max_file_size).rstrip("\n"))
+            out.append(ExportService._read_text(ctx, fp, config.max_file_size).rstrip("\n"))
             out.append("```")
             out.append("")
 
@@ -82,7 +160,7 @@ class ExportService:
 
 
     @staticmethod
-    def _export_json(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> list[str]:
+    def _export_json(ctx: AppContext, config: Settings, tree_data: TreeNode) -> list[str]:
         import json
 
         structure = ctx.output_buffer.get_value()
@@ -90,7 +168,7 @@ class ExportService:
         files = [
             {
                 "path": str(fp),
-                "content": ExportService._read_text(fp, config.max_file_size),
+                "content": ExportService._read_text(ctx, fp, config.max_file_size),
             }
             for fp in ExportService._iter_files(tree_data)
         ]
@@ -104,40 +182,199 @@ class ExportService:
 
 
     @staticmethod
-    def _iter_files(tree_data: Any) -> list[Path]:
+    def _export_ndjson(ctx: AppContext, config: Settings, tree_data: TreeNode) -> list[str]:
+        import json
+
+        # One object per item, then one {"path", "content"} object per file
+        out = ctx.output_buffer.get_value()
+
+        for fp in ExportService._iter_files(tree_data):
+            out.append(json.dumps({
+                "path": str(fp).replace(os.sep, "/"),
+                "content": ExportService._read_text(ctx, fp, config.max_file_size),
+            }))
+
+        return out
+
+
+    @staticmethod
+    def _export_sqlite(ctx: AppContext, config: Settings, tree_data: TreeNode, 
+        output_path: Path, ignored: list[tuple[TreeNode, str, bool]]) -> None:
+        """
+        Write the resolved tree as a SQLite index, to query it without walking
+        the filesystem again. Tables:
+            - entries(id, parent_id, path, name, type, size, mtime, depth, ignored): 
+              a row per item, and per entry dropped by the gitignore rules (with 
+              ignored = 1, nothing under them). path is relative to the root (".")
+              with "/", type is "dir" or "file", size is null for the dirs
+            - contents(entry_id, content): FTS5 table of the file contents, unless
+              --no-contents is used or the sqlite3 build has no FTS5
+            - meta(key, value): the root path and the gitree version
+
+        The rows are inserted with batched executemany calls in one transaction,
+        and the indexes are built after the load. The file is written aside and
+        only replaces the output once complete.
+
+        Args:
+            ctx (AppContext): The application context
+            config (Settings): The application configuration
+            tree_data (TreeNode): The root of the resolved tree
+            output_path (Path): Path of the SQLite file
+            ignored (list): (parent node, name, is_dir) of the ignored entries
+        """
+        import itertools, sqlite3
+        from gitree import __version__
+
+        files: list[tuple[int, str]] = []
+
+        def _batches(rows: Iterable[tuple]) -> Iterator[list[tuple]]:
+            rows = iter(rows)
+            while batch := list(itertools.islice(rows, ExportService.SQLITE_BATCH)):
+                yield batch
+
+        def _text(value: str) -> str:
+            # Names that are not valid UTF-8 cannot be stored as TEXT as is
+            if value.isascii():
+                return value
+            return value.encode("utf-8", "surrogateescape").decode("utf-8", "replace")
+
+        def _stat(path: str, is_dir: bool) -> tuple[int | None, float | None]:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None, None
+            return (None if is_dir else st.st_size), st.st_mtime
+
+        def _rows() -> Iterator[tuple]:
+            # {id(dir node): (row id, path, relative path, depth)}, for the
+            # children (and the ignored entries) to find their parent row
+            dirs: dict[int, tuple[int, str, str, int]] = {}
+
+            root_path = tree_data.path
+            root_len = len(root_path if root_path.endswith(os.sep) else root_path + os.sep)
+            row_id = 0
+
+            for node, path, depth in tree_data.walk(root_path):
+                row_id += 1
+                is_dir = node.children is not None
+                size, mtime = _stat(path, is_dir)
+
+                if depth == 0:
+                    parent_id, rel_path, name = None, ".", path_name(path)
+                else:
+                    parent_id = dirs[id(node.parent)][0]
+                    rel_path, name = path[root_len:].replace(os.sep, "/"), node.name
+
+                if is_dir:
+                    dirs[id(node)] = (row_id, path, rel_path, depth)
+                else:
+                    files.append((row_id, path))
+
+                yield (row_id, parent_id, _text(rel_path), _text(name), 
+                    "dir" if is_dir else "file", size, mtime, depth, 0)
+
+            for parent, name, is_dir in ignored:
+                # The parent may have been dropped afterwards, as interactively
+                parent_row = dirs.get(id(parent))
+                if parent_row is None:
+                    continue
+
+                parent_id, parent_path, parent_rel, parent_depth = parent_row
+                row_id += 1
+                size, mtime = _stat(os.path.join(parent_path, name), is_dir)
+                rel_path = name if parent_rel == "." else f"{parent_rel}/{name}"
+
+                yield (row_id, parent_id, _text(rel_path), _text(name), 
+                    "dir" if is_dir else "file", size, mtime, parent_depth + 1, 1)
+
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        try:
+            tmp_path.unlink(missing_ok=True)
+            conn = sqlite3.connect(tmp_path, isolation_level=None)
+            try:
+                # The file is moved in place only once complete, no journal is needed
+                conn.execute("PRAGMA journal_mode = OFF")
+                conn.execute("PRAGMA synchronous = OFF")
+                conn.execute("BEGIN")
+
+                for statement in ExportService._SQLITE_SCHEMA:
+                    conn.execute(statement)
+                conn.executemany("INSERT INTO meta VALUES (?, ?)", 
+                    [("root", _text(tree_data.path)), ("version", __version__)])
+
+                n_rows = 0
+                for batch in _batches(_rows()):
+                    conn.executemany(
+                        "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                    n_rows += len(batch)
+
+                if not config.no_contents and ExportService._create_fts(ctx, conn):
+                    contents = ((row_id, ExportService._read_text(ctx, Path(path), 
+                        config.max_file_size)) for row_id, path in files)
+                    for batch in _batches(contents):
+                        conn.executemany(
+                            "INSERT INTO contents (entry_id, content) VALUES (?, ?)", batch)
+
+                for statement in ExportService._SQLITE_INDEXES:
+                    conn.execute(statement)
+                conn.execute("COMMIT")
+
+            finally:
+                conn.close()
+            os.replace(tmp_path, output_path)
+
+        except (OSError, sqlite3.Error) as e:
+            ctx.logger.log(Logger.ERROR, f"Could not export to {output_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        ctx.metrics.add("export.rows", n_rows)
+        ctx.metrics.add("export.bytes_written", output_path.stat().st_size)
+
+
+    @staticmethod
+    def _create_fts(ctx: AppContext, conn: Any) -> bool:
         """
-        Flatten the resolved tree dict into a list of file Paths.
+        Create the FTS5 table of the file contents of the SQLite export.
+
+        Returns:
+            bool: Whether the table was created, False if FTS5 is not available
+        """
+        import sqlite3
+
+        try:
+            conn.execute("CREATE VIRTUAL TABLE contents USING fts5(entry_id UNINDEXED, content)")
+        except sqlite3.OperationalError as e:
+            ctx.logger.log(Logger.WARNING, f"Not exporting the file contents, no FTS5: {e}")
+            return False
+        return True
+
+
+    @staticmethod
+    def _iter_files(tree_data: TreeNode | None) -> list[Path]:
+        """
+        Flatten the resolved tree into a list of file Paths.
 
         Args:
-            tree_data (Any): A resolved tree dict with "self" and "children"
+            tree_data (TreeNode | None): The root of the resolved tree
 
         Returns:
             list[Path]: A list of file paths
         """
 
-        if not isinstance(tree_data, dict):
+        if tree_data is None:
             return []
 
-        out: list[Path] = []
-
-        def rec(node: dict[str, Any]) -> None:
-            for child in node.get("children", []):
-                if isinstance(child, dict):
-                    rec(child)
-                else:
-                    p = child if isinstance(child, Path) else Path(str(child))
-                    out.append(p)
-
-        rec(tree_data)
-        return out
+        return [Path(path) for path in tree_data.iter_files()]
 
 
     @staticmethod
-    def _read_text(path: Path, max_size_mb: float = 1.0) -> str:
+    def _read_text(ctx: AppContext, path: Path, max_size_mb: float = 1.0) -> str:
         """
         Read a file as text with size limit and binary detection.
 
         Args:
+            ctx (AppContext): The application context
             path (Path): The file path to read
             max_size_mb (float): Maximum file size in MB (default: 1.0)
 
@@ -163,7 +400,10 @@ class ExportService:
 
 
             # Read as text
-            return p.read_text(encoding="utf-8", errors="ignore")
+            data = p.read_bytes()
+            ctx.metrics.add("export.files_read")
+            ctx.metrics.add("export.bytes_read", len(data))
+            return data.decode("utf-8", errors="ignore")
 
 
         except PermissionError:
@@ -7,6 +7,7 @@ Code file for housing GeneralOptionsService.
 # Deps from this project
 from ..objects.app_context import AppContext
 from ..objects.config import Config
+from ..objects.settings import Settings
 from gitree import __version__
 
 
@@ -16,19 +17,16 @@ class GeneralOptionsService:
     """
     
     @staticmethod
-    def handle_args(ctx: AppContext, config: Config) -> None:
+    def handle_args(ctx: AppContext, config: Settings) -> None:
         """
-        Public function to handle general options and point 
-        no_printing attr to True if one was handled.
+        Public function to handle general options. The settings already have
+        no_printing set if one is used (see ParsingService).
 
         Args:
-            config (Config): config object created in main
+            config (Settings): settings object created in main
         """
 
         if config.config_user:
             Config.open_config_in_editor(ctx)
         elif config.version:
             print(__version__)
-
-        # Set no_printing to True if any were handled
-        config.no_printing = config.config_user or config.version
@@ -5,8 +5,7 @@ Code file for housing InteractiveSelectionService Class
 """
 
 # Default libs
-from pathlib import Path
-from typing import Any, Dict, List, Set, Tuple
+from typing import Dict, List, Set
 from collections import defaultdict
 
 # Dependencies
@@ -20,14 +19,15 @@ from prompt_toolkit.styles import Style
 
 # Deps from this project
 from ..objects.app_context import AppContext
-from ..objects.config import Config
+from ..objects.settings import Settings
+from ..objects.tree_node import TreeNode
 
 
 class InteractiveSelectionService:
     @staticmethod
-    def run(ctx: AppContext, config: Config, resolved_root: Dict[str, Any]) -> Dict[str, Any]:
+    def run(ctx: AppContext, config: Settings, resolved_root: TreeNode) -> TreeNode:
         """
-        Launch an interactive terminal UI for selecting files under the given resolved root dict.
+        Launch an interactive terminal UI for selecting files under the given resolved tree.
 
         The UI presents a hierarchical tree of directories and files. Users can:
         - Navigate using ↑ / ↓
@@ -38,11 +38,11 @@ class InteractiveSelectionService:
 
         Args:
             ctx (AppContext): The application context
-            config (Config): The application configuration
-            resolved_root (dict): A resolved root dict with "self" as a Path and "children" as nested items
+            config (Settings): The application configuration
+            resolved_root (TreeNode): The root of the resolved tree
 
         Returns:
-            dict: The updated resolved root dict in the same format as the input
+            TreeNode: The root of the tree of the selected items
         """
         from prompt_toolkit.data_structures import Point
 
@@ -50,13 +50,9 @@ class InteractiveSelectionService:
         folder_to_files: Dict[int, List[int]] = defaultdict(list)
         folder_to_subdirs: Dict[int, List[int]] = defaultdict(list)
 
-        root_path = resolved_root.get("self")
-        if not isinstance(root_path, Path):
-            root_path = Path(str(root_path))
-
         InteractiveSelectionService._build_tree(
             resolved_root=resolved_root,
-            root=root_path,
+            rel_path=".",
             depth=0,
             tree=tree,
             folder_to_files=folder_to_files,
@@ -228,7 +224,7 @@ class InteractiveSelectionService:
         app.run()
 
         selected_files = {
-            (root_path / item["path"])
+            item["path"]
             for item in tree
             if item["type"] == "file" and item["checked"]
         }
@@ -238,64 +234,57 @@ class InteractiveSelectionService:
 
     @staticmethod
     def _build_tree(
-        resolved_root: Dict[str, Any],
-        root: Path,
+        resolved_root: TreeNode,
+        rel_path: str,
         depth: int,
         tree: List[dict],
         folder_to_files: Dict[int, List[int]],
         folder_to_subdirs: Dict[int, List[int]],
     ) -> None:
         """
-        Flatten the resolved root dict into a render-order tree suitable for the UI.
+        Flatten the resolved tree into a render-order tree suitable for the UI.
 
         This function:
         - Adds directory nodes and file nodes
         - Tracks folder -> files and folder -> subfolders relationships for recursive toggling
 
         Args:
-            resolved_root (dict): The resolved root dict with "self" and "children"
-            root (Path): The root path used to compute relative display paths
+            resolved_root (TreeNode): The dir node to flatten
+            rel_path (str): Path of the dir node relative to the root, in posix format
             depth (int): Current depth level for indentation
             tree (list[dict]): The flat render-order list to populate
             folder_to_files (dict[int, list[int]]): Directory index -> file indices mapping
             folder_to_subdirs (dict[int, list[int]]): Directory index -> directory indices mapping
         """
 
-        dir_path = resolved_root.get("self")
-        if not isinstance(dir_path, Path):
-            dir_path = Path(str(dir_path))
-
         folder_index = len(tree)
-        rel_dir = dir_path.relative_to(root).as_posix() or "(root)"
 
         tree.append({
             "type": "dir",
-            "path": rel_dir,
+            "path": rel_path,
             "depth": depth,
             "checked": False,
         })
 
-        children = resolved_root.get("children", [])
-        for child in children:
-            if isinstance(child, dict):
+        for child in resolved_root.children:
+            child_rel_path = InteractiveSelectionService._join(rel_path, child.name)
+
+            if child.is_dir:
                 child_index = len(tree)
                 folder_to_subdirs[folder_index].append(child_index)
                 InteractiveSelectionService._build_tree(
                     resolved_root=child,
-                    root=root,
+                    rel_path=child_rel_path,
                     depth=depth + 1,
                     tree=tree,
                     folder_to_files=folder_to_files,
                     folder_to_subdirs=folder_to_subdirs,
                 )
             else:
-                child_path = child if isinstance(child, Path) else Path(str(child))
-                rel_path = child_path.relative_to(root).as_posix()
-
                 file_index = len(tree)
                 tree.append({
                     "type": "file",
-                    "path": rel_path,
+                    "path": child_rel_path,
                     "depth": depth + 1,
                     "checked": False,
                 })
@@ -303,37 +292,41 @@ class InteractiveSelectionService:
 
 
     @staticmethod
-    def _filter_resolved_root(resolved_root: Dict[str, Any], selected_files: Set[Path]) -> Dict[str, Any]:
+    def _filter_resolved_root(resolved_root: TreeNode, selected_files: Set[str], 
+        rel_path: str = ".", parent: TreeNode | None = None) -> TreeNode:
         """
-        Filter the resolved root dict in-place style (by rebuilding) to keep only selected files
+        Filter the resolved tree (by rebuilding it) to keep only selected files
         and directories that contain selected descendants.
 
         Args:
-            resolved_root (dict): The resolved root dict to filter
-            selected_files (set[Path]): The set of selected file paths
+            resolved_root (TreeNode): The dir node to filter
+            selected_files (set[str]): The posix paths of the selected files, 
+                relative to the root
+            rel_path (str): Path of the dir node relative to the root, in posix format
+            parent (TreeNode | None): The parent of the rebuilt node, None for the root
 
         Returns:
-            dict: A resolved root dict in the same format containing only selected paths
+            TreeNode: A rebuilt node containing only selected paths
         """
 
-        root_path = resolved_root.get("self")
-        if not isinstance(root_path, Path):
-            root_path = Path(str(root_path))
+        # The root node keeps its full path as its name
+        filtered = TreeNode(resolved_root.name, parent, is_dir=True)
 
-        children = resolved_root.get("children", [])
-        new_children: List[Any] = []
+        for child in resolved_root.children:
+            child_rel_path = InteractiveSelectionService._join(rel_path, child.name)
 
-        for child in children:
-            if isinstance(child, dict):
-                filtered_child = InteractiveSelectionService._filter_resolved_root(child, selected_files)
-                if filtered_child.get("children"):
-                    new_children.append(filtered_child)
-            else:
-                child_path = child if isinstance(child, Path) else Path(str(child))
-                if child_path in selected_files:
-                    new_children.append(child)
+            if child.is_dir:
+                filtered_child = InteractiveSelectionService._filter_resolved_root(
+                    child, selected_files, child_rel_path, filtered)
+                if not filtered_child.children:
+                    filtered.children.pop()
+                    
+            elif child_rel_path in selected_files:
+                TreeNode(child.name, filtered)
 
-        return {
-            "self": root_path,
-            "children": new_children,
-        }
+        return filtered
+
+
+    @staticmethod
+    def _join(rel_path: str, name: str) -> str:
+        return name if rel_path == "." else f"{rel_path}/{name}"
@@ -5,290 +5,723 @@ Code file for the ItemsSelectionService class.
 """
 
 # default libs
-from typing import Any
-import os, glob, time
+from typing import Callable, Iterator
+import os, time, itertools
 from pathlib import Path
 
 # Deps from this project
 from ..objects.app_context import AppContext
-from ..objects.config import Config
+from ..objects.settings import Settings
 from ..objects.gitignore import GitIgnore
+from ..objects.git_index import GitIndex, GitIndexError
+from ..objects.glob_pattern import GlobPattern
+from ..objects.ignore_cache import IgnoreCache
+from ..objects.path_index import PathIndex
+from ..objects.selection_plan import SelectionPlan
+from ..objects.traversal_cache import TraversalCache
+from ..objects.tree_node import TreeNode
 from ..utilities.logging_utility import Logger
 from ..utilities.gitignore_utility import GitIgnoreMatcher
+from ..utilities.glob_utility import GlobMatcher
+from ..utilities.walk_utility import (DirLister, ThreadedDirLister, GitIndexLister, 
+    CachedDirLister, named_entries, entry_is_dir, path_name, path_is_hidden)
 
 
 class ItemsSelectionService:
     """
-    Static class for resolving the args and forming an items dict.
+    Static class for resolving the args and forming the tree of items.
     """
 
-    def resolve_items(ctx: AppContext, config: Config, start_time: float) -> dict[str, Any]:
+    def resolve_items(ctx: AppContext, config: Settings, start_time: float, 
+        ignored: list[tuple[TreeNode, str, bool]] | None = None) -> TreeNode | None:
         """
         Resolves the items to include in the output using the config object. This 
         function is heavy on performance, so a start_time is needed to log performance.
 
         Args:
             start_time (float): relative time value to log performance of the service
+            ignored (list | None): If given, the (parent node, name, is_dir) of the 
+                entries dropped by the gitignore rules are added to it. The walk
+                does not go under the ignored dirs
 
         Returns:
-            dict: A dict of the resolved items
+            TreeNode | None: The root node of the resolved items, None if nothing matched
         """
 
         # Log time at entry
         ctx.logger.log(Logger.DEBUG, 
-            f"Entered ItemsSelectionService at: {round((time.time()-start_time)*1000, 2)} ms")
+            "Entered ItemsSelectionService at: %s ms", round((time.time()-start_time)*1000, 2))
 
 
-        # Resolve all the root paths first
-        # NOTE: the root path is appended at the end of the list of resolved paths
-        resolved_include_paths = ItemsSelectionService._resolve_given_paths(
-            ctx, config, config.paths + config.include)
-        ctx.logger.log(Logger.DEBUG, 
-            f"Selected includes at: {round((time.time()-start_time)*1000, 2)} ms")
-        
-        resolved_exclude_paths = ItemsSelectionService._resolve_given_paths(
-            ctx, config, config.exclude)
-        ctx.logger.log(Logger.DEBUG, 
-            f"Selected excludes at: {round((time.time()-start_time)*1000, 2)} ms")
-        
+        # Resolve all the given paths once, the walk only reads from this plan
+        plan = ItemsSelectionService._build_selection_plan(ctx, config, start_time)
+
 
         # Safety check to avoid crashes on no paths found
-        if not resolved_include_paths:
+        if plan is None:
             ctx.logger.log(Logger.ERROR, "No included paths were found matching given args")
-            return {}
+            return None
 
 
         # Start from the parent dir and keep adding items recursively
         # includes resolving hidden_files, gitignore, include and exclude
-        resolved_items = ItemsSelectionService._resolve_items_rec_wrapper(ctx, config, 
-            resolved_include_paths=resolved_include_paths, curr_depth=0,
-            gitignore_matcher=GitIgnoreMatcher(), start_time=start_time,
-            curr_dir=resolved_include_paths[-1], 
-            exclude_paths=resolved_exclude_paths[:-1])
+        glob_matcher = GlobMatcher(plan)
+        gitignore_matcher = ItemsSelectionService._make_gitignore_matcher(ctx, config, plan)
+        lister = ItemsSelectionService._make_lister(ctx, config, plan)
+        try:
+            resolved_items = ItemsSelectionService._resolve_items_rec_wrapper(ctx, config, 
+                plan=plan, curr_depth=0, gitignore_matcher=gitignore_matcher, 
+                glob_matcher=glob_matcher, start_time=start_time, 
+                curr_dir=plan.walk_root, lister=lister, ignored=ignored)
+        finally:
+            lister.close()
+            gitignore_matcher.close()
+            ctx.metrics.add("gitignore.checks", gitignore_matcher.checks)
         
         ctx.logger.log(Logger.DEBUG, 
-            f"Exited ItemsSelectionService at: {round((time.time()-start_time)*1000, 2)} ms")
+            "Exited ItemsSelectionService at: %s ms", round((time.time()-start_time)*1000, 2))
+        
+
+        # Same as when no paths are found, if only patterns were given and none matched
+        if (not glob_matcher.matched and 
+            all(GlobPattern.is_glob(path_str) for path_str in config.paths + config.include)):
+            ctx.logger.log(Logger.ERROR, "No included paths were found matching given args")
+            return None
 
         return resolved_items
 
+
+    @staticmethod
+    def can_stream(config: Settings) -> bool:
+        """
+        Check whether the selection can be streamed with iter_items. 
+
+        With --max-entries, whether an item is the last one of its dir depends 
+        on the size of the subtrees walked before it, so the (bounded) tree has 
+        to be resolved with resolve_items first. The same goes for glob includes
+        and --include-file-types, since the dirs without matches are only dropped 
+        once walked.
+        """
+
+        return (config.no_max_entries and not config.include_file_types and 
+            not any(GlobPattern.is_glob(path_str) for path_str in config.paths + config.include))
+
+
     @staticmethod
-    def _resolve_given_paths(ctx: AppContext, config: Config, attr: list[str]) -> list[Path]:
+    def iter_items(ctx: AppContext, config: Settings, 
+        start_time: float) -> Iterator[tuple[int, str, str, bool, bool, bool, bool]]:
         """
-        Resolve the given paths in the CLI args. Handles glob patterns, simple paths,
-        and common-parent-search.
+        Streaming version of resolve_items, usable when can_stream(config) is True. 
+        Yields the selected items in pre-order and in drawing order (see --files-first,
+        the "json" format keeps the selection order, files first) as soon as they 
+        are known, so only the children lists of the dirs currently being walked 
+        are held in memory.
 
         Args:
-            attr (list[str]): An attr to resolve the matching paths for
+            start_time (float): relative time value to log performance of the service
 
-        Returns:
-            list[Path]: A list of paths to be added, with the parent appended at the end
+        Yields:
+            tuple: (depth, path, name, is_dir, is_last, is_empty, is_hidden) for 
+                each item, starting with the root at depth 0. is_last tells if the
+                item is the last one of its dir, is_empty tells if a dir has no 
+                selected children, is_hidden if a part of its path is hidden
         """
 
-        calculated_paths: list[Path] = []
-        base_path = Path(os.getcwd())          # This is needed to resolve paths later
+        ctx.logger.log(Logger.DEBUG, 
+            "Entered ItemsSelectionService at: %s ms", round((time.time()-start_time)*1000, 2))
+
+        plan = ItemsSelectionService._build_selection_plan(ctx, config, start_time)
+        if plan is None:
+            ctx.logger.log(Logger.ERROR, "No included paths were found matching given args")
+            return
+        
+
+        gitignore_matcher = ItemsSelectionService._make_gitignore_matcher(ctx, config, plan)
+        lister = ItemsSelectionService._make_lister(ctx, config, plan)
+        try:
+            yield from ItemsSelectionService._iter_items_rec_wrapper(ctx, config, 
+                plan=plan, gitignore_matcher=gitignore_matcher, 
+                glob_matcher=GlobMatcher(plan), start_time=start_time, lister=lister)
+        finally:
+            lister.close()
+            gitignore_matcher.close()
+            ctx.metrics.add("gitignore.checks", gitignore_matcher.checks)
+
+        ctx.logger.log(Logger.DEBUG, 
+            "Exited ItemsSelectionService at: %s ms", round((time.time()-start_time)*1000, 2))
 
 
-        if not attr:        # Safety check
-            return [base_path]
+    @staticmethod
+    def _build_selection_plan(ctx: AppContext, config: Settings, 
+        start_time: float) -> SelectionPlan | None:
+        """
+        Resolve the positional paths, includes and excludes a single time, and index
+        them for the walk.
+
+        Args:
+            start_time (float): relative time value to log performance of the service
+
+        Returns:
+            SelectionPlan | None: The plan, or None if no included paths were found
+        """
 
+        base_path = os.getcwd()          # This is needed to resolve paths later
 
-        # Separately resolve for glob patterns and proper paths
-        # Handles for *, ?, [] based patterns
-        for path_str in attr:
+        def _split(path_strs: list[str]) -> tuple[list[Path], list[GlobPattern]]:
+            """ Resolve the plain paths, and compile the glob patterns """
 
-            # If a glob pattern is provided
-            if ItemsSelectionService._isglob(path_str):
+            paths: list[Path] = []
+            patterns: list[GlobPattern] = []
 
-                # Include underlying and hidden items as well
-                matched_paths = glob.glob(path_str, recursive=True, include_hidden=True)
+            for path_str in path_strs:
+                if not GlobPattern.is_glob(path_str):
+                    paths.append((Path(base_path) / path_str).resolve(strict=False))
+                    continue
 
-                # If the glob could not be resolved
-                if not matched_paths:
+                # Patterns only match under their base, which has to exist
+                pattern = GlobPattern(path_str, base_path)
+                if os.path.isdir(pattern.base):
+                    patterns.append(pattern)
+                else:
                     ctx.logger.log(Logger.WARNING, 
                         f"No matches found for glob pattern '{path_str}'")
                     
-                # Append the matches to the calculated paths
-                for path_str in matched_paths:
-                    calculated_paths.append(Path(path_str).resolve(strict=False))
-                
-            else:
-                path = Path(path_str)
-                resolved_path = (base_path / path).resolve(strict=False)
-                calculated_paths.append(resolved_path)
+            return paths, patterns
+        
+
+        include_paths, include_patterns = _split(config.paths + config.include)
+        ctx.logger.log(Logger.DEBUG, 
+            "Selected includes at: %s ms", round((time.time()-start_time)*1000, 2))
+        
+        exclude_paths, exclude_patterns = _split(config.exclude)
+        ctx.logger.log(Logger.DEBUG, 
+            "Selected excludes at: %s ms", round((time.time()-start_time)*1000, 2))
+        
 
+        # The walk starts from the common parent of the includes and pattern bases
+        roots = include_paths + [Path(pattern.base) for pattern in include_patterns]
+        if not roots:
+            if config.paths or config.include:
+                return None
+            roots = [Path(base_path)]
 
-        # Replace the placeholder for the parent path in the calculated paths
-        if calculated_paths:
-            try:
-                calculated_paths.append(Path(os.path.commonpath(calculated_paths)))
-            except ValueError as e:
-                print(e)
-                exit(1)
+        try:
+            walk_root = Path(os.path.commonpath(roots))
+        except ValueError as e:
+            print(e)
+            exit(1)
+
+
+        # Only plain paths count as given, glob patterns only select their matches
+        given_paths = [(Path(base_path) / path_str).resolve(strict=False) 
+            for path_str in config.paths if not GlobPattern.is_glob(path_str)]
+
+
+        # File types are matched as lowercase suffixes, "py", ".py" and "*.py" alike
+        file_types = frozenset("." + file_type.strip().lstrip("*.").lower()
+            for file_type in config.include_file_types if file_type.strip().lstrip("*."))
+
+
+        # NOTE: the common parent stays in the includes index, so everything
+        # reached by the walk is covered by the includes
+        return SelectionPlan(
+            walk_root=walk_root,
+            given_paths=PathIndex(given_paths),
+            includes=PathIndex(include_paths + [walk_root]),
+            excludes=PathIndex(exclude_paths),
+            include_patterns=tuple(include_patterns),
+            exclude_patterns=tuple(exclude_patterns),
+            file_types=file_types)
+
+
+    @staticmethod
+    def _make_lister(ctx: AppContext, config: Settings, plan: SelectionPlan) -> DirLister:
+        """
+        Create the lister the walk gets the directory listings from.
+
+        Returns:
+            DirLister: The lister, to be closed once the walk is done
+        """
+
+        def _filesystem_lister() -> DirLister:
+            # With --jobs N, directory listings are fetched ahead by a pool of N threads
+            lister = ThreadedDirLister(config.jobs) if config.jobs > 1 else DirLister()
+
+            # Unless --no-cache is used, unchanged dirs are listed from the cache
+            if not config.no_cache:
+                lister = CachedDirLister(TraversalCache(ctx), lister)
+            return lister
+        
+
+        if not config.git_index:
+            return _filesystem_lister()
+        
+
+        # With --git-index, the tracked files are read from the repo's index 
+        repo = GitIndex.find_repo(plan.walk_root)
+        if repo is None:
+            ctx.logger.log(Logger.WARNING, 
+                f"{plan.walk_root} is not in a git repo, walking the filesystem instead")
+            return _filesystem_lister()
+        
+        work_tree, git_dir = repo
+        try:
+            git_index = GitIndex(git_dir / "index", GitIndex.hash_size_for(git_dir))
+        except GitIndexError as e:
+            ctx.logger.log(Logger.WARNING, f"{e}, walking the filesystem instead")
+            return _filesystem_lister()
+        
+        ctx.logger.log(Logger.DEBUG, 
+            f"Read {len(git_index.entries)} entries from the v{git_index.version} index")
+        
+        return GitIndexLister(git_index, os.fspath(work_tree), os.fspath(plan.walk_root),
+            untracked_lister=_filesystem_lister() if config.untracked else None)
+
+
+    @staticmethod
+    def _make_gitignore_matcher(ctx: AppContext, config: Settings, 
+        plan: SelectionPlan) -> GitIgnoreMatcher:
+        """
+        Create the matcher for the .gitignore files found by the walk. In a git repo,
+        the exclude files of the repo (as .git/info/exclude) are loaded once here as
+        its base, so the dirs they exclude are never listed.
 
-        return calculated_paths
+        Returns:
+            GitIgnoreMatcher: The matcher, rooted at the repo's work tree if there 
+                are exclude files, otherwise at the walk root. To be closed once
+                the walk is done
+        """
+
+        if config.no_gitignore:
+            return GitIgnoreMatcher(plan.walk_root)
+
+        # Unless --no-cache is used, the patterns of the unchanged (or identical)
+        # files are not parsed again
+        cache = None if config.no_cache else IgnoreCache(ctx)
+
+        repo = GitIndex.find_repo(plan.walk_root)
+        paths = GitIgnoreMatcher.exclude_files(repo[1]) if repo is not None else []
+        if not paths:
+            return GitIgnoreMatcher(plan.walk_root, cache=cache)
+        
+        ctx.logger.log(Logger.DEBUG, 
+            f"Using the exclude files: {', '.join(map(os.fspath, paths))}")
+        
+        work_tree = repo[0]
+        return GitIgnoreMatcher(work_tree, 
+            excludes=[GitIgnore(ctx, config, gitignore_path=path, cache=cache) 
+                for path in paths],
+            base_depth=len(plan.walk_root.relative_to(work_tree).parts), cache=cache)
 
 
     @staticmethod
-    def _resolve_items_rec_wrapper(ctx: AppContext, config: Config, *,
-        resolved_include_paths: list[Path], curr_dir: Path, curr_depth: int, 
-        exclude_paths: list[Path], start_time: float,
-        gitignore_matcher: GitIgnoreMatcher) -> tuple[dict[str, Any], int]:
+    def _resolve_items_rec_wrapper(ctx: AppContext, config: Settings, *,
+        plan: SelectionPlan, curr_dir: Path, curr_depth: int, start_time: float,
+        gitignore_matcher: GitIgnoreMatcher, glob_matcher: GlobMatcher, 
+        lister: DirLister, ignored: list[tuple[TreeNode, str, bool]] | None) -> TreeNode:
         """
         Resolve the paths recursively.
 
         Returns:
-            dict[str, Any]: A dict of the resolved root and a list of children paths
-            int: current entries to keep track of the number of entries during recursion
+            TreeNode: The root node, with the resolved items under it
         """
 
         # Vars to be used by the inner recursive function
         curr_entries: int = 0
+        log_dirs = ctx.logger.enabled(Logger.DEBUG)
+        file_type_under: dict[str, bool] = {}
+        include_under: dict[str, bool] = {}
         
 
-        def _resolve_items_rec(ctx: AppContext, config: Config, *,
-            resolved_include_paths: list[Path], curr_dir: Path, curr_depth: int, 
-            exclude_paths: list[Path], start_time: float,
-            gitignore_matcher: GitIgnoreMatcher) -> tuple[dict[str, Any], int]:
+        def _has_file_type_under(dir_path: str) -> bool:
+            """ Look on the filesystem for a file of the file types under the dir """
+
+            found = file_type_under.get(dir_path)
+            if found is not None:
+                return found
+            
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                entries = []
+
+            # Names are checked first, only the dirs need their type looked up
+            # NOTE: symlinked dirs are not followed, to not loop forever on cycles
+            found = any(plan.has_file_type(entry.name) and not entry_is_dir(entry) 
+                for entry in entries) or any(entry.is_dir(follow_symlinks=False) and 
+                _has_file_type_under(entry.path) for entry in entries)
+
+            file_type_under[dir_path] = found
+            return found
+
+
+        def _has_include_under(dir_path: str, depth: int) -> bool:
+            """
+            Look on the filesystem for a path under the dir that matches the glob 
+            includes, and that the hidden, exclude and gitignore rules would keep
+            (the same as _selectable_children). depth is the depth of the dir
+            """
+
+            found = include_under.get(dir_path)
+            if found is not None:
+                return found
+
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                entries = []
+
+            check_excludes = depth <= config.exclude_depth
+            check_gitignore = depth <= config.gitignore_depth
+
+            # The .gitignore of the dir applies while it is looked through
+            if check_gitignore and not lister.all_tracked and any(
+                entry.name == ".gitignore" and not entry_is_dir(entry) for entry in entries):
+                gitignore_matcher.add_gitignore(
+                    GitIgnore(ctx, config, gitignore_path=Path(dir_path, ".gitignore"),
+                        cache=gitignore_matcher.cache))
+            rel_prefix = gitignore_matcher.rel_prefix(dir_path)
+            dir_excluded = gitignore_matcher.dir_excluded(dir_path)
+
+            def _kept(entry: os.DirEntry, is_dir: bool) -> bool:
+                if not config.hidden_items and entry.name.startswith("."):
+                    return False
+                if check_excludes and (plan.excludes.covers(entry.path) 
+                    or (glob_matcher.excludes and glob_matcher.excluded(entry.path, is_dir))):
+                    return False
+                if not check_gitignore:
+                    return True
+                
+                ignored = dir_excluded or gitignore_matcher.excluded(
+                    rel_prefix + entry.name, is_dir)
+                if not lister.is_tracked(entry.path):
+                    return not ignored
+                if ignored and is_dir and not lister.all_tracked:
+                    gitignore_matcher.exclude_dir(entry.path)
+                return True
+
+            # NOTE: symlinked dirs are not followed, to not loop forever on cycles
+            found = False
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+
+                if _kept(entry, is_dir) and (glob_matcher.included(entry.path, is_dir) or 
+                    (is_dir and glob_matcher.may_include_under(entry.path) and 
+                        _has_include_under(entry.path, depth + 1))):
+                    found = True
+                    break
+
+            gitignore_matcher.leave(dir_path)
+            include_under[dir_path] = found
+            return found
+
+
+        def _limit_reached(items_added: int) -> bool:
+            return ((not config.no_max_items and items_added >= config.max_items) or
+                (not config.no_max_entries and curr_entries >= config.max_entries))
+
+
+        def _resolve_items_rec(resolved_root: TreeNode, curr_dir: str, curr_depth: int) -> None:
 
             nonlocal curr_entries
 
-            resolved_root: dict[str, Any] = {
-                "self": curr_dir,
-                "children": []
-            }
-            ctx.logger.log(Logger.DEBUG, 
-                f"Entered {curr_dir.name} at: {round((time.time()-start_time)*1000, 2)} ms")
+            if log_dirs:
+                ctx.logger.log(Logger.DEBUG, "Entered %s at: %s ms", 
+                    os.path.basename(curr_dir), round((time.time()-start_time)*1000, 2))
 
 
             # Implementation for --max-depth
             if curr_depth > config.max_depth - 1:
-                return resolved_root, curr_entries
+                return
             
 
-            # Determine whether the current directory is under the given paths
-            dir_under_given_paths = ItemsSelectionService._dir_path_under_given_paths(
-                config, curr_dir)
-            
+            # Files come before dirs in the listing, take the files first
+            on_ignored = None
+            if ignored is not None:
+                on_ignored = lambda entry: ignored.append(
+                    (resolved_root, entry.name, entry_is_dir(entry)))
 
-            # Get the dir's children, sorted order, and files first
-            children_to_add = sorted(curr_dir.iterdir(), key=lambda p: (p.is_dir(), p.name.lower()))
+            files, dirs, tentative = ItemsSelectionService._selectable_children(ctx, config, 
+                plan=plan, curr_dir=curr_dir, curr_depth=curr_depth, 
+                gitignore_matcher=gitignore_matcher, glob_matcher=glob_matcher, lister=lister,
+                on_ignored=on_ignored)
 
+            items_added = 0
+            for entry in files:
 
-            # Setup gitignore object for this dir (if there is a .gitignore)
-            if curr_depth <= config.gitignore_depth and (curr_dir / ".gitignore").is_file():
-                gitignore_matcher.add_gitignore(
-                    GitIgnore(ctx, config, gitignore_path=(curr_dir / ".gitignore")))
+                # If reached --max-items or --max-entries, then exit
+                if _limit_reached(items_added): 
+                    return
 
+                items_added += 1
+                curr_entries += 1  
+                TreeNode(entry.name, resolved_root)
 
-            items_added = 0
-            # Now traverse the dir and add items
-            for item_path in children_to_add:
 
-                # If --no-files is used, then skip files
-                if item_path.is_file() and config.no_files: continue
+            # Let the lister fetch the listings of the dirs that can still be taken
+            # ahead of time, while the walk goes down the first one of them
+            # NOTE: dirs dropped for having no matches free their slot again
+            if lister.parallel and curr_depth + 1 <= config.max_depth - 1:
+                if not config.no_max_items and not (plan.include_patterns or plan.file_types):
+                    dirs = itertools.islice(dirs, config.max_items - items_added)
+                dirs = list(dirs)
+                lister.prefetch(entry.path for entry in dirs)
 
+            for entry in dirs:
+                if _limit_reached(items_added): 
+                    break
 
-                # NOTE: this whole if-elif block bellow basically solves the problem of
-                # all the files and dirs appearing in the output when only the patterns
-                # of some files in some dirs is mentioned.
+                items_added += 1
+                curr_entries += 1  
+                node = TreeNode(entry.name, resolved_root, is_dir=True)
+                _resolve_items_rec(node, entry.path, curr_depth + 1)
+
+                # Drop the dirs only walked to look for glob matches, and with 
+                # --include-file-types every dir, if no matches were found in them.
+                # Past --max-depth (or with --no-files) the matches cannot show up in
+                # the tree, so look for them on the filesystem instead
+                is_tentative = entry.path in tentative
+                if (is_tentative or plan.file_types) and not node.children and (
+                    (curr_depth + 1 <= config.max_depth - 1 and not config.no_files) or 
+                    (is_tentative and not _has_include_under(entry.path, curr_depth + 1)) or
+                    (plan.file_types and not _has_file_type_under(entry.path))):
+                    resolved_root.children.pop()
+                    items_added -= 1
+                    curr_entries -= 1
+
+                # The .gitignore of the dir only applies under it, and the rest of
+                # this dir's children are only filtered after this point
+                gitignore_matcher.leave(entry.path)
+        
 
+        # Use the inner recursive function
+        root = TreeNode(os.fspath(curr_dir), is_dir=True)
+        _resolve_items_rec(root, os.fspath(curr_dir), curr_depth)
+        return root
 
-                # If current dir path is not given
-                if not dir_under_given_paths:
-                    
-                    # If it is a file and it is not is resolved paths
-                    # and if the current dir we are working for, is not given in paths
-                    if (item_path.is_file() and not item_path in resolved_include_paths):
-                        continue
 
+    @staticmethod
+    def _iter_items_rec_wrapper(ctx: AppContext, config: Settings, *, plan: SelectionPlan, 
+        start_time: float, gitignore_matcher: GitIgnoreMatcher, glob_matcher: GlobMatcher,
+        lister: DirLister) -> Iterator[tuple[int, str, str, bool, bool, bool, bool]]:
+        """
+        Yield the items recursively, see iter_items for the format.
+        """
 
-                    # TODO: Pass a list of the important dirs into this function to avoid
-                    # this check and improve performance
-                    # Like if a file gets added to included paths it's parent dirs
-                    # should get added too, and then this elif statement can be removed
+        log_dirs = ctx.logger.enabled(Logger.DEBUG)
+        files_first = config.files_first or config.format == "json"
 
-                    # If it is a dir and it has no file under it that is in resolved_paths
-                    elif (item_path.is_dir() and not any(ItemsSelectionService._isunder(
-                            t, [item_path]) for t in resolved_include_paths)):
-                        continue
+        def _taken_children(curr_dir: str, curr_depth: int) -> list[tuple[str, str, bool]]:
+            """ The (path, name, is_dir) children taken from a dir, in drawing order """
 
+            if log_dirs:
+                ctx.logger.log(Logger.DEBUG, "Entered %s at: %s ms", 
+                    os.path.basename(curr_dir), round((time.time()-start_time)*1000, 2))
 
-                # If reached --max-items or --max-entries, then exit
-                # NOTE: This is ok for now, but needs to be corrected later
-                if ((not config.no_max_items and items_added >= config.max_items) or
-                    (not config.no_max_entries and curr_entries >= config.max_entries)): 
-                    break
+            # Implementation for --max-depth
+            if curr_depth > config.max_depth - 1:
+                return []
 
+            # NOTE: there are no tentative dirs, since glob includes are not streamed
+            files, dirs, _ = ItemsSelectionService._selectable_children(ctx, config, 
+                plan=plan, curr_dir=curr_dir, curr_depth=curr_depth, 
+                gitignore_matcher=gitignore_matcher, glob_matcher=glob_matcher, lister=lister)
+            
+            # Files are taken first, the same way resolve_items does
+            if config.no_max_items:
+                files, dirs = list(files), list(dirs)
+            else:
+                files = list(itertools.islice(files, config.max_items))
+                dirs = list(itertools.islice(dirs, config.max_items - len(files)))
 
-                # Check if it is a hidden file/dir or hidden-items flag is not used
-                if not config.hidden_items and ItemsSelectionService._ishidden(item_path):
-                    continue
+            if lister.parallel and curr_depth + 1 <= config.max_depth - 1:
+                lister.prefetch(entry.path for entry in dirs)
 
-                
-                # if within exclude depth and the item is in excludes
-                if curr_depth <= config.exclude_depth and ItemsSelectionService._isunder(
-                    item_path, exclude_paths):
-                    continue
+            files = [(entry.path, entry.name, False) for entry in files]
+            dirs = [(entry.path, entry.name, True) for entry in dirs]
+            return files + dirs if files_first else dirs + files
+        
 
+        def _iter_items_rec(children: list[tuple[str, str, bool]], depth: int, 
+            hidden: bool) -> Iterator[tuple[int, str, str, bool, bool, bool, bool]]:
+            last = len(children) - 1
+            for i, (path, name, is_dir) in enumerate(children):
+                is_hidden = hidden or name.startswith(".")
 
-                # if within gitignore depth and gitignore says it is excluded
-                if (curr_depth <= config.gitignore_depth and 
-                    gitignore_matcher.excluded(item_path)):
+                if not is_dir:
+                    yield (depth, path, name, False, i == last, True, is_hidden)
                     continue
 
+                # List the dir before yielding it, to know whether it is empty
+                dir_children = _taken_children(path, depth)
+                yield (depth, path, name, True, i == last, not dir_children, is_hidden)
+                yield from _iter_items_rec(dir_children, depth + 1, is_hidden)
+                gitignore_matcher.leave(path)
 
-                # if within include depth and the item is in includes 
-                if (ItemsSelectionService._isunder(item_path, resolved_include_paths)):
-                        
-                        items_added += 1
-                        curr_entries += 1  
-                        
-                        # If the item is a file then append directly, else resolve for it
-                        if item_path.is_file():
-                            resolved_root["children"].append(item_path)
-
-                        else:      
-                            resolved_dir = _resolve_items_rec(
-                                ctx, config, resolved_include_paths=resolved_include_paths, curr_dir=item_path, gitignore_matcher=gitignore_matcher, start_time=start_time,
-                                exclude_paths=exclude_paths, curr_depth=curr_depth+1)
-                                
-                            resolved_root["children"].append(resolved_dir)
-                            
-            return resolved_root
-        
 
-        # Use the inner recursive function
-        return _resolve_items_rec(ctx, config, resolved_include_paths=resolved_include_paths, 
-            curr_dir=curr_dir, curr_depth=curr_depth,
-            exclude_paths=exclude_paths, start_time=start_time, 
-            gitignore_matcher=gitignore_matcher)
+        root = os.fspath(plan.walk_root)
+        root_hidden = path_is_hidden(root)
+        root_children = _taken_children(root, 0)
+        yield (0, root, path_name(root), True, True, not root_children, root_hidden)
+        yield from _iter_items_rec(root_children, 1, root_hidden)
 
 
     @staticmethod
-    def _dir_path_under_given_paths(config: Config, dir_path: Path) -> bool:
-        """ 
-        Check if the dir path was given by the user
+    def _selectable_children(ctx: AppContext, config: Settings, *, plan: SelectionPlan,
+        curr_dir: str, curr_depth: int, gitignore_matcher: GitIgnoreMatcher,
+        glob_matcher: GlobMatcher, lister: DirLister,
+        on_ignored: Callable[[os.DirEntry], None] | None = None
+        ) -> tuple[Iterator[os.DirEntry], Iterator[os.DirEntry], set[str]]:
         """
+        List a directory and filter its children using the hidden, exclude, gitignore
+        and include rules. The .gitignore of the directory is loaded here as well.
 
-        given_paths: list[Path] = []
+        NOTE: the filters do not depend on the --max-items/--max-entries counters,
+        so the caller applies those limits while consuming the results. on_ignored
+        is called with the entries dropped by the gitignore rules as they are met.
 
-        for path_str in config.paths:
-            if not ItemsSelectionService._isglob(path_str): 
-                given_paths.append(Path(path_str).resolve(strict=False))
+        Returns:
+            Iterator[os.DirEntry]: Lazily filtered files, in the listing order
+            Iterator[os.DirEntry]: Lazily filtered dirs, in the listing order
+            set[str]: Paths of the dirs taken only because glob includes may match
+                under them, filled while the dirs are consumed
+        """
 
-        return ItemsSelectionService._isunder(dir_path, given_paths)
-    
+        # Determine whether the current directory is under the given paths
+        dir_under_given_paths = plan.given_paths.covers(curr_dir)
 
-    @staticmethod
-    def _isglob(path_str: str) -> bool:
-        return any(c in path_str for c in "*?[")
-    
+        # Outside the given paths, dirs that glob includes can match under are 
+        # listed as well, only their matches (or the dirs leading to them) are taken
+        dir_under_patterns = (not dir_under_given_paths and 
+            glob_matcher.may_include_under(curr_dir))
+        tentative: set[str] = set()
+        child_names = plan.includes.child_names(curr_dir)
+        
 
-    @staticmethod
-    def _ishidden(item_path: Path) -> bool:
-        return item_path.name.startswith(".")
-    
-    
-    @staticmethod
-    def _isunder(path: Path, parents: list[Path]) -> bool:
-        return any(path == p or path.is_relative_to(p) for p in parents)
+        # Get the dir's children, sorted order, and files first
+        # NOTE: the DirEntry objects cache their type, so no more stat calls are
+        # needed for the is_dir checks bellow
+        if dir_under_given_paths or dir_under_patterns:
+            try:
+                children = lister.scan(curr_dir)
+            except OSError as e:
+                ctx.logger.log(Logger.WARNING, f"Could not list {curr_dir}: {e}")
+                children = []
+
+            ctx.metrics.add("selection.dirs_listed")
+            ctx.metrics.add("selection.entries_listed", len(children))
+
+            has_gitignore = any(entry.name == ".gitignore" and 
+                not entry_is_dir(entry) for entry in children)
+            
+        # Outside the given paths only the children that are included, or lead
+        # to an include, can be selected. So only walk down those chains
+        else:
+            known_dirs = [name for name in child_names if plan.includes.is_ancestor(
+                os.path.join(curr_dir, name))]
+            children = named_entries(curr_dir, child_names, known_dirs=known_dirs)
+            
+            has_gitignore = os.path.isfile(os.path.join(curr_dir, ".gitignore"))
+            ctx.metrics.add("selection.stat_calls", len(child_names) - len(known_dirs) + 1)
+
+
+        # Setup gitignore object for this dir (if there is a .gitignore)
+        if curr_depth <= config.gitignore_depth and has_gitignore and not lister.all_tracked:
+            ctx.metrics.add("gitignore.files")
+            gitignore_matcher.add_gitignore(
+                GitIgnore(ctx, config, gitignore_path=Path(curr_dir, ".gitignore"),
+                    cache=gitignore_matcher.cache))
+            
+
+        # Reuse the verdicts of the previous runs if the dir and the .gitignore 
+        # files applying to it are unchanged, and add the new ones for the next runs
+        verdicts = None
+        if ((dir_under_given_paths or dir_under_patterns) and 
+            curr_depth <= config.gitignore_depth and not config.no_gitignore):
+            verdicts = lister.verdicts(curr_dir, gitignore_matcher.signature())
+            
+
+        # The gitignore checks get the path relative to the walk root, built from
+        # the entry name, and the type cached on the entry
+        rel_prefix = gitignore_matcher.rel_prefix(curr_dir)
+        dir_excluded = gitignore_matcher.dir_excluded(curr_dir)
+
+        def _ignored(entry: os.DirEntry) -> bool:
+            if dir_excluded:
+                return True
+            if verdicts is None:
+                return gitignore_matcher.excluded(rel_prefix + entry.name, entry_is_dir(entry))
+            
+            ignored = verdicts.get(entry.name)
+            if ignored is None:
+                ignored = verdicts[entry.name] = gitignore_matcher.excluded(
+                    rel_prefix + entry.name, entry_is_dir(entry))
+            return ignored
+
+
+        # The settings the checks depend on are the same for all the children
+        by_file_type = bool(plan.file_types)
+        skip_hidden = not config.hidden_items
+        check_excludes = curr_depth <= config.exclude_depth
+        check_gitignore = curr_depth <= config.gitignore_depth
+
+        def _filtered(entries: list[os.DirEntry], 
+            are_files: bool = False) -> Iterator[os.DirEntry]:
+            for entry in entries:
+
+                # With --include-file-types, files of other types are dropped by 
+                # their name alone, before any other (costlier) check
+                if are_files and by_file_type and not plan.has_file_type(entry.name):
+                    continue
+
+                # Check if it is a hidden file/dir or hidden-items flag is not used
+                if skip_hidden and entry.name.startswith("."):
+                    continue
+
+                # if within exclude depth and the item is in excludes
+                if check_excludes and (plan.excludes.covers(entry.path) 
+                    or (glob_matcher.excludes and 
+                        glob_matcher.excluded(entry.path, entry_is_dir(entry)))):
+                    continue
+
+                # if in a dir listed for glob includes, and the item neither leads to 
+                # a plain include nor matches, nor can contain matches
+                if dir_under_patterns and not (entry.name in child_names or 
+                    glob_matcher.included(entry.path, entry_is_dir(entry))):
+                    if not (entry_is_dir(entry) and 
+                        glob_matcher.may_include_under(entry.path)):
+                        continue
+                    tentative.add(entry.path)
+
+                # if within gitignore depth and gitignore says it is excluded
+                # NOTE: same as git, files tracked in the index are never ignored.
+                # The excluded dirs holding them are still entered, and marked so
+                # the untracked files under them are excluded
+                if check_gitignore:
+                    if not lister.is_tracked(entry.path):
+                        if _ignored(entry):
+                            if on_ignored is not None:
+                                on_ignored(entry)
+                            continue
+                    elif (not lister.all_tracked and entry_is_dir(entry) 
+                        and _ignored(entry)):
+                        gitignore_matcher.exclude_dir(entry.path)
+
+                # if the item is in includes
+                if plan.includes.covers(entry.path):
+                    yield entry
+
+
+        # The listing is sorted with files first, so split it at the first dir
+        split = next((i for i, entry in enumerate(children) if entry_is_dir(entry)), 
+            len(children))
+        
+        # If --no-files is used, then skip files
+        files = [] if config.no_files else children[:split]
+
+        return _filtered(files, are_files=True), _filtered(children[split:]), tentative
@@ -7,13 +7,15 @@ correction, and processing for argparse.
 
 # Default libs
 import argparse
+from dataclasses import replace
 
 # Dependencies
 from pathlib import Path
 
 # Imports from this project
-from ..utilities.functions_utility import max_items_int, max_entries_int
+from ..utilities.functions_utility import max_items_int, max_entries_int, jobs_int
 from ..objects.config import Config
+from ..objects.settings import Settings
 from ..objects.app_context import AppContext
 
 
@@ -26,12 +28,12 @@ class ParsingService:
     """
 
     @staticmethod
-    def parse_args(ctx: AppContext) -> Config:
+    def parse_args(ctx: AppContext) -> Settings:
         """
         Public function to parse command-line arguments for the gitree tool.
 
         Returns:
-            Config: Configuration object to be used in-place of args
+            Settings: Resolved configuration to be used in-place of args
         """
 
         ap = argparse.ArgumentParser(
@@ -51,40 +53,47 @@ class ParsingService:
 
 
         # Correct the arguments before returning to avoid complexity
-        # in implementation in main function, then return a Config object
+        # in implementation in main function, then return the settings
         args = ParsingService._correct_args(ctx, args)
 
 
-        # Prepare the config object to return from this function
-        config = Config(ctx, args)
-        config.no_printing = config.copy or config.export or config.zip 
-        if not config.no_color:
-            config.no_color = config.copy or config.export
+        # Resolve the config layers once, and derive the values that depend on
+        # others. The log is only ever printed with --verbose, so nothing is
+        # logged at all without it. Nothing is printed when writing to a
+        # file/clipboard, or when a general option (as --version) was handled
+        # instead
+        settings = Config(ctx, args).freeze()
+        ctx.logger.set_level(ctx.logger.DEBUG if settings.verbose else ctx.logger.DISABLED)
+        settings = replace(settings, 
+            no_printing=bool(settings.copy or settings.export or settings.zip
+                or settings.config_user or settings.version),
+            no_color=bool(settings.no_color or settings.copy or settings.export))
 
-        return ParsingService._fix_contradicting_args(ctx, config)
+        return ParsingService._fix_contradicting_args(ctx, settings)
     
 
     @staticmethod
-    def _fix_contradicting_args(ctx: AppContext, config: Config) -> Config:
+    def _fix_contradicting_args(ctx: AppContext, settings: Settings) -> Settings:
         """
         Prevents unexpected behaviour of the tool if contradictory options are used
         """
         
         # Remove intersecting values for include and exclude patterns
         # Remove duplicates as well
-        include_set = set(config.include)
-        exclude_set = set(config.exclude)
-        common_values = include_set & exclude_set
+        common_values = set(settings.include) & set(settings.exclude)
 
         if common_values:
             ctx.logger.log(ctx.logger.WARNING,
                 "--include and --exclude patterns have overlapping values. "
                 "These values will be removed from both lists ")
-            config.include = list(include_set - common_values)
-            config.exclude = list(exclude_set - common_values)
+            settings = replace(settings, 
+                include=tuple(v for v in dict.fromkeys(settings.include) 
+                    if v not in common_values),
+                exclude=tuple(v for v in dict.fromkeys(settings.exclude) 
+                    if v not in common_values))
 
 
-        return config
+        return settings
 
     
     @staticmethod
@@ -96,7 +105,8 @@ class ParsingService:
         if getattr(args, "export", None) is not None:
             args.export = ParsingService._fix_output_path(
                 ctx, args.export,
-                default_extensions={"tree": ".txt", "json": ".json", "md": ".md"},
+                default_extensions={"tree": ".txt", "json": ".json", "md": ".md", 
+                    "ndjson": ".ndjson"},
                 format_str=args.format
             )
 
@@ -160,6 +170,10 @@ class ParsingService:
                 Export all items and their contents under the current 
                 directory in a file named proj.json
 
+            gitree --format ndjson --no-max-entries
+                Print one JSON object per item while the project is
+                walked, for other tools to read line by line
+
             gitree --zip project
                 Create a zip named project.zip of the whole project 
                 respecting gitignore rules.
@@ -199,6 +213,11 @@ class ParsingService:
             default=argparse.SUPPRESS, 
             help="Enable logger output to the console. Enabling this prints a log"
             " after the full workflow run. Helpful for debugging.")
+        
+        general.add_argument("--stats", nargs="?", const="table", 
+            choices=["table", "json"], default=argparse.SUPPRESS, 
+            help="Print the counters and timers of the run (dirs listed, ignore checks,"
+                " bytes read and written, ...) on stderr, as a table or as JSON")
 
 
     @staticmethod
@@ -219,8 +238,9 @@ class ParsingService:
     def _add_listing_flags(ctx: AppContext, ap: argparse.ArgumentParser):
         listing = ap.add_argument_group("listing options")
 
-        listing.add_argument("--format", choices=["tree", "json", "md"], 
-            default="tree", help="Format output only")
+        listing.add_argument("--format", choices=["tree", "json", "md", "ndjson"], 
+            default="tree", help="Format output only. ndjson prints one JSON object"
+                " (path, type, depth, size, is_hidden) per line and item")
 
         listing.add_argument("--max-items", type=max_items_int, 
             default=argparse.SUPPRESS, 
@@ -234,6 +254,20 @@ class ParsingService:
             default=argparse.SUPPRESS, 
             help="Maximum depth to traverse when selecting files")
         
+        listing.add_argument("-j", "--jobs", type=jobs_int, 
+            default=argparse.SUPPRESS, metavar="N",
+            help="Number of threads listing directories concurrently during selection."
+                " Helps on network filesystems, the output is the same as with 1")
+        
+        listing.add_argument("--git-index", action="store_true", 
+            default=argparse.SUPPRESS, 
+            help="List the files tracked in the repo's .git/index instead of walking"
+                " the filesystem. Much faster on large repos")
+        
+        listing.add_argument("--untracked", action="store_true", 
+            default=argparse.SUPPRESS, 
+            help="With --git-index, also list the untracked files that are not ignored")
+        
         listing.add_argument("--gitignore-depth", type=int, 
             default=argparse.SUPPRESS, 
             help="Limit depth to look for during .gitignore processing")
@@ -269,6 +303,11 @@ class ParsingService:
         listing.add_argument("--files-first", action="store_true", 
             default=argparse.SUPPRESS, help="Print files before directories")
         
+        listing.add_argument("-0", "--print0", action="store_true", 
+            default=argparse.SUPPRESS, 
+            help="Print only the paths of the items, each followed by a NUL"
+                " character instead of a newline (for xargs -0)")
+        
         listing.add_argument("--no-color", action="store_true", 
             default=argparse.SUPPRESS, help="Disable colored output")
         
@@ -302,3 +341,7 @@ class ParsingService:
         
         listing_control.add_argument("--no-files", action="store_true", 
             default=argparse.SUPPRESS, help="Hide files (show only directories)")
+        
+        listing_control.add_argument("--no-cache", action="store_true", 
+            default=argparse.SUPPRESS, 
+            help="Do not use the traversal cache kept in .gitree/ between runs")
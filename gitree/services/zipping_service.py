@@ -7,29 +7,29 @@ Static methods; zips the resolved tree into the configured output path
 """
 
 # Default libs
-from typing import Any
 from pathlib import Path
 import zipfile
 
 # Deps from this project
 from ..objects.app_context import AppContext
-from ..objects.config import Config
+from ..objects.settings import Settings
+from ..objects.tree_node import TreeNode
 
 
 class ZippingService:
     """
-    Static class for zipping the resolved tree (dict format) into a zip file.
+    Static class for zipping the resolved tree into a zip file.
     """
 
     @staticmethod
-    def run(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> None:
+    def run(ctx: AppContext, config: Settings, tree_data: TreeNode) -> None:
         """
-        Zip all files contained in the given resolved tree dict into config.output.
+        Zip all files contained in the given resolved tree into config.output.
 
         Args:
             ctx (AppContext): The application context
-            config (Config): The application configuration
-            tree_data (dict[str, Any]): A resolved tree dict with "self" and "children"
+            config (Settings): The application configuration
+            tree_data (TreeNode): The root of the resolved tree
         """
         
         if not getattr(config, "zip", False):
@@ -38,8 +38,7 @@ class ZippingService:
         zip_path = Path(config.zip)
         zip_path.parent.mkdir(parents=True, exist_ok=True)
 
-        root = tree_data.get("self")
-        root = root if isinstance(root, Path) else Path(str(root))
+        root = Path(tree_data.path)
 
         files = ZippingService._collect_files(tree_data)
 
@@ -51,31 +50,24 @@ class ZippingService:
                 except Exception:
                     continue
 
+            ctx.metrics.add("zip.files", len(zf.infolist()))
+            ctx.metrics.add("zip.bytes_read", sum(info.file_size for info in zf.infolist()))
+
+        ctx.metrics.add("zip.bytes_written", zip_path.stat().st_size)
+
 
     @staticmethod
-    def _collect_files(tree_data: dict[str, Any]) -> list[Path]:
+    def _collect_files(tree_data: TreeNode) -> list[Path]:
         """
-        Collect all file paths from the resolved tree dict.
+        Collect all file paths from the resolved tree.
 
         Args:
-            tree_data (dict[str, Any]): A resolved tree dict with "self" and "children"
+            tree_data (TreeNode): The root of the resolved tree
 
         Returns:
             list[Path]: A list of file Paths found in the tree
         """
-        out: list[Path] = []
-
-        def rec(node: dict[str, Any]) -> None:
-            children = node.get("children", [])
-            for child in children:
-                if isinstance(child, dict):
-                    rec(child)
-                else:
-                    p = child if isinstance(child, Path) else Path(str(child))
-                    out.append(p)
-
-        rec(tree_data)
-        return out
+        return [Path(path) for path in tree_data.iter_files()]
 
 
     @staticmethod
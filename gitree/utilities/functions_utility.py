@@ -46,3 +46,23 @@ def max_entries_int(v: str) -> int:
         raise argparse.ArgumentTypeError(
             "--max-entries must be >= 1 and <=10000")
     return n
+
+
+def jobs_int(v: str) -> int:
+    """
+    Validate and convert jobs argument to integer.
+
+    Args:
+        v (str): String value from command line argument
+
+    Returns:
+        int: Validated integer between 1 and 64
+
+    Raises:
+        argparse.ArgumentTypeError: If value is outside valid range
+    """
+    n = int(v)
+    if n < 1 or n > 64:
+        raise argparse.ArgumentTypeError(
+            "--jobs must be >= 1 and <=64")
+    return n
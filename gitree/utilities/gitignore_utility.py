@@ -5,27 +5,191 @@ Code file for housing GitIgnoreMatcher.
 """
 
 # Default libs
+import os
 from pathlib import Path
 
 # Deps from this project
 from ..objects.gitignore import GitIgnore
-from ..objects.app_context import AppContext
-from ..objects.config import Config
+from ..objects.ignore_cache import IgnoreCache
+from ..objects.ignore_rules import IgnoreRules
 
 
 class GitIgnoreMatcher:
+    """
+    Matches the walked paths against the .gitignore files of the dirs being walked.
 
-    def __init__(self):
-        self.gitignores: list[GitIgnore] = []
+    - The .gitignore files form a stack following the walk: the one of a dir is
+      pushed while listing the dir (add_gitignore), and popped once the walk
+      leaves it (leave). So only the ones of the current dir and its parents are 
+      ever checked, however many dirs were walked before.
+    - Each entry of the stack holds the rules of all the files up to it merged
+      into one regex (see IgnoreRules), shared by everything under its dir.
+    - The exclude files of the repo (see exclude_files) form the base of the 
+      stack, rooted at the repo's work tree.
+    - Paths are given as posix strings relative to the root (see rel_prefix).
+    - Same as git, the patterns only match the paths themselves. The walk does
+      not go under excluded dirs, except for the ones holding tracked files
+      (with --git-index --untracked), which it marks with exclude_dir. All the
+      untracked paths under those are excluded.
+    """
+
+    def __init__(self, root: str, excludes: list[GitIgnore] | None = None, 
+        base_depth: int = 0, cache: IgnoreCache | None = None):
+        """
+        Args:
+            root (str): The walk root, or the work tree of the repo it is in
+            excludes (list[GitIgnore] | None): Exclude files applying from the root
+            base_depth (int): Depth of the walk root under the root
+            cache (IgnoreCache | None): Cache for the patterns of the .gitignore 
+                files, saved by close()
+        """
+
+        self.root = os.fspath(root)
+        self.cache = cache
+
+        # Number of paths checked, see Metrics
+        self.checks = 0
+
+        # (dir path, IgnoreRules of the stack up to the dir's .gitignore), 
+        # from the walk root down to the current dir
+        self._stack: list[tuple[str, IgnoreRules]] = []
+        self._base = IgnoreRules(tuple(("", gitignore) for gitignore in excludes or ()),
+            base_depth)
+
+        # Excluded dirs the walk still entered, see exclude_dir
+        self._excluded_dirs: set[str] = set()
 
     
     def add_gitignore(self, gitignore: GitIgnore):
-        self.gitignores.append(gitignore)
+        self._stack.append((gitignore.root, 
+            self._rules().extend(self.rel_prefix(gitignore.root), gitignore)))
+
+
+    def close(self) -> None:
+        """
+        Save the patterns parsed during the walk for the next runs.
+        """
+
+        if self.cache is not None:
+            self.cache.save()
+
+
+    def exclude_dir(self, dir_path: str) -> None:
+        """
+        Mark an excluded dir the walk enters anyway (for its tracked files), so
+        everything under it is excluded, see dir_excluded.
+        """
+
+        self._excluded_dirs.add(dir_path)
+
+
+    def dir_excluded(self, dir_path: str) -> bool:
+        """
+        Check whether the dir was marked with exclude_dir, or is under one that was.
+        """
+
+        return dir_path in self._excluded_dirs
+
+
+    def leave(self, dir_path: str) -> None:
+        """
+        Pop the .gitignore of a dir (if it had one) once the walk is done with it.
+        """
+
+        if self._stack and self._stack[-1][0] == dir_path:
+            self._stack.pop()
+        self._excluded_dirs.discard(dir_path)
+
+
+    def rel_prefix(self, dir_path: str) -> str:
+        """
+        Get the posix path of a dir relative to the root, with a trailing slash
+        ("" for the root itself), so the walk can build the relative paths of 
+        the dir's children by adding their names to it.
+        """
+
+        if dir_path == self.root:
+            return ""
+        return os.path.relpath(dir_path, self.root).replace(os.sep, "/") + "/"
 
     
-    def excluded(self, item_path: Path) -> bool:
-        for gitignore in self.gitignores:
-            if gitignore.excluded(item_path):
-                return True
-            
-        return False
+    def excluded(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Check whether the .gitignore files of the current dir and its parents
+        exclude the path, the last matching pattern deciding.
+
+        Args:
+            rel_path (str): Posix path relative to the root, of a child of the 
+                current dir
+            is_dir (bool): Whether the path is a dir
+        """
+
+        self.checks += 1
+        return self._rules().excluded(rel_path, is_dir)
+    
+
+    def signature(self) -> list[list]:
+        """
+        Get the signatures of the .gitignore files that apply to the current dir,
+        which together decide the verdicts for its children.
+        """
+
+        return [gitignore.signature for _, gitignore in self._rules().layers]
+
+
+    def _rules(self) -> IgnoreRules:
+        return self._stack[-1][1] if self._stack else self._base
+
+
+    @staticmethod
+    def exclude_files(git_dir: Path) -> list[Path]:
+        """
+        Get the exclude files that apply to the whole repo besides its .gitignore
+        files, the same ones git reads: the user's core.excludesFile (by default
+        $XDG_CONFIG_HOME/git/ignore), then the repo's .git/info/exclude.
+
+        Args:
+            git_dir (Path): The git dir of the repo
+
+        Returns:
+            list[Path]: The exclude files that exist, lowest precedence first
+        """
+
+        home = Path.home()
+        xdg_config = Path(os.environ.get("XDG_CONFIG_HOME") or home / ".config")
+
+        # Later config files override the earlier ones
+        excludes_file = xdg_config / "git" / "ignore"
+        for config_path in (xdg_config / "git" / "config", home / ".gitconfig", 
+            git_dir / "config"):
+            value = GitIgnoreMatcher._core_excludes_file(config_path)
+            if value is not None:
+                excludes_file = Path(os.path.expanduser(value))
+
+        return [path for path in (excludes_file, git_dir / "info" / "exclude") 
+            if path.is_file()]
+
+
+    @staticmethod
+    def _core_excludes_file(config_path: Path) -> str | None:
+        """
+        Read core.excludesFile from a git config file, None if it is not set.
+        """
+
+        try:
+            text = config_path.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return None
+
+        value = None
+        section = ""
+        for line in text.splitlines():
+            line = line.strip()
+            if line.startswith("["):
+                section = line[1:].partition("]")[0].strip().split(" ")[0].lower()
+                continue
+
+            key, sep, val = line.partition("=")
+            if sep and section == "core" and key.strip().lower() == "excludesfile":
+                value = val.split(" #")[0].split(" ;")[0].strip().strip('"')
+        return value
@@ -0,0 +1,53 @@
+# gitree/utilities/glob_utility.py
+
+"""
+Code file for housing GlobMatcher.
+"""
+
+# Default libs
+import os
+
+# Deps from this project
+from ..objects.glob_pattern import GlobPattern
+from ..objects.selection_plan import SelectionPlan
+
+
+class GlobMatcher:
+    """
+    Matches the walked paths against the include and exclude patterns of a plan.
+    """
+
+    def __init__(self, plan: SelectionPlan) -> None:
+        self.include_patterns = plan.include_patterns
+        self.exclude_patterns = plan.exclude_patterns
+
+        # Whether an include pattern matched anything yet
+        self.matched = False
+
+        # An excluded walk root (or parent of it) excludes everything in the walk
+        root = os.fspath(plan.walk_root)
+        self._root_excluded = any(GlobMatcher._match(self.exclude_patterns, path, True)
+            for path in (root, *map(os.fspath, plan.walk_root.parents)))
+
+        # Whether anything can be excluded by the patterns at all
+        self.excludes = self._root_excluded or bool(self.exclude_patterns)
+
+
+    def included(self, path: str, is_dir: bool) -> bool:
+        if GlobMatcher._match(self.include_patterns, path, is_dir):
+            self.matched = True
+            return True
+        return False
+
+
+    def excluded(self, path: str, is_dir: bool) -> bool:
+        return self._root_excluded or GlobMatcher._match(self.exclude_patterns, path, is_dir)
+
+
+    def may_include_under(self, dir_path: str) -> bool:
+        return any(pattern.may_contain(dir_path) for pattern in self.include_patterns)
+
+
+    @staticmethod
+    def _match(patterns: tuple[GlobPattern, ...], path: str, is_dir: bool) -> bool:
+        return any(pattern.matches(path, is_dir) for pattern in patterns)
@@ -4,6 +4,12 @@
 Code file for housing Logger and OutputBuffer classes.
 """
 
+# Default libs
+from collections import deque
+from typing import Any, Callable
+
+# Deps from this project
+from ..objects.output_sink import OutputSink
 from ..utilities.color_utility import Color
 
 
@@ -13,6 +19,15 @@ class Logger:
 
     Collect debug messages in memory via log() and print them
     all at once using flush() method.
+
+    - Messages below the level (see set_level, decided once the args are 
+      parsed) are dropped right away, without being formatted or stored.
+    - The formatting is deferred until the messages are printed: the message 
+      can take %-style args, or be a callable returning the message. Either 
+      way, the values must not change until then.
+    - Only the last max_messages messages are kept, the older ones are 
+      dropped as new ones come in.
+    - The messages are printed through an OutputSink, see flush.
     """
 
     # Constant log levels
@@ -20,11 +35,27 @@ class Logger:
     INFO = 20
     WARNING = 30
     ERROR = 40
+    DISABLED = 100
+
+    # Number of messages kept by default
+    MAX_MESSAGES = 10_000
 
+    _LEVEL_COLORS: dict[int, Callable[[str], str]] = {
+        DEBUG: Color.blue,
+        INFO: Color.green,
+        WARNING: Color.yellow,
+        ERROR: Color.red,
+    }
 
-    def __init__(self):
+
+    def __init__(self, max_messages: int | None = MAX_MESSAGES, 
+        sink: OutputSink | None = None):
         """
         Initialize the logger with an empty buffer.
+
+        Args:
+            max_messages: Number of messages to keep, None to keep them all
+            sink: Where the messages are printed, stdout by default
         """
 
         self._LEVEL_NAMES: dict[int, str] = {
@@ -33,21 +64,52 @@ class Logger:
             30: "WARNING",
             40: "ERROR",
         }
-        self._messages: list[str] = []
+        self.level: int = Logger.DEBUG
 
+        # Messages are stored as given (a str, or a (level, message, args) 
+        # record) and only formatted when read back
+        self._messages: deque[Any] = deque(maxlen=max_messages)
+        self._stored = 0
+        self.sink = sink if sink is not None else OutputSink()
 
-    def log(self, level: str | None, message: str) -> None:
+
+    def set_level(self, level: int) -> None:
+        """
+        Set the lowest level of the messages to store. Logger.DISABLED drops
+        them all.
+        """
+
+        self.level = level
+
+
+    def enabled(self, level: int) -> bool:
+        """
+        Check whether messages of the level are stored, to skip building the
+        args of the messages that would be dropped.
+        """
+
+        return level >= self.level
+
+
+    def log(self, level: int | None, message: str | Callable[[], str], *args: Any) -> None:
         """
         Store a debug message.
 
         Args:
-            message: The debug message to store
+            level: The log level, None for a message without one
+            message: The debug message to store, a %-style format of the args,
+                or a callable returning the message
+            args: The values of the format, if any
         """
 
-        if level is None:
+        if level is not None and level < self.level:
+            return
+
+        self._stored += 1
+        if level is None and not args and message.__class__ is str:
             self._messages.append(message)
         else:
-            self._messages.append(self._append_level(level, message))
+            self._messages.append((level, message, args))
 
 
     def flush(self) -> None:
@@ -56,11 +118,16 @@ class Logger:
         """
 
         if not self._messages:
-            print("No log messages to display.")
+            self.sink.write_line("No log messages to display.")
+            self.sink.flush()
             return
         
-        for message in self._messages:
-            print(message)
+        dropped = self._stored - len(self._messages)
+        if dropped:
+            self.sink.write_line(f"({dropped} earlier messages were dropped)")
+
+        self.sink.write_lines(self.get_logs())
+        self.sink.flush()
         self.clear()
 
 
@@ -70,6 +137,7 @@ class Logger:
         """
 
         self._messages.clear()
+        self._stored = 0
 
     
     def empty(self) -> bool:
@@ -82,13 +150,14 @@ class Logger:
 
     def get_logs(self) -> list[str]:
         """
-        Get a copy of the stored messages in the buffer.
+        Get a copy of the stored messages in the buffer, formatted.
 
         Returns:
             List[str]: a list of the stored messages
         """
 
-        return self._messages.copy()
+        return [message if message.__class__ is str else self._format(*message)
+            for message in self._messages]
 
 
     def __len__(self) -> int:
@@ -102,7 +171,23 @@ class Logger:
         return len(self._messages)
     
 
-    def _append_level(self, level: str, message: str) -> str:
+    def _format(self, level: int | None, message: str | Callable[[], str], 
+        args: tuple) -> str:
+        """
+        Format a stored message, prefixed with its (colored) log level.
+        """
+
+        if callable(message):
+            message = message()
+        elif args:
+            message = message % args
+
+        if level is None:
+            return message
+        return self._append_level(level, message)
+
+
+    def _append_level(self, level: int, message: str) -> str:
         """
         Append the log level to the message.
 
@@ -114,20 +199,9 @@ class Logger:
             The message prefixed with the log level
         """
 
-        label = self._LEVEL_NAMES[level]
-
-        if level == self.DEBUG:
-            colored_label = Color.blue(f"[{label}]")
-        elif level == self.INFO:
-            colored_label = Color.green(f"[{label}]")
-        elif level == self.WARNING:
-            colored_label = Color.yellow(f"[{label}]")
-        elif level == self.ERROR:
-            colored_label = Color.red(f"[{label}]")
-        else:
-            colored_label = f"[{label}]"
-
-        return f"{colored_label} {message}"
+        label = f"[{self._LEVEL_NAMES[level]}]"
+        color = Logger._LEVEL_COLORS.get(level)
+        return f"{color(label) if color else label} {message}"
 
 
 class OutputBuffer(Logger):
@@ -135,21 +209,43 @@ class OutputBuffer(Logger):
     A custom output buffer to capture stdout writes. A wrapper around Logger.
     """
 
-    def __init__(self):
+    def __init__(self, sink: OutputSink | None = None):
         """
-        Initialize the output buffer with a reference to a Logger.
+        Initialize the output buffer with a reference to a Logger. Unlike the
+        log, every line of the output is kept.
+
+        Args:
+            sink: Where the output is printed, stdout by default
         """
-        super().__init__()
+        super().__init__(max_messages=None, sink=sink)
+
+        # When streaming, writes go straight to stdout instead of the storage
+        self.streaming: bool = False
 
 
     def write(self, message: str) -> None:
         """
-        Write a message to the logger's output storage.
+        Write a message to the logger's output storage, or print it right away
+        if the buffer is streaming.
 
         Args:
             message: The message to write
         """
-        super().log(level=None, message=message)
+        if self.streaming:
+            self.sink.write_line(message)
+        else:
+            super().log(level=None, message=message)
+
+
+    def line_writer(self) -> Callable[[str], None]:
+        """
+        Get the function write ends up calling, to skip the streaming check
+        when writing many lines.
+
+        Returns:
+            Callable[[str], None]: Writes a message, the same as write
+        """
+        return self.sink.write_line if self.streaming else self.write
 
 
     def get_value(self) -> list[str]:
@@ -171,6 +267,6 @@ class OutputBuffer(Logger):
         if super().empty():
             return      # Do not print anything
 
-        for message in self.get_value():
-            print(message)
+        self.sink.write_lines(self.get_value())
+        self.sink.flush()
     
\ No newline at end of file
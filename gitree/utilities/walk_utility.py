@@ -0,0 +1,403 @@
+# gitree/utilities/walk_utility.py
+
+"""
+Code file for housing the os.scandir based helpers used by the walk engine.
+
+os.DirEntry objects carry the file type reported by the directory listing
+itself, so checking whether an entry is a dir costs no extra stat syscall
+on most platforms. These helpers keep that cached type around for the
+whole selection pass instead of re-asking the filesystem through pathlib.
+"""
+
+# Default libs
+import os, stat
+from typing import Iterable
+
+# Deps from this project
+from ..objects.git_index import GitIndex
+from ..objects.traversal_cache import TraversalCache
+
+
+class PathEntry:
+    """
+    Minimal stand-in for os.DirEntry, for entries that are known without
+    listing their parent directory.
+    """
+
+    __slots__ = ("name", "path", "_is_dir")
+
+    def __init__(self, path: str, is_dir: bool) -> None:
+        self.name = os.path.basename(path)
+        self.path = path
+        self._is_dir = is_dir
+
+
+    def is_dir(self) -> bool:
+        return self._is_dir
+
+
+    def __fspath__(self) -> str:
+        return self.path
+
+
+class DirLister:
+    """
+    Lists directories for the selection walk, one at a time in the caller's thread.
+    """
+
+    # Whether prefetch() actually fetches ahead, the walk skips preparing the
+    # prefetch list otherwise
+    parallel = False
+
+    # Whether every listed entry is tracked by git, .gitignore files are not 
+    # even loaded then
+    all_tracked = False
+
+
+    def scan(self, dir_path: str) -> list[os.DirEntry]:
+        """
+        List the sorted entries of a directory (see scan_dir).
+        """
+        return scan_dir(dir_path)
+
+
+    def prefetch(self, dir_paths: Iterable[str]) -> None:
+        """
+        Hint that the given directories will be scanned soon. No-op when serial.
+        """
+
+
+    def is_tracked(self, path: str) -> bool:
+        """
+        Check whether a listed path is tracked by git (or is a dir holding tracked 
+        files). Tracked paths are never excluded by .gitignore rules.
+        """
+        return False
+
+
+    def verdicts(self, dir_path: str, ignore_sig: list) -> dict[str, bool] | None:
+        """
+        Get the cached gitignore verdicts for the children of a scanned dir, see 
+        TraversalCache.verdicts. None when the lister does not cache.
+        """
+        return None
+
+
+    def close(self) -> None:
+        """
+        Release any resources held by the lister.
+        """
+
+
+class ThreadedDirLister(DirLister):
+    """
+    Lists directories ahead of the walk using a pool of threads, so the
+    filesystem round-trips of sibling directories overlap. The walk itself (and
+    everything that depends on its order) stays in the caller's thread.
+    """
+
+    parallel = True
+
+
+    def __init__(self, jobs: int) -> None:
+        """
+        Args:
+            jobs (int): Number of threads listing directories concurrently
+        """
+
+        from concurrent.futures import ThreadPoolExecutor, Future
+
+        self._pool = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="gitree-lister")
+        self._pending: dict[str, Future] = {}
+
+
+    def scan(self, dir_path: str) -> list[os.DirEntry]:
+        """
+        Return the prefetched listing of a directory if there is one (waiting for
+        it if needed), otherwise list it right away. Errors of prefetched listings 
+        are raised here, same as for a direct listing.
+        """
+
+        future = self._pending.pop(dir_path, None)
+        if future is None:
+            return scan_dir(dir_path)
+        return future.result()
+
+
+    def prefetch(self, dir_paths: Iterable[str]) -> None:
+        for dir_path in dir_paths:
+            if dir_path not in self._pending:
+                self._pending[dir_path] = self._pool.submit(scan_dir, dir_path)
+
+
+    def close(self) -> None:
+        """
+        Drop the listings that were never asked for and stop the threads.
+        """
+
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True)
+
+
+class GitIndexLister(DirLister):
+    """
+    Lists directories from the tracked paths of a git index instead of the 
+    filesystem. Optionally merges in the filesystem listing, for untracked files.
+    """
+
+    def __init__(self, git_index: GitIndex, work_tree: str, walk_root: str,
+        untracked_lister: DirLister | None = None) -> None:
+        """
+        Args:
+            git_index (GitIndex): The index of the repo
+            work_tree (str): Root of the repo's work tree
+            walk_root (str): Root of the walk, paths outside it are not indexed
+            untracked_lister (DirLister | None): Lister for the filesystem, to also 
+                list the untracked files. Only tracked files are listed if None
+        """
+
+        self._untracked_lister = untracked_lister
+        self.all_tracked = untracked_lister is None
+        self.parallel = untracked_lister is not None and untracked_lister.parallel
+
+        # Tracked children of each dir: {dir path: {name: is_dir}}
+        self._children: dict[str, dict[str, bool]] = {}
+
+        rel_root = os.path.relpath(walk_root, work_tree).replace(os.sep, "/")
+        prefix = "" if rel_root == "." else rel_root + "/"
+
+        for rel_path, mode in git_index.entries:
+            if not rel_path.startswith(prefix):
+                continue
+
+            # Submodules are dirs in the work tree, but have no tracked children
+            path = os.path.join(work_tree, *rel_path.split("/"))
+            is_dir = mode == GitIndex.GITLINK_MODE
+
+            parent = os.path.dirname(path)
+            while True:
+                siblings = self._children.get(parent)
+                known_parent = siblings is not None
+                if not known_parent:
+                    siblings = self._children[parent] = {}
+
+                siblings[os.path.basename(path)] = is_dir
+                if known_parent or parent == walk_root:
+                    break
+
+                path, parent, is_dir = parent, os.path.dirname(parent), True
+
+
+    def scan(self, dir_path: str) -> list[os.DirEntry | PathEntry]:
+        tracked = self._children.get(dir_path, {})
+        entries = [PathEntry(os.path.join(dir_path, name), is_dir) 
+            for name, is_dir in tracked.items()]
+
+        # A tracked dir deleted from the work tree (or unreadable) still lists its
+        # tracked entries, the walk only gets the error if there are none
+        if self._untracked_lister is not None:
+            try:
+                untracked = self._untracked_lister.scan(dir_path)
+            except OSError:
+                if not tracked:
+                    raise
+                untracked = []
+            entries.extend(entry for entry in untracked if entry.name not in tracked)
+
+        entries.sort(key=_entry_sort_key)
+        return entries
+
+
+    def prefetch(self, dir_paths: Iterable[str]) -> None:
+        if self._untracked_lister is not None:
+            self._untracked_lister.prefetch(dir_paths)
+
+
+    def is_tracked(self, path: str) -> bool:
+        siblings = self._children.get(os.path.dirname(path))
+        return siblings is not None and os.path.basename(path) in siblings
+
+
+    def close(self) -> None:
+        if self._untracked_lister is not None:
+            self._untracked_lister.close()
+
+
+class CachedDirLister(DirLister):
+    """
+    Lists directories from a TraversalCache when their metadata is unchanged, 
+    and through another lister (storing the result in the cache) otherwise.
+    """
+
+    def __init__(self, cache: TraversalCache, lister: DirLister) -> None:
+        """
+        Args:
+            cache (TraversalCache): The cache to read from and write to
+            lister (DirLister): The lister used for the dirs that are not cached
+        """
+
+        self.cache = cache
+        self.parallel = lister.parallel
+        self._lister = lister
+        self._stats: dict[str, os.stat_result] = {}
+
+
+    def scan(self, dir_path: str) -> list[os.DirEntry | PathEntry]:
+        st = self._stats.pop(dir_path, None)
+        if st is None:
+            st = os.stat(dir_path)
+            self.cache.ctx.metrics.add("selection.stat_calls")
+
+        listing = self.cache.listing(dir_path, st)
+        if listing is not None:
+            return [PathEntry(os.path.join(dir_path, name), is_dir) 
+                for name, is_dir in listing]
+        
+        entries = self._lister.scan(dir_path)
+        self.cache.store_listing(dir_path, st, 
+            [[entry.name, entry_is_dir(entry)] for entry in entries])
+        return entries
+
+
+    def prefetch(self, dir_paths: Iterable[str]) -> None:
+        """
+        Only let the other lister fetch ahead the dirs that changed since cached.
+        """
+
+        changed = []
+        for dir_path in dir_paths:
+            self.cache.ctx.metrics.add("selection.stat_calls")
+            try:
+                st = self._stats[dir_path] = os.stat(dir_path)
+            except OSError:
+                continue        # scan() raises the error in the walk's order
+
+            if not self.cache.is_fresh(dir_path, st):
+                changed.append(dir_path)
+
+        self._lister.prefetch(changed)
+
+
+    def verdicts(self, dir_path: str, ignore_sig: list) -> dict[str, bool] | None:
+        return self.cache.verdicts(dir_path, ignore_sig)
+
+
+    def close(self) -> None:
+        """
+        Close the other lister and write the cache back.
+        """
+
+        self._lister.close()
+        self.cache.save()
+
+
+def scan_dir(dir_path: str) -> list[os.DirEntry]:
+    """
+    List the entries of a directory using os.scandir, sorted with files first
+    and then by their lowercase names (same order the selection has always used).
+
+    Args:
+        dir_path (str): Path of the directory to list
+
+    Returns:
+        list[os.DirEntry]: The sorted entries of the directory
+    """
+
+    with os.scandir(dir_path) as it:
+        entries = list(it)
+
+    entries.sort(key=_entry_sort_key)
+    return entries
+
+
+def named_entries(dir_path: str, names: Iterable[str], 
+    known_dirs: Iterable[str] = ()) -> list[PathEntry]:
+    """
+    Build entries for the given child names of a directory without listing it.
+    Names in known_dirs are taken as directories as is, the others cost one stat 
+    each and are dropped if they do not exist. Sorted the same way as scan_dir.
+
+    Args:
+        dir_path (str): Path of the parent directory
+        names (Iterable[str]): Names of the children to build entries for
+        known_dirs (Iterable[str]): Names already known to be directories
+
+    Returns:
+        list[PathEntry]: The sorted entries
+    """
+
+    known_dirs = set(known_dirs)
+    entries: list[PathEntry] = []
+
+    for name in names:
+        path = os.path.join(dir_path, name)
+
+        if name in known_dirs:
+            entries.append(PathEntry(path, True))
+            continue
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append(PathEntry(path, stat.S_ISDIR(st.st_mode)))
+
+    entries.sort(key=_entry_sort_key)
+    return entries
+
+
+def entry_is_dir(entry: os.DirEntry | PathEntry) -> bool:
+    """
+    Check whether an entry is a directory (following symlinks) using the type
+    cached on the DirEntry. Errors are treated as "not a dir", the same way
+    Path.is_dir() treats them.
+
+    Args:
+        entry (os.DirEntry): The entry to check
+
+    Returns:
+        bool: True if the entry is a directory, otherwise False
+    """
+
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def path_name(path: str) -> str:
+    """
+    Get the name of the last part of a path (with either separator), as drawn
+    for the root of the tree.
+
+    Args:
+        path (str): The path
+
+    Returns:
+        str: The name, empty for the filesystem root
+    """
+
+    s = path.rstrip("/\\")
+    return s.split("/")[-1].split("\\")[-1] if s else s
+
+
+def path_is_hidden(path: str) -> bool:
+    """
+    Check whether any part of a path is hidden (starts with a dot). The items 
+    under a hidden path are hidden as well, so the walk only checks this once
+    for its root, and then the names of the items.
+
+    Args:
+        path (str): The path
+
+    Returns:
+        bool: True if a part of the path is hidden, otherwise False
+    """
+
+    return any(part.startswith(".") for part in path.replace("\\", "/").split("/"))
+
+
+def _entry_sort_key(entry: os.DirEntry | PathEntry) -> tuple[bool, str]:
+    return (entry_is_dir(entry), entry.name.lower())
@@ -0,0 +1,142 @@
+# tests/test_drawing_service.py
+
+"""
+Code file for TestDrawingService class.
+
+If you find something missing here, it's most likely declared in the
+BaseCLISetup class, since this class inherits from that one.
+"""
+
+import os
+
+from gitree.constants.constant import FILE_EMOJI, NORMAL_DIR_EMOJI, EMPTY_DIR_EMOJI
+from gitree.objects.app_context import AppContext
+from gitree.objects.settings import Settings
+from gitree.objects.tree_node import TreeNode
+from gitree.services.drawing_service import DrawingService
+from gitree.utilities.color_utility import Color
+from tests.base_setup import BaseCLISetup
+
+
+class TestDrawingService(BaseCLISetup):
+    """
+    Tests the lines drawn in the "tree" format, including:
+        - The connectors and prefixes of nested last/non-last children
+        - The emojis and colors around the names
+        - The trees cut by --max-items and --max-depth
+    """
+
+    def __build_tree(self) -> TreeNode:
+        """
+        Build a resolved tree, with the children in selection order (files
+        first, then by lowercase name).
+        """
+
+        root = TreeNode(os.path.join(str(self.root), "project"), is_dir=True)
+        TreeNode("top.txt", root)
+        TreeNode(".hidden", root, is_dir=True)
+        a = TreeNode("a", root, is_dir=True)
+        TreeNode("w.txt", a)
+        TreeNode("x.txt", a)
+        b = TreeNode("b", a, is_dir=True)
+        TreeNode("f1", b)
+        c = TreeNode("c", b, is_dir=True)
+        TreeNode("deep.txt", c)
+        z = TreeNode("z", root, is_dir=True)
+        TreeNode("q", z)
+        return root
+
+
+    def __draw(self, tree: TreeNode, **settings) -> list[str]:
+        ctx = AppContext()
+        DrawingService.run(ctx, Settings(**settings), tree)
+        return ctx.output_buffer.get_value()
+
+
+    def test_nested_connectors(self):
+        """
+        Test the connector of each item and the prefix of the dirs above it,
+        for last and non-last children at every depth.
+        """
+
+        self.assertEqual(self.__draw(self.__build_tree(), no_color=True), [
+            "project",
+            "├─ .hidden",
+            "├─ a",
+            "│  ├─ b",
+            "│  │  ├─ c",
+            "│  │  │  └─ deep.txt",
+            "│  │  └─ f1",
+            "│  ├─ w.txt",
+            "│  └─ x.txt",
+            "├─ z",
+            "│  └─ q",
+            "└─ top.txt",
+        ])
+
+        self.assertEqual(self.__draw(self.__build_tree(), no_color=True, files_first=True), [
+            "project",
+            "├─ top.txt",
+            "├─ .hidden",
+            "├─ a",
+            "│  ├─ w.txt",
+            "│  ├─ x.txt",
+            "│  └─ b",
+            "│     ├─ f1",
+            "│     └─ c",
+            "│        └─ deep.txt",
+            "└─ z",
+            "   └─ q",
+        ])
+
+
+    def test_emojis_and_colors(self):
+        """
+        Test the emoji and the color codes drawn around each kind of name.
+        """
+
+        lines = self.__draw(self.__build_tree(), emoji=True)
+
+        self.assertEqual(lines[0], f"{NORMAL_DIR_EMOJI} {Color.cyan('project')}")
+        self.assertEqual(lines[1], f"├─ {EMPTY_DIR_EMOJI} {Color.GREY}.hidden{Color.RESET}")
+        self.assertEqual(lines[2], f"├─ {NORMAL_DIR_EMOJI} {Color.CYAN}a{Color.RESET}")
+        self.assertEqual(lines[-1], f"└─ {FILE_EMOJI} top.txt")
+
+
+    def test_truncated_trees(self):
+        """
+        Test the trees cut by --max-items and --max-depth: the last item kept
+        in a dir closes its branch, and the dirs at the max depth are drawn
+        without their children. Both for the resolved and the streamed tree.
+        """
+
+        project = self.root / "project"
+        for path in ("a/b/c/deep.txt", "a/b/f1", "a/w.txt", "a/x.txt", "a/y.txt",
+            "z/q", "top.txt"):
+            (project / path).parent.mkdir(parents=True, exist_ok=True)
+            (project / path).write_text("")
+
+        for streamed in ((), ("--no-max-entries",)):
+            result = self.run_gitree("project", "--no-color", "--max-items", "2", *streamed)
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertEqual(result.stdout.splitlines(), [
+                "project",
+                "├─ a",
+                "│  ├─ w.txt",
+                "│  └─ x.txt",
+                "└─ top.txt",
+            ])
+
+            result = self.run_gitree("project", "--no-color", "--max-depth", "2", *streamed)
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertEqual(result.stdout.splitlines(), [
+                "project",
+                "├─ a",
+                "│  ├─ b",
+                "│  ├─ w.txt",
+                "│  ├─ x.txt",
+                "│  └─ y.txt",
+                "├─ z",
+                "│  └─ q",
+                "└─ top.txt",
+            ])
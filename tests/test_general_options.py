@@ -7,6 +7,9 @@ If you find something missing here, it's most likely declared in the
 BaseCLISetup class, since this class inherits from that one.
 """
 
+import json, subprocess, sys
+
+from gitree.constants.constant import HEAVY_MODULES
 from tests.base_setup import BaseCLISetup
 
 
@@ -16,6 +19,9 @@ class TestGeneralOptions(BaseCLISetup):
         - Running gitree with no arguments
         - Displaying version information (--version)
         - Enabling verbose logging (--verbose)
+        - Reading the user config.json
+        - Printing the stats of the run (--stats)
+        - Keeping the heavy deps out of the startup imports
     """
 
     def test_no_arg(self):
@@ -92,3 +98,77 @@ class TestGeneralOptions(BaseCLISetup):
         self.assertIn("LOG", result.stdout,
             msg=self.failed_run_msg(args_str) +
                 f"Expected str 'LOG' not found in output: \n\n{result.stdout}")
+
+
+    def test_user_config(self):
+        """
+        Test that the user config.json applies below the CLI args, that its invalid
+        values fall back to the defaults with a warning, and that --no-config
+        ignores it.
+        """
+
+        (self.root / ".gitree").mkdir()
+        (self.root / ".gitree" / "config.json").write_text(
+            '{"max_depth": 1, "max_items": "many", "files_first": true}')
+        (self.root / "sub" / "deeper").mkdir(parents=True)
+        (self.root / "sub" / "file.txt").write_text("data")
+
+        result = self.run_gitree("--no-color", "--verbose")
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("sub", result.stdout)
+        self.assertNotIn("file.txt", result.stdout)
+        self.assertIn("Invalid value for 'max_items'", result.stdout)
+
+        result = self.run_gitree("--no-color", "--max-depth", "2")
+        self.assertIn("file.txt", result.stdout)
+        self.assertLess(result.stdout.index("file.txt"), result.stdout.index("deeper"))
+
+        result = self.run_gitree("--no-color", "--no-config")
+        self.assertIn("file.txt", result.stdout)
+        self.assertLess(result.stdout.index("deeper"), result.stdout.index("file.txt"))
+
+
+    def test_startup_imports(self):
+        """
+        Test that importing the CLI does not import the heavy deps of the flags
+        that are not used. The time budget is left to benchmarks/bench_startup.py,
+        since timings are too noisy on shared runners.
+        """
+
+        result = subprocess.run([sys.executable, "-c", 
+            "import sys, gitree.main; print(*sys.modules, sep='\\n')"],
+            capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+        heavy = sorted(name for name in result.stdout.split()
+            if name.split(".")[0] in HEAVY_MODULES)
+        self.assertEqual(heavy, [])
+
+
+    def test_stats(self):
+        """
+        Test that --stats prints the counters and timers of the run on stderr, as
+        a table or as JSON, without changing the output on stdout.
+        """
+
+        (self.root / "src").mkdir()
+        (self.root / "src" / ".gitignore").write_text("*.log\n")
+        (self.root / "src" / "main.py").write_text("data")
+        (self.root / "src" / "debug.log").write_text("data")
+
+        plain = self.run_gitree("--no-color")
+        result = self.run_gitree("--no-color", "--stats", "json")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertEqual(result.stdout, plain.stdout)
+
+        stats = json.loads(result.stderr)
+        self.assertEqual(stats["counters"]["selection.dirs_listed"], 2)
+        self.assertEqual(stats["counters"]["gitignore.files"], 1)
+        self.assertGreaterEqual(stats["counters"]["gitignore.checks"], 2)
+        self.assertIn("total", stats["timers_ms"])
+
+        result = self.run_gitree("--no-color", "--stats")
+        self.assertIn("STATS:", result.stderr)
+        self.assertIn("selection.dirs_listed", result.stderr)
+        self.assertNotIn("STATS:", result.stdout)
@@ -1,4 +1,7 @@
 # tests/test_io_flags.py
+import sqlite3
+import subprocess
+import sys
 import zipfile
 
 from tests.base_setup import BaseCLISetup
@@ -9,6 +12,8 @@ class TestIOFlags(BaseCLISetup):
     Tests I/O-related CLI flags, including:
         - Creating zip archives using --zip
         - Exporting tree output to a file using --export
+        - Exporting a SQLite index of the items using --export with a .sqlite file
+        - Stopping quietly when the reader of the output goes away
     """
 
     # Note: There is no test for copy-to-clipboard currently
@@ -49,3 +54,59 @@ class TestIOFlags(BaseCLISetup):
         content = out_path.read_text()
         self.assertIn("CONTENTS", content)
 
+
+    def test_export_sqlite(self):
+        """
+        Verify that --export to a .sqlite file writes a row per item, plus the
+        entries dropped by .gitignore flagged as ignored, and the file contents.
+        """
+        (self.root / ".gitignore").write_text("*.log\n")
+        (self.root / "src").mkdir()
+        (self.root / "src" / "main.py").write_text("print('needle')")
+        (self.root / "debug.log").write_text("log")
+
+        result = self.run_gitree("--export", "index.sqlite")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertEqual(result.stdout, "")
+
+        conn = sqlite3.connect(self.root / "index.sqlite")
+        try:
+            rows = {path: (parent_id, type_, size, depth, ignored) for path, parent_id, 
+                type_, size, depth, ignored in conn.execute(
+                    "SELECT path, parent_id, type, size, depth, ignored FROM entries")}
+            src_id = conn.execute("SELECT id FROM entries WHERE path = 'src'").fetchone()[0]
+            matches = conn.execute("SELECT e.path FROM contents JOIN entries e "
+                "ON e.id = contents.entry_id WHERE contents MATCH 'needle'").fetchall()
+        finally:
+            conn.close()
+
+        self.assertEqual(rows["."][1:], ("dir", None, 0, 0))
+        self.assertEqual(rows["src/main.py"], (src_id, "file", 15, 2, 0))
+        self.assertEqual(rows["debug.log"][1:], ("file", 3, 1, 1))
+        self.assertEqual(matches, [("src/main.py",)])
+
+
+    def test_closed_pipe(self):
+        """
+        Verify that the tool stops quietly, without a traceback, when the
+        reader of its output stops reading (as when piped into head).
+        """
+        for i in range(5000):
+            (self.root / f"file_with_a_rather_long_name_{i:05d}.txt").touch()
+
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "gitree.main", "--no-max-items", "--no-max-entries"],
+            cwd=self.root,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        first_line = proc.stdout.readline()
+        proc.stdout.close()
+        stderr = proc.stderr.read().decode("utf-8", errors="replace")
+        proc.wait(timeout=60)
+        proc.stderr.close()
+
+        self.assertTrue(first_line, self.no_output_msg())
+        self.assertNotIn("Traceback", stderr)
+        self.assertNotIn("Error", stderr)
@@ -1,4 +1,6 @@
 # tests/test_listing_flags.py
+import json, os, shutil, subprocess
+from pathlib import Path
 from gitree.constants.constant import FILE_EMOJI, EMPTY_DIR_EMOJI, NORMAL_DIR_EMOJI
 from tests.base_setup import BaseCLISetup
 
@@ -11,6 +13,9 @@ class TestListingFlags(BaseCLISetup):
         - Showing hidden files & folders (--hidden-items)
         - Ordering files before folders (--files-first)
         - Inclusion overrides that bypass .gitignore (--include)
+        - Filtering files by their extension (--include-file-types)
+        - Printing the tree as JSON (--format json)
+        - Printing the items as JSON lines (--format ndjson) or NUL-separated paths (--print0)
     """
 
     @staticmethod
@@ -121,3 +126,446 @@ class TestListingFlags(BaseCLISetup):
         (self.root / "error.log").write_text("log")
         (self.root / "data.json").write_text("{}")
 
+
+
+    def test_jobs(self):
+        """
+        Verify that the --jobs flag lists directories concurrently without
+        changing the output, including the --max-items and --max-entries cutoffs.
+        """
+        # Create a few nested directories with files
+        for d in range(4):
+            for s in range(3):
+                sub_dir = self.root / f"dir_{d}" / f"sub_{s}"
+                sub_dir.mkdir(parents=True)
+                for f in range(5):
+                    (sub_dir / f"file_{f}.txt").write_text("data")
+        (self.root / "dir_1" / ".gitignore").write_text("sub_2/\n")
+
+        for extra_args in ([], ["--max-items", "2"], ["--max-entries", "15"]):
+            result_serial = self.run_gitree("--no-color", *extra_args)
+            result_jobs = self.run_gitree("--no-color", "--jobs", "4", *extra_args)
+
+            self.assertEqual(result_jobs.returncode, 0, msg=result_jobs.stderr)
+            self.assertTrue(result_jobs.stdout.strip())
+            self.assertEqual(result_serial.stdout, result_jobs.stdout)
+
+
+    def test_nested_gitignores(self):
+        """
+        Verify that the rules of a nested .gitignore only apply under its own dir,
+        both when the tree is streamed and when it is resolved first.
+        """
+        (self.root / ".gitignore").write_text("*.tmp\n")
+        for package in ("pkg_a", "pkg_b", "pkg_c"):
+            (self.root / package / "sub").mkdir(parents=True)
+            (self.root / package / "sub" / f"{package}.log").write_text("data")
+            (self.root / package / f"{package}.tmp").write_text("data")
+        (self.root / "pkg_b" / ".gitignore").write_text("*.log\n")
+
+        for args in (["--no-max-entries"], ["--max-entries", "100"]):
+            result = self.run_gitree("--no-color", *args)
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertIn("pkg_a.log", result.stdout)
+            self.assertIn("pkg_c.log", result.stdout)
+            self.assertNotIn("pkg_b.log", result.stdout)
+            self.assertNotIn(".tmp", result.stdout)
+
+
+    def test_nested_gitignore_negation(self):
+        """
+        Verify that the last matching pattern decides, and that the patterns of a
+        nested .gitignore come after the ones of its parent dirs.
+        """
+        (self.root / ".gitignore").write_text("*.log\n")
+        (self.root / "pkg").mkdir()
+        (self.root / "pkg" / ".gitignore").write_text("!keep.log\n")
+        for path in ("keep.log", "pkg/keep.log", "pkg/other.log"):
+            (self.root / path).write_text("data")
+
+        result = self.run_gitree("--no-color", "--no-max-entries", "--hidden-items")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("pkg", result.stdout)
+        self.assertEqual(result.stdout.count("keep.log"), 1)
+        self.assertNotIn("other.log", result.stdout)
+
+
+    def test_nested_gitignore_negated_dir(self):
+        """
+        Verify that a negation in a nested .gitignore matching a dir only re-includes
+        the dir itself, and not the paths under it that a parent .gitignore excludes.
+        """
+        (self.root / ".gitignore").write_text("build\n")
+        (self.root / "sub" / "abc").mkdir(parents=True)
+        (self.root / "sub" / ".gitignore").write_text("!a*\n")
+        (self.root / "sub" / "abc" / "build").write_text("data")
+        (self.root / "sub" / "abc" / "main.py").write_text("data")
+
+        for args in ([], ["--no-cache"]):
+            result = self.run_gitree("--no-color", *args)
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertIn("abc", result.stdout)
+            self.assertIn("main.py", result.stdout)
+            self.assertNotIn("build", result.stdout)
+
+
+    def test_nested_gitignore_negated_name(self):
+        """
+        Verify the same for the negated plain names and suffixes, which are
+        matched on each segment of the path.
+        """
+        (self.root / ".gitignore").write_text("build\n*.tmp\n")
+        (self.root / "sub" / "a").mkdir(parents=True)
+        (self.root / "sub" / "lib.d").mkdir()
+        (self.root / "sub" / ".gitignore").write_text("!a\n!*.d\n")
+        for path in ("a/build", "a/out.tmp", "lib.d/build", "lib.d/main.py"):
+            (self.root / "sub" / path).write_text("data")
+
+        for args in ([], ["--no-cache"]):
+            result = self.run_gitree("--no-color", *args)
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertIn("lib.d", result.stdout)
+            self.assertIn("main.py", result.stdout)
+            self.assertNotIn("build", result.stdout)
+            self.assertNotIn("out.tmp", result.stdout)
+
+
+    def __assert_files_match_git(self, *args):
+        """
+        Helper to check that the files listed by gitree (with the given args) are
+        the ones git lists as tracked, or untracked and not ignored.
+        """
+        def git_files(*git_args):
+            result = subprocess.run(["git", "ls-files", *git_args], cwd=self.root,
+                check=True, capture_output=True, text=True)
+            return set(result.stdout.splitlines())
+
+        # The caches of gitree are left out of both
+        (self.root / ".git" / "info").mkdir(exist_ok=True)
+        (self.root / ".git" / "info" / "exclude").write_text(".gitree/\n")
+        expected = git_files() | git_files("-o", "--exclude-standard")
+
+        result = self.run_gitree("--format", "ndjson", "--hidden-items", "--no-max-items",
+            "--exclude", ".git", *args)
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+        root = str(self.root.resolve())
+        listed = {Path(item["path"]).relative_to(root).as_posix()
+            for item in map(json.loads, result.stdout.splitlines()) if item["type"] == "file"}
+        self.assertEqual(listed, expected)
+
+
+    def test_gitignore_matches_git(self):
+        """
+        Verify that the patterns only match the paths themselves, the same as git: a
+        negation re-includes a dir under an excluded parent, or one excluded by its
+        name, and a leading slash anchors a pattern to the dir of its .gitignore.
+        """
+        if shutil.which("git") is None:
+            self.skipTest("git is not installed")
+
+        subprocess.run(["git", "init", "-q"], cwd=self.root, check=True, capture_output=True)
+        for path in ("foo/bar/x", "foo/baz/y", "foo/z", "src/2.c", "src/a/1.c", "top.txt",
+            "other/bar/x"):
+            (self.root / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / path).write_text("data")
+
+        for patterns in ("foo/*\n!foo/bar\n", "/*\n!/src\n", "bar\n!foo/bar\n",
+            "*.c\n!src/a\n"):
+            (self.root / ".gitignore").write_text(patterns)
+            for args in ([], ["--no-cache"]):
+                self.__assert_files_match_git(*args)
+
+
+    def test_gitignore_tracked_in_excluded_dir(self):
+        """
+        Verify that with --git-index --untracked, an excluded dir holding tracked files
+        is listed with them, while the untracked files under it stay excluded.
+        """
+        if shutil.which("git") is None:
+            self.skipTest("git is not installed")
+
+        def git(*args):
+            subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+        git("init", "-q")
+        (self.root / ".gitignore").write_text("build/\n")
+        (self.root / "build" / "sub").mkdir(parents=True)
+        for path in ("build/tracked.txt", "build/new.txt", "build/sub/new.txt", "main.py"):
+            (self.root / path).write_text("data")
+        git("add", "-f", "build/tracked.txt")
+
+        self.__assert_files_match_git("--git-index", "--untracked")
+
+
+    def test_git_exclude_files(self):
+        """
+        Verify that the repo's .git/info/exclude and the core.excludesFile set in its
+        config are applied, the same as a .gitignore at the root of the repo.
+        """
+        (self.root / ".git" / "info").mkdir(parents=True)
+        (self.root / ".git" / "info" / "exclude").write_text("target/\n")
+        (self.root / "my_excludes").write_text("*.bak\n")
+        (self.root / ".git" / "config").write_text(
+            f'[core]\n\texcludesFile = "{(self.root / "my_excludes").as_posix()}"\n')
+        (self.root / "target").mkdir()
+        (self.root / "target" / "out.o").write_text("data")
+        (self.root / "src").mkdir()
+        (self.root / "src" / "main.py").write_text("data")
+        (self.root / "src" / "old.bak").write_text("data")
+
+        for args in ([], ["--no-cache"], ["src"]):
+            result = self.run_gitree("--no-color", *args)
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertIn("main.py", result.stdout)
+            self.assertNotIn("target", result.stdout)
+            self.assertNotIn("old.bak", result.stdout)
+
+        result = self.run_gitree("--no-color", "--no-gitignore")
+        self.assertIn("out.o", result.stdout)
+        self.assertIn("old.bak", result.stdout)
+
+
+    def test_git_index(self):
+        """
+        Verify that the --git-index flag lists the files tracked in the repo's
+        index (for index versions 2 and 4), and that --untracked adds the untracked
+        files that are not ignored.
+        """
+        if shutil.which("git") is None:
+            self.skipTest("git is not installed")
+
+        def git(*args):
+            subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+        git("init", "-q")
+        (self.root / ".gitignore").write_text("*.log\nforced.txt\n")
+        (self.root / "src" / "pkg").mkdir(parents=True)
+        (self.root / "src" / "pkg" / "tracked.py").write_text("data")
+        (self.root / "forced.txt").write_text("data")
+        git("add", ".gitignore", "src")
+        git("add", "-f", "forced.txt")
+        (self.root / "untracked.txt").write_text("data")
+        (self.root / "ignored.log").write_text("data")
+
+        for index_version in ("2", "4"):
+            git("update-index", "--index-version", index_version)
+
+            result = self.run_gitree("--no-color", "--git-index")
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertIn("tracked.py", result.stdout)
+            self.assertIn("forced.txt", result.stdout)
+            self.assertNotIn("untracked.txt", result.stdout)
+            self.assertNotIn("ignored.log", result.stdout)
+
+            result = self.run_gitree("--no-color", "--git-index", "--untracked")
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertIn("tracked.py", result.stdout)
+            self.assertIn("forced.txt", result.stdout)
+            self.assertIn("untracked.txt", result.stdout)
+            self.assertNotIn("ignored.log", result.stdout)
+
+
+    def test_git_index_deleted_dir(self):
+        """
+        Verify that --git-index --untracked still lists the tracked files of a
+        tracked dir deleted from the work tree.
+        """
+        if shutil.which("git") is None:
+            self.skipTest("git is not installed")
+
+        subprocess.run(["git", "init", "-q"], cwd=self.root, check=True, capture_output=True)
+        (self.root / "src" / "pkg").mkdir(parents=True)
+        (self.root / "src" / "pkg" / "tracked.py").write_text("data")
+        (self.root / "src" / "main.py").write_text("data")
+        subprocess.run(["git", "add", "src"], cwd=self.root, check=True, capture_output=True)
+        shutil.rmtree(self.root / "src" / "pkg")
+        (self.root / "untracked.txt").write_text("data")
+
+        for args in ([], ["--jobs", "4"], ["--no-cache"]):
+            result = self.run_gitree("--no-color", "--git-index", "--untracked", *args)
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertIn("tracked.py", result.stdout)
+            self.assertIn("main.py", result.stdout)
+            self.assertIn("untracked.txt", result.stdout)
+
+
+    def test_glob_patterns(self):
+        """
+        Verify that glob paths and excludes are matched during the walk: dirs without
+        matches are dropped, and .gitignore rules still apply to the matches.
+        """
+        (self.root / ".gitignore").write_text("node_modules/\n")
+        (self.root / "src" / "app").mkdir(parents=True)
+        (self.root / "src" / "app" / "main.py").write_text("data")
+        (self.root / "src" / "docs").mkdir()
+        (self.root / "src" / "docs" / "guide.md").write_text("data")
+        (self.root / "node_modules" / "pkg").mkdir(parents=True)
+        (self.root / "node_modules" / "pkg" / "setup.py").write_text("data")
+
+        result = self.run_gitree("--no-color", "**/*.py")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("main.py", result.stdout)
+        self.assertIn("app", result.stdout)
+        self.assertNotIn("docs", result.stdout)
+        self.assertNotIn("guide.md", result.stdout)
+        self.assertNotIn("setup.py", result.stdout)
+
+        result = self.run_gitree("--no-color", "--exclude", "**/app")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("guide.md", result.stdout)
+        self.assertNotIn("main.py", result.stdout)
+
+
+    def test_glob_pattern_depths(self):
+        """
+        Verify that with glob paths, the depth limits count from the base dir of the
+        patterns (the current dir for "**/*.py"), not from the common parent of
+        the matches.
+        """
+        (self.root / "src" / "pkg").mkdir(parents=True)
+        (self.root / "src" / "pkg" / "mod.py").write_text("data")
+
+        result = self.run_gitree("--no-color", "**/*.py", "--max-depth", "2")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("pkg", result.stdout)
+        self.assertNotIn("mod.py", result.stdout)
+
+        result = self.run_gitree("--no-color", "**/*.py", "--max-depth", "3")
+        self.assertIn("mod.py", result.stdout)
+
+        # src/pkg is listed at depth 1, so it is only checked from --exclude-depth 1
+        result = self.run_gitree("--no-color", "**/*.py",
+            "--exclude-depth", "0", "--exclude", "src/pkg/**")
+        self.assertIn("mod.py", result.stdout)
+
+        result = self.run_gitree("--no-color", "**/*.py",
+            "--exclude-depth", "1", "--exclude", "src/pkg/**")
+        self.assertNotIn("mod.py", result.stdout)
+
+
+    def test_glob_dirs_past_max_depth(self):
+        """
+        Verify that past --max-depth, a dir is only kept for the glob matches under
+        it that would be drawn: not hidden, not ignored, and not through symlinks.
+        """
+        (self.root / ".gitignore").write_text("out/\n")
+        for path in ("src/app.py", "tools/.hidden/x.py", "lib/out/x.py", "gen/x.py"):
+            (self.root / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / path).write_text("data")
+        (self.root / "gen" / ".gitignore").write_text("*.py\n")
+
+        names = ["src", "tools", "lib", "gen"]
+        (self.root / "docs").mkdir()
+        try:
+            os.symlink(self.root / "src", self.root / "docs" / "link", target_is_directory=True)
+            names.append("docs")
+        except OSError:
+            pass
+
+        for args in ([], ["--no-cache"]):
+            result = self.run_gitree("--no-color", "**/*.py", "--max-depth", "1", *args)
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            shown = [name for name in names if f" {name}\n" in result.stdout]
+            self.assertEqual(shown, ["src"])
+
+
+    def test_include_file_types(self):
+        """
+        Verify that --include-file-types only keeps the files of the given types,
+        and drops the dirs without any of them.
+        """
+        (self.root / "pyproject.toml").write_text("data")
+        (self.root / "README.md").write_text("data")
+        (self.root / "src").mkdir()
+        (self.root / "src" / "Main.PY").write_text("data")
+        (self.root / "web").mkdir()
+        (self.root / "web" / "index.js").write_text("data")
+
+        result = self.run_gitree("--no-color", "--include-file-types", "py", ".toml")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("pyproject.toml", result.stdout)
+        self.assertIn("Main.PY", result.stdout)
+        self.assertNotIn("README.md", result.stdout)
+        self.assertNotIn("web", result.stdout)
+
+
+    def test_format_json(self):
+        """
+        Verify that --format json prints the same indented JSON whether the tree
+        is streamed or resolved first, with the files of each dir first.
+        """
+        (self.root / "zeta.txt").write_text("data")
+        (self.root / "src").mkdir()
+        (self.root / "src" / "main.py").write_text("data")
+        (self.root / "src" / "empty").mkdir()
+        (self.root / "docs").mkdir()
+        (self.root / "docs" / "na\u00efve \"guide\".md").write_text("data")
+
+        streamed = self.run_gitree("--format", "json", "--no-max-entries")
+        resolved = self.run_gitree("--format", "json")
+
+        self.assertEqual(streamed.returncode, 0, msg=streamed.stderr)
+        self.assertEqual(resolved.returncode, 0, msg=resolved.stderr)
+        self.assertEqual(streamed.stdout, resolved.stdout)
+
+        tree = json.loads(streamed.stdout)
+        self.assertEqual(streamed.stdout, json.dumps(tree, indent=2) + "\n")
+
+        children = [child if isinstance(child, str) else child["self"]
+            for child in tree["children"]]
+        self.assertEqual([path.rsplit("/", 1)[-1] for path in children], 
+            ["zeta.txt", "docs", "src"])
+        self.assertIn({"self": children[2] + "/empty", "children": []}, 
+            tree["children"][2]["children"])
+
+
+    def test_flat_formats(self):
+        """
+        Verify that --format ndjson prints one object per item, and --print0 the
+        paths of the items ended by NUL characters, streamed or not, and that
+        both can be exported.
+        """
+        (self.root / "src").mkdir()
+        (self.root / "src" / "main.py").write_text("print()")
+        (self.root / ".env").write_text("KEY=1")
+
+        args = ("--format", "ndjson", "--hidden-items", "--exclude", ".gitree")
+        streamed = self.run_gitree(*args, "--no-max-entries")
+        resolved = self.run_gitree(*args)
+
+        self.assertEqual(streamed.returncode, 0, msg=streamed.stderr)
+        self.assertEqual(streamed.stdout, resolved.stdout)
+
+        items = {item["path"].rsplit("/", 1)[-1]: item 
+            for item in map(json.loads, streamed.stdout.splitlines())}
+        self.assertEqual(items["main.py"], {"path": items["src"]["path"] + "/main.py", 
+            "type": "file", "depth": 2, "size": 7, "is_hidden": False})
+        self.assertEqual(items["src"]["type"], "dir")
+        self.assertIsNone(items["src"]["size"])
+        self.assertTrue(items[".env"]["is_hidden"])
+
+        result = self.run_gitree("--print0", "--no-max-entries")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        paths = result.stdout.split("\0")
+        self.assertEqual(paths[-1], "")
+        self.assertEqual([Path(path).name for path in paths[1:-1]], ["src", "main.py"])
+
+        result = self.run_gitree("--format", "ndjson", "--export", "items")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        exported = [json.loads(line) for line in 
+            (self.root / "items.ndjson").read_text(encoding="utf-8").splitlines()]
+        self.assertIn("print()", [item.get("content") for item in exported])
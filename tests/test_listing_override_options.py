@@ -1,4 +1,5 @@
 # tests/test_listing_control_flags.py
+import json, os, time
 from tests.base_setup import BaseCLISetup
 
 
@@ -44,3 +45,171 @@ class TestListingControlFlags(BaseCLISetup):
         self.assertEqual(result_no_color.returncode, 0, msg=result_no_color.stderr)
         self.assertTrue(result_no_color.stdout.strip())
         self.assertNotIn("\x1b[", result_no_color.stdout, msg="Expected no ANSI color codes with --no-color flag")
+
+
+    def test_no_max_entries(self):
+        """
+        Verify that the --no-max-entries flag lists every entry, drawing
+        the tree while the items are being selected.
+        """
+        # Create more entries than the default --max-entries limit
+        for d in range(5):
+            sub_dir = self.root / f"dir_{d}"
+            sub_dir.mkdir()
+            for f in range(10):
+                (sub_dir / f"file_{f}.txt").write_text("data")
+
+        result = self.run_gitree("--no-max-entries", "--no-color")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertTrue(result.stdout.strip())
+        self.assertIn("├─ dir_0", result.stdout)
+        self.assertIn("└─ dir_4", result.stdout)
+        self.assertIn("   └─ file_9.txt", result.stdout)
+        self.assertIn("│  └─ file_9.txt", result.stdout)
+        self.assertEqual(result.stdout.count("file_"), 50)
+
+
+    def test_no_cache(self):
+        """
+        Verify that the traversal cache reuses the listings of unchanged dirs, notices
+        new entries and edited .gitignore files, and that --no-cache bypasses it.
+        """
+        (self.root / "src" / "lib").mkdir(parents=True)
+        (self.root / "src" / "main.py").write_text("data")
+        (self.root / "src" / "lib" / "debug.log").write_text("data")
+        (self.root / "src" / ".gitignore").write_text("*.log\n")
+        (self.root / ".gitree").mkdir()
+
+        # Dirs modified in the last seconds are not cached, so backdate them
+        an_hour_ago = time.time() - 3600
+        for path in (self.root, self.root / "src", self.root / "src" / "lib", 
+            self.root / "src" / ".gitignore"):
+            os.utime(path, (an_hour_ago, an_hour_ago))
+
+        first = self.run_gitree("--no-color", "--verbose")
+        second = self.run_gitree("--no-color", "--verbose")
+
+        self.assertEqual(second.returncode, 0, msg=second.stderr)
+        self.assertIn("Traversal cache: 0 hits, 3 misses", first.stdout)
+        self.assertIn("Traversal cache: 3 hits, 0 misses", second.stdout)
+        self.assertEqual(first.stdout.split("LOG:")[0], second.stdout.split("LOG:")[0])
+        self.assertNotIn("debug.log", second.stdout)
+
+        # Edit the .gitignore in place, and add an entry to a cached dir
+        (self.root / "src" / ".gitignore").write_text("*.py\n")
+        (self.root / "src" / "lib" / "notes.md").write_text("data")
+
+        result = self.run_gitree("--no-color")
+        result_no_cache = self.run_gitree("--no-color", "--no-cache")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("debug.log", result.stdout)
+        self.assertIn("notes.md", result.stdout)
+        self.assertNotIn("main.py", result.stdout)
+        self.assertEqual(result.stdout, result_no_cache.stdout)
+
+
+    def test_malformed_cache(self):
+        """
+        Verify that a traversal cache file with records of the wrong shape is
+        dropped as a whole, and the tree is walked the same as with --no-cache.
+        """
+        (self.root / "src").mkdir()
+        (self.root / "src" / "main.py").write_text("data")
+        (self.root / "src" / "debug.log").write_text("data")
+        (self.root / ".gitignore").write_text("*.log\n")
+        (self.root / ".gitree").mkdir()
+
+        an_hour_ago = time.time() - 3600
+        for path in (self.root, self.root / "src", self.root / ".gitignore"):
+            os.utime(path, (an_hour_ago, an_hour_ago))
+
+        expected = self.run_gitree("--no-color", "--no-cache")
+        self.run_gitree("--no-color")
+
+        cache_path = self.root / ".gitree" / "traversal_cache.json"
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        src = str((self.root / "src").resolve())
+        self.assertIn(src, data["dirs"])
+
+        # Fresh records (same dev, ino and mtime) with a bad listing or verdicts,
+        # and one with a stat field of the wrong type
+        for index, value in ((3, "main.py"), (3, [[1, "main.py"]]), (5, ["main.py"]),
+            (5, {"debug.log": "no"}), (2, str(data["dirs"][src][2]))):
+            record = list(data["dirs"][src])
+            record[index] = value
+            cache_path.write_text(json.dumps({**data, "dirs": {src: record}}), 
+                encoding="utf-8")
+
+            result = self.run_gitree("--no-color")
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertEqual(result.stdout, expected.stdout)
+
+
+    def test_ignore_cache(self):
+        """
+        Verify that identical .gitignore files share one parsed record of the ignore
+        cache, that unchanged files are not parsed again, and that a corrupt cache
+        file is ignored.
+        """
+        for name in ("a", "b"):
+            (self.root / name).mkdir()
+            (self.root / name / ".gitignore").write_text("*.log\n")
+            (self.root / name / "debug.log").write_text("data")
+            (self.root / name / "main.py").write_text("data")
+
+            an_hour_ago = time.time() - 3600
+            os.utime(self.root / name / ".gitignore", (an_hour_ago, an_hour_ago))
+
+        first = self.run_gitree("--no-color", "--verbose")
+        second = self.run_gitree("--no-color", "--verbose")
+
+        self.assertEqual(second.returncode, 0, msg=second.stderr)
+        self.assertIn("Ignore cache: 1 hits, 1 misses", first.stdout)
+        self.assertIn("Ignore cache: 2 hits, 0 misses", second.stdout)
+        self.assertEqual(first.stdout.split("LOG:")[0], second.stdout.split("LOG:")[0])
+
+        (self.root / ".gitree" / "ignore_cache.json").write_text("{corrupt")
+        result = self.run_gitree("--no-color", "--verbose")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("Ignore cache: 1 hits, 1 misses", result.stdout)
+        self.assertEqual(result.stdout.split("LOG:")[0], first.stdout.split("LOG:")[0])
+        self.assertNotIn("debug.log", result.stdout)
+
+
+    def test_malformed_ignore_cache(self):
+        """
+        Verify that an ignore cache file with records of the wrong shape is dropped
+        as a whole, and the patterns are parsed again.
+        """
+        (self.root / ".gitignore").write_text("*.log\n")
+        (self.root / "debug.log").write_text("data")
+        (self.root / "main.py").write_text("data")
+        (self.root / ".gitree").mkdir()
+
+        an_hour_ago = time.time() - 3600
+        os.utime(self.root / ".gitignore", (an_hour_ago, an_hour_ago))
+
+        expected = self.run_gitree("--no-color", "--no-cache")
+        self.run_gitree("--no-color")
+
+        cache_path = self.root / ".gitree" / "ignore_cache.json"
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        path, record = next(iter(data["files"].items()))
+        key = record[2]
+
+        # A fresh file record (same mtime and size) with a bad key, and bad patterns
+        for files, specs in (({path: [*record[:2], [1]]}, data["specs"]),
+            ({path: [str(record[0]), *record[1:]]}, data["specs"]),
+            (data["files"], {key: [[True, "literal", 1, False]]}),
+            (data["files"], {key: "*.log"})):
+            cache_path.write_text(json.dumps({**data, "files": files, "specs": specs}),
+                encoding="utf-8")
+
+            result = self.run_gitree("--no-color")
+
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            self.assertEqual(result.stdout, expected.stdout)
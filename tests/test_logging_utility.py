@@ -0,0 +1,93 @@
+# tests/test_logging_utility.py
+
+"""
+Code file for TestLogger class.
+
+If you find something missing here, it's most likely declared in the
+BaseCLISetup class, since this class inherits from that one.
+"""
+
+import io
+
+from gitree.objects.output_sink import OutputSink
+from gitree.utilities.logging_utility import Logger
+from tests.base_setup import BaseCLISetup
+
+
+class _Unprintable:
+    """
+    An argument that fails the test if the message is ever formatted.
+    """
+
+    def __str__(self):
+        raise AssertionError("The message was formatted")
+
+
+class TestLogger(BaseCLISetup):
+    """
+    Tests the Logger used for --verbose, including:
+        - Dropping the messages below the level without formatting them
+        - Dropping every message when disabled
+        - Keeping only the newest messages once the buffer is full
+    """
+
+    def test_below_level(self):
+        """
+        Test that the messages below the level are dropped, and their args
+        never formatted.
+        """
+
+        logger = Logger()
+        logger.set_level(Logger.WARNING)
+
+        self.assertFalse(logger.enabled(Logger.INFO))
+        logger.log(Logger.DEBUG, "debug %s", _Unprintable())
+        logger.log(Logger.INFO, "info %s", _Unprintable())
+        logger.log(Logger.INFO, lambda: str(_Unprintable()))
+        logger.log(Logger.WARNING, "kept %s", 1)
+
+        logs = logger.get_logs()
+        self.assertEqual(len(logger), 1)
+        self.assertIn("[WARNING]", logs[0])
+        self.assertTrue(logs[0].endswith("kept 1"))
+
+
+    def test_disabled(self):
+        """
+        Test that no message is stored when the logger is disabled.
+        """
+
+        logger = Logger()
+        logger.set_level(Logger.DISABLED)
+
+        for level in (Logger.DEBUG, Logger.INFO, Logger.WARNING, Logger.ERROR):
+            self.assertFalse(logger.enabled(level))
+            logger.log(level, "message %s", _Unprintable())
+
+        self.assertTrue(logger.empty())
+
+
+    def test_ring_buffer(self):
+        """
+        Test that only the newest messages are kept once the buffer is full,
+        and that the dropped ones are counted when flushed.
+        """
+
+        out = io.StringIO()
+        logger = Logger(max_messages=3, sink=OutputSink(out))
+
+        for i in range(10):
+            logger.log(None, "message %d", i)
+
+        self.assertEqual(logger.get_logs(), ["message 7", "message 8", "message 9"])
+
+        logger.flush()
+        self.assertEqual(out.getvalue().splitlines(), ["(7 earlier messages were dropped)",
+            "message 7", "message 8", "message 9"])
+        self.assertTrue(logger.empty())
+
+        # The default size
+        logger = Logger()
+        for _ in range(Logger.MAX_MESSAGES + 5):
+            logger.log(None, "message")
+        self.assertEqual(len(logger), Logger.MAX_MESSAGES)